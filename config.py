@@ -3,8 +3,17 @@ Konfigurationsmodul für die Europapark API.
 """
 
 from functools import lru_cache
+from typing import Optional
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
+# Nur im Primär-Modus benötigt (Replikas greifen nie auf den Upstream zu)
+UPSTREAM_SETTINGS = (
+    "fb_app_id", "fb_api_key", "fb_project_id", "api_base", "auth_url",
+    "enc_key", "enc_iv", "user_key", "pass_key", "api_username", "api_password", "app_version",
+)
+
 
 class Settings(BaseSettings):
     """Anwendungskonfiguration aus Umgebungsvariablen."""
@@ -13,31 +22,115 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///./data.db"
 
     # Firebase Konfiguration
-    fb_app_id: str
-    fb_api_key: str
-    fb_project_id: str
+    fb_app_id: str = ""
+    fb_api_key: str = ""
+    fb_project_id: str = ""
 
     # API Konfiguration
-    api_base: str
-    auth_url: str
+    api_base: str = ""
+    auth_url: str = ""
+
+    # Firebase Endpoints (überschreibbar, z.B. für den lokalen Fake-Upstream)
+    firebase_remote_config_url: str = (
+        "https://firebaseremoteconfig.googleapis.com/v1/projects/{project_id}/namespaces/firebase:fetch"
+    )
+    firebase_identity_url: str = "https://identitytoolkit.googleapis.com/v1/accounts:signUp"
 
     # Encryption Keys
-    enc_key: str
-    enc_iv: str
+    enc_key: str = ""
+    enc_iv: str = ""
 
     # API Credentials (Fallback)
-    user_key: str
-    pass_key: str
-    api_username: str
-    api_password: str
+    user_key: str = ""
+    pass_key: str = ""
+    api_username: str = ""
+    api_password: str = ""
 
     # App Version
-    app_version: str
+    app_version: str = ""
+
+    # Replikation: URL der Primärinstanz aktiviert den Replika-Modus (ohne Upstream-Zugangsdaten)
+    replica_of: Optional[str] = None
+    # Gemeinsames Token für /internal/replication (Abruf durch Replikas und Push an Replikas)
+    replication_token: Optional[str] = None
+    # Abrufintervall der Replika und Verzögerung in Sekunden, ab der /health "degraded" meldet
+    replica_poll_interval: float = 5.0
+    replica_max_lag: float = 60.0
+    # Replikas, an die neue Generationen gepusht werden (kommagetrennte Basis-URLs)
+    replica_push_urls: str = ""
+
+    # Scheduler: gleichzeitige Upstream-Requests, davon für hohe Priorität (Wartezeiten) reserviert
+    upstream_max_concurrency: int = 4
+    upstream_reserved_slots: int = 1
+    # Sekunden nach einer Ausführung, in denen "Jetzt aktualisieren" nicht erneut ausführt
+    refresh_debounce_seconds: float = 30.0
+    # Zeitpläne überschreiben: "job=spec;..." mit Sekunden oder Cron-Ausdruck
+    job_schedules: str = ""
+
+    # Webhooks: Zustellung aus diesem Prozess. Standardmäßig aus: bei mehreren Worker-Prozessen
+    # erhielte jeder Empfänger jedes Event einmal pro Prozess, daher in genau einem aktivieren
+    webhooks_enabled: bool = False
+    # Parallele Zustellungen, Warteschlange (Batches), Events je Request, Wiederholungen und Timeout in Sekunden
+    webhook_workers: int = 4
+    webhook_queue_size: int = 1000
+    webhook_batch_size: int = 100
+    webhook_max_retries: int = 3
+    webhook_retry_backoff: float = 1.0
+    webhook_timeout: float = 10.0
+
+    # Admin-Zugang (X-Admin-Token Header); ohne Token sind Admin-Endpoints deaktiviert
+    admin_token: Optional[str] = None
+
+    # Sprachen: periodisch aktualisiert (kommagetrennt) und Anzahl seltener Sprachen im LRU
+    scheduled_languages: str = "de,en"
+    language_cache_size: int = 3
+
+    # Cache-Bundle, das beim Start importiert wird (Authentifizierung läuft dann im Hintergrund)
+    bundle_path: Optional[str] = None
+
+    # Response-Cache für GET-Routen (Gesamtgröße in Bytes, 0 deaktiviert; größere Antworten werden nicht gecacht)
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    response_cache_max_entry_bytes: int = 4 * 1024 * 1024
+
+    # CDN: Obergrenze für max-age in Sekunden (0 = keine Cache-Control/Expires-Header)
+    cdn_max_age: int = 3600
+    # Purge-Hook: erhält per POST die Surrogate-Keys neu veröffentlichter Datensätze (optional mit Bearer-Token)
+    cdn_purge_url: Optional[str] = None
+    cdn_purge_token: Optional[str] = None
+
+    # Rate Limiting: Token-Bucket je Client und Routengruppe ("gruppe=anzahl/sekunden", kommagetrennt)
+    rate_limits: str = "raw=30/60,batch=60/60,default=600/60"
+    # Client-Adresse aus X-Forwarded-For (nur hinter einem vertrauenswürdigen Proxy)
+    rate_limit_trust_forwarded: bool = False
+    # Maximale Anzahl gleichzeitiger /raw-Requests
+    raw_max_concurrency: int = 4
+    # Load Shedding teurer Routen ab dieser Event-Loop-Verzögerung bzw. Anzahl laufender Requests
+    shed_loop_lag_ms: float = 250.0
+    shed_max_in_flight: int = 200
+    shed_retry_after: int = 5
+
+    # Profiling
+    profiling_sample_rate: float = 0.0
+    profiling_interval_ms: float = 5.0
+    profiling_buffer_size: int = 50
 
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
 
+    @property
+    def is_replica(self) -> bool:
+        return bool(self.replica_of)
+
+    @model_validator(mode="after")
+    def _require_upstream_settings(self) -> "Settings":
+        """Ohne replica_of sind die Upstream-Zugangsdaten Pflicht."""
+        if not self.is_replica:
+            missing = [name for name in UPSTREAM_SETTINGS if not getattr(self, name)]
+            if missing:
+                raise ValueError(f"Fehlende Konfiguration (oder REPLICA_OF setzen): {', '.join(missing)}")
+        return self
+
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -4,8 +4,10 @@ Datenbank-Modul.
 
 import logging
 from datetime import datetime
+from typing import Optional
 
-from sqlalchemy import String, DateTime, Text
+from sqlalchemy import String, DateTime, Integer, Text, inspect, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -29,6 +31,11 @@ class TokenModel(Base):
     token_type: Mapped[str] = mapped_column(String(50))
     expires_at: Mapped[datetime] = mapped_column(DateTime)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    # Wird bei jeder Erneuerung erhöht; Prozesse übernehmen Tokens mit höherer Version
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    # Lease der Erneuerung: nur der eingetragene Prozess fordert einen neuen Token an
+    renewing_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    renewing_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
 
 class CacheModel(Base):
@@ -42,9 +49,38 @@ class CacheModel(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
 
 
+class WebhookModel(Base):
+    """Webhook-Abonnement: Ziel-URL, optionales Signatur-Secret und Regeln (JSON)."""
+    
+    __tablename__ = "webhooks"
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    url: Mapped[str] = mapped_column(String(500))
+    secret: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    rules: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+
 _engine = None
 _session_factory = None
 
+# Nachträglich hinzugekommene Spalten bestehender Tabellen: (Tabelle, Spalte, DDL)
+COLUMN_MIGRATIONS = (
+    ("tokens", "version", "INTEGER NOT NULL DEFAULT 0"),
+    ("tokens", "renewing_by", "VARCHAR(100)"),
+    ("tokens", "renewing_until", "TIMESTAMP"),
+)
+
+
+def _migrate_columns(connection) -> None:
+    """Ergänzt fehlende Spalten (create_all legt nur neue Tabellen an)."""
+    inspector = inspect(connection)
+    for table, column, ddl in COLUMN_MIGRATIONS:
+        columns = {c["name"] for c in inspector.get_columns(table)}
+        if column not in columns:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+            logger.info(f"Spalte {table}.{column} hinzugefügt.")
+
 
 def get_database_url() -> str:
     url = get_settings().database_url
@@ -64,8 +100,17 @@ async def init_database() -> None:
     _engine = create_async_engine(db_url, echo=False)
     _session_factory = async_sessionmaker(_engine, expire_on_commit=False)
     
-    async with _engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    for attempt in range(2):
+        try:
+            async with _engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                await conn.run_sync(_migrate_columns)
+            break
+        except DBAPIError:
+            # Parallel startende Prozesse legen das Schema gleichzeitig an; erneut prüfen
+            if attempt:
+                raise
+            logger.info("Schema wurde parallel angelegt, prüfe erneut...")
     
     logger.info("Datenbank initialisiert.")
 
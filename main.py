@@ -2,28 +2,48 @@
 Europapark API Server
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from config import get_settings
 from database import init_database, close_database
+from routers.admin import router as admin_router
 from routers.attractions import router as attractions_router
+from routers.batch import router as batch_router
+from routers.calendar import router as calendar_router
+from routers.nearby import router as nearby_router
 from routers.openingtimes import router as openingtimes_router
+from routers.park import router as park_router
 from routers.raw import router as raw_router
+from routers.replication import router as replication_router
 from routers.restaurants import router as restaurants_router
+from routers.search import router as search_router
 from routers.seasons import router as seasons_router
 from routers.services import router as services_router
 from routers.shops import router as shops_router
 from routers.shows import router as shows_router
 from routers.showtimes import router as showtimes_router
 from routers.waittimes import router as waittimes_router
+from routers.webhooks import router as webhooks_router
+from services.admission import AdmissionMiddleware, get_admission_controller
 from services.auth import get_auth_service, initialize_auth, shutdown_auth
+from services.bundle import load_bundle_file
 from services.cache import get_cache_service
+from services.cdn import start_cdn_purge
 from services.firebase_health import check_firebase_health, get_firebase_status
+from services.language import LanguageMiddleware
+from services.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, render_metrics
+from services.parks import park_scope
+from services.profiling import ProfilingMiddleware
+from services.replication import get_replica_follower, start_replication, stop_replication
+from services.response_cache import ResponseCacheMiddleware
 from services.scheduler import start_scheduler, stop_scheduler
+from services.webhooks import start_webhooks, stop_webhooks
 
 logging.basicConfig(
     level=logging.INFO,
@@ -32,16 +52,8 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Lifecycle manager for the FastAPI application."""
-    logger.info("Starting Europapark API Server...")
-    
-    settings = get_settings()
-    logger.info(f"Configuration loaded. Firebase Project: {settings.fb_project_id}")
-    
-    await init_database()
-    
+async def connect_upstream() -> None:
+    """Checks Firebase, authenticates and starts the cache refresh loops."""
     status = await check_firebase_health()
     if status.is_healthy:
         logger.info(f"Firebase health check successful. Response time: {status.response_time_ms:.2f}ms")
@@ -58,16 +70,51 @@ async def lifespan(app: FastAPI):
         logger.info("Cache service started.")
     else:
         logger.warning("Authentication failed.")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Lifecycle manager for the FastAPI application."""
+    logger.info("Starting Europapark API Server...")
+    
+    settings = get_settings()
+    logger.info(f"Configuration loaded. Firebase Project: {settings.fb_project_id}")
+    
+    await init_database()
+    
+    if not settings.is_replica and settings.webhooks_enabled:
+        start_webhooks()
     
-    start_scheduler()
+    bundle_loaded = bool(settings.bundle_path) and await load_bundle_file(settings.bundle_path) is not None
+    
+    upstream_task = None
+    if settings.is_replica:
+        # Replicas never contact the upstream API; all data comes from the primary
+        logger.info(f"Replica mode, primary: {settings.replica_of}")
+    elif bundle_loaded:
+        # Serve the imported bundle right away; authenticate and refresh in the background
+        upstream_task = asyncio.create_task(connect_upstream())
+    else:
+        await connect_upstream()
+    
+    if not settings.is_replica:
+        start_scheduler()
+    start_replication()
+    start_cdn_purge()
+    get_admission_controller().monitor.start()
     logger.info("Server started successfully.")
     
     yield
     
     logger.info("Shutting down server...")
+    if upstream_task is not None:
+        upstream_task.cancel()
+    stop_replication()
     get_cache_service().stop()
     await shutdown_auth()
     stop_scheduler()
+    await stop_webhooks()
+    get_admission_controller().monitor.stop()
     await close_database()
     logger.info("Server shut down.")
 
@@ -80,6 +127,9 @@ app = FastAPI(
     redoc_url=None,
 )
 
+app.add_middleware(ResponseCacheMiddleware)
+app.add_middleware(LanguageMiddleware)
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -87,17 +137,35 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+# Routers serving park data: unprefixed for Europa-Park, under /{park} for every park
+PARK_ROUTERS = (
+    waittimes_router,
+    showtimes_router,
+    openingtimes_router,
+    seasons_router,
+    calendar_router,
+    attractions_router,
+    shows_router,
+    shops_router,
+    restaurants_router,
+    services_router,
+    nearby_router,
+    search_router,
+    park_router,
+)
 
 app.include_router(raw_router)
-app.include_router(waittimes_router)
-app.include_router(showtimes_router)
-app.include_router(openingtimes_router)
-app.include_router(seasons_router)
-app.include_router(attractions_router)
-app.include_router(shows_router)
-app.include_router(shops_router)
-app.include_router(restaurants_router)
-app.include_router(services_router)
+for router in PARK_ROUTERS:
+    app.include_router(router)
+app.include_router(batch_router)
+app.include_router(admin_router)
+app.include_router(webhooks_router)
+app.include_router(replication_router)
+for router in PARK_ROUTERS:
+    app.include_router(router, prefix="/{park}", dependencies=[Depends(park_scope)])
 
 
 @app.get("/", tags=["API"], summary="API Info")
@@ -112,6 +180,15 @@ async def api_info():
 @app.get("/health", tags=["API"], summary="Health Check")
 async def health_check():
     """Returns service health status."""
+    follower = get_replica_follower()
+    if follower is not None:
+        replication = follower.get_status()
+        return {
+            "status": "healthy" if replication["healthy"] else "degraded",
+            "mode": "replica",
+            "replication": replication,
+        }
+    
     firebase_status = get_firebase_status()
     auth_service = get_auth_service()
     auth_status = auth_service.get_status()
@@ -125,6 +202,12 @@ async def health_check():
     }
 
 
+@app.get("/metrics", tags=["API"], summary="Prometheus metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Returns request, cache, upstream, refresh and token metrics in Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
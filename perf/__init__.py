@@ -0,0 +1 @@
+"""Performance tooling: synthetic data, fake upstream, load tests and benchmarks."""
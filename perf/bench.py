@@ -0,0 +1,231 @@
+"""
+Service Microbenchmarks.
+Measures time and memory allocation per call of the service-layer hot paths
+against synthetic datasets of increasing size, and compares the results
+with a stored baseline.
+
+Endpoint benchmarks (names starting with "GET ") send requests through the
+ASGI app in-process, so they include routing, middlewares and serialization.
+
+Run:
+    python -m perf.bench                          # compare with perf/baseline.json
+    python -m perf.bench --scales 100 1000 --save-baseline
+    python -m perf.bench --fail-threshold 1.5     # exit 1 on >50% slowdown
+
+The datasets are written through CacheService into a temporary SQLite
+database, so every measurement includes the real cache load path.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from perf.synthetic import SyntheticPark
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_SCALES = (100, 1_000, 10_000, 100_000)
+
+_REQUIRED_SETTINGS = {
+    "FB_APP_ID": "bench", "FB_API_KEY": "bench", "FB_PROJECT_ID": "bench",
+    "API_BASE": "http://127.0.0.1:9", "AUTH_URL": "http://127.0.0.1:9/token",
+    "ENC_KEY": "benchkey", "ENC_IV": "benchiv1", "USER_KEY": "bench", "PASS_KEY": "bench",
+    "API_USERNAME": "bench", "API_PASSWORD": "bench", "APP_VERSION": "0.0.0-bench",
+}
+
+
+def _configure_environment(workdir: Path) -> None:
+    for key, value in _REQUIRED_SETTINGS.items():
+        os.environ.setdefault(key, value)
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.db'}"
+
+
+def _endpoint(client, path: str) -> Callable[[], Awaitable]:
+    async def call():
+        response = await client.get(path)
+        response.raise_for_status()
+        response.read()
+    return call
+
+
+def _benchmarks(park: SyntheticPark, client) -> dict[str, Callable[[], Awaitable]]:
+    """
+    Benchmarked calls: the DerivedData-backed service functions the routes use.
+    Derived artifacts are memoized per generation, so after the warm-up call
+    these measure the per-request lookup, filter and projection work.
+    Detail lookups use the last matching entry (worst case for scans).
+    """
+    from services.attractions import get_attraction_info, query_attractions
+    from services.pois import query_pois
+    from services.shows import get_show_info
+    from services.showtimes import get_showtime_rows
+    from services.waittimes import get_waittime_by_id, query_waittimes
+
+    europapark = [p for p in park.pois if "europapark" in p["scopes"]]
+    attraction_id = next(p["id"] for p in reversed(europapark) if p["type"] == "attraction")
+    show_id = next(s["id"] for p in reversed(europapark) for s in p.get("shows", []))
+
+    return {
+        "query_waittimes": query_waittimes,
+        "get_waittime_by_id": lambda: get_waittime_by_id(attraction_id),
+        "query_attractions": query_attractions,
+        "get_attraction_info": lambda: get_attraction_info(attraction_id),
+        "query_pois": lambda: query_pois("gastronomy"),
+        "get_showtime_rows": get_showtime_rows,
+        "get_show_info": lambda: get_show_info(show_id),
+        "GET /times/waittimes": _endpoint(client, "/times/waittimes"),
+        "GET /info/attractions": _endpoint(client, "/info/attractions"),
+        "GET /info/attractions/{id}": _endpoint(client, f"/info/attractions/{attraction_id}"),
+    }
+
+
+async def _seed(park: SyntheticPark) -> None:
+    from services.cache import CACHE_KEYS, get_cache_service
+
+    cache = get_cache_service()
+    await cache.save(CACHE_KEYS["pois"], park.poi_group())
+    await cache.save(CACHE_KEYS["waittimes"], park.waiting_times())
+    await cache.save(CACHE_KEYS["showtimes"], park.show_times())
+    await cache.save(CACHE_KEYS["seasons"], park.seasons())
+    await cache.save(CACHE_KEYS["openingtimes"], park.opening_times())
+
+
+async def _measure(call: Callable[[], Awaitable], min_repeats: int, budget: float) -> dict:
+    await call()  # warm-up
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_repeats or time.perf_counter() - started < budget:
+        gc.collect()
+        start = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - start)
+        if len(timings) >= 1000:
+            break
+
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    await call()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0)
+
+    return {
+        "repeats": len(timings),
+        "min_ms": round(min(timings) * 1000, 4),
+        "median_ms": round(statistics.median(timings) * 1000, 4),
+        "peak_kib": round(peak / 1024, 1),
+        "retained_kib": round(allocated / 1024, 1),
+    }
+
+
+async def run(scales: list[int], seed: int, min_repeats: int, budget: float, only: list[str]) -> dict:
+    import httpx
+
+    from database import close_database, init_database
+    from main import app
+    from services.response_cache import get_response_cache
+
+    # One request log line per measured call would drown the results
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    # Endpoint benchmarks measure the route handlers, not response cache hits
+    get_response_cache().enabled = False
+
+    results: dict[str, dict[str, dict]] = {}
+    await init_database()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    try:
+        for scale in scales:
+            park = SyntheticPark(poi_count=scale, seed=seed)
+            await _seed(park)
+            results[str(scale)] = {}
+            for name, call in _benchmarks(park, client).items():
+                if only and name not in only:
+                    continue
+                result = await _measure(call, min_repeats, budget)
+                results[str(scale)][name] = result
+                print(
+                    f"{scale:>7} {name:<26} {result['median_ms']:>12.3f} ms "
+                    f"(min {result['min_ms']:.3f}, n={result['repeats']}) "
+                    f"peak {result['peak_kib']:>10.1f} KiB",
+                    flush=True,
+                )
+    finally:
+        await client.aclose()
+        await close_database()
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    """Prints the comparison with the baseline. Returns False on regressions."""
+    ok = True
+    print(
+        f"\n{'scale':>7} {'benchmark':<26} {'baseline':>12} {'current':>12} {'ratio':>8}"
+        f" {'base peak':>12} {'peak':>12}"
+    )
+    for scale, benchmarks in results.items():
+        for name, current in benchmarks.items():
+            base = baseline.get(scale, {}).get(name)
+            if not base:
+                continue
+            ratio = current["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+            flag = ""
+            if ratio > threshold:
+                flag = "  REGRESSION"
+                ok = False
+            print(
+                f"{scale:>7} {name:<26} {base['median_ms']:>10.3f}ms {current['median_ms']:>10.3f}ms "
+                f"{ratio:>7.2f}x {base['peak_kib']:>8.1f} KiB {current['peak_kib']:>8.1f} KiB{flag}"
+            )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Service-layer microbenchmarks")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-repeats", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds of timing per benchmark")
+    parser.add_argument("--only", nargs="*", default=[], help="Run only these benchmarks")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as new baseline")
+    parser.add_argument("--fail-threshold", type=float, help="Exit 1 if median/baseline exceeds this")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        _configure_environment(Path(workdir))
+        results = asyncio.run(run(args.scales, args.seed, args.min_repeats, args.budget, args.only))
+
+    ok = True
+    if args.baseline.exists() and not args.save_baseline:
+        stored = json.loads(args.baseline.read_text())
+        ok = compare(results, stored.get("results", {}), args.fail_threshold or float("inf"))
+
+    if args.save_baseline:
+        stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {"results": {}}
+        for scale, benchmarks in results.items():
+            stored["results"].setdefault(scale, {}).update(benchmarks)
+        stored["python"] = sys.version.split()[0]
+        stored["machine"] = platform.machine()
+        stored["seed"] = args.seed
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline saved: {args.baseline}")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
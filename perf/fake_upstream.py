@@ -0,0 +1,238 @@
+"""
+Fake Upstream.
+Local stand-in for the Europapark API, the OAuth2 token service and the
+Firebase Remote Config / identitytoolkit endpoints, with fault injection.
+
+Run:
+    python -m perf.fake_upstream --port 9100 --pois 2000 --latency-ms 20 --error-rate 0.01
+
+Point the server at it with API_BASE=http://127.0.0.1:9100,
+AUTH_URL=http://127.0.0.1:9100/token-srv/token,
+FIREBASE_REMOTE_CONFIG_URL=http://127.0.0.1:9100/v1/projects/{project_id}/namespaces/firebase:fetch
+and FIREBASE_IDENTITY_URL=http://127.0.0.1:9100/v1/accounts:signUp.
+Faults can be changed at runtime via POST /_control.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import secrets
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from Crypto.Cipher import Blowfish
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+from perf.synthetic import SyntheticPark
+
+CLIENT_ID = "fake-client-id"
+CLIENT_SECRET = "fake-client-secret"
+
+
+@dataclass
+class FaultConfig:
+    """Fault injection settings (rates are probabilities per request)."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    unauthorized_rate: float = 0.0
+    token_ttl_seconds: int = 86400
+
+
+def encrypt_blowfish(plaintext: str, key: str, iv: str) -> str:
+    """Counterpart of services.crypto.decrypt_blowfish (CBC, PKCS7, Base64)."""
+    data = plaintext.encode("utf-8")
+    padding = 8 - len(data) % 8
+    data += bytes([padding]) * padding
+    cipher = Blowfish.new(key.encode("utf-8"), Blowfish.MODE_CBC, iv.encode("utf-8"))
+    return base64.b64encode(cipher.encrypt(data)).decode("utf-8")
+
+
+LOCALIZED_FIELDS = ("name", "excerpt", "description", "long")
+
+
+def localize(value, language: str):
+    """Marks localized texts with the requested language (the synthetic data is German)."""
+    if isinstance(value, list):
+        return [localize(v, language) for v in value]
+    if isinstance(value, dict):
+        return {
+            k: f"{v} [{language}]" if k in LOCALIZED_FIELDS and isinstance(v, str) else localize(v, language)
+            for k, v in value.items()
+        }
+    return value
+
+
+def create_app(
+    park: SyntheticPark,
+    faults: Optional[FaultConfig] = None,
+    enc_key: str = "fakekey1",
+    enc_iv: str = "fakeiv12",
+    user_key: str = "v3_live_android_exozet_api_username",
+    pass_key: str = "v3_live_android_exozet_api_password",
+) -> FastAPI:
+    """Builds the fake upstream application."""
+    app = FastAPI(title="Fake Europapark Upstream", docs_url=None, redoc_url=None)
+    app.state.faults = faults or FaultConfig()
+    app.state.tokens = set()
+    app.state.counters = {}
+    rng = random.Random(park.seed + 100)
+
+    sources = {
+        "/api/v2/poi-group": park.poi_group(),
+        "/api/v2/seasons": park.seasons(),
+        "/api/v2/season-opentime-details/europapark": park.opening_times(),
+        "/api/v2/show-times": park.show_times(),
+    }
+    payloads: dict[tuple[str, str], bytes] = {}
+
+    def payload(path: str, language: str) -> bytes:
+        """Serialized payload per path and Accept-Language (German is the source language)."""
+        key = (path, language)
+        if key not in payloads:
+            data = sources[path] if language == "de" else localize(sources[path], language)
+            payloads[key] = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        return payloads[key]
+
+    async def inject(path: str) -> Optional[Response]:
+        """Applies latency and random errors. Returns an error response or None."""
+        f: FaultConfig = app.state.faults
+        app.state.counters[path] = app.state.counters.get(path, 0) + 1
+        delay = f.latency_ms + (rng.uniform(-f.jitter_ms, f.jitter_ms) if f.jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if f.error_rate and rng.random() < f.error_rate:
+            return JSONResponse({"error": "injected failure"}, status_code=rng.choice([500, 502, 503]))
+        return None
+
+    def authorized(request: Request) -> bool:
+        header = request.headers.get("jwtauthorization", "")
+        token = header.removeprefix("Bearer ")
+        if token not in app.state.tokens:
+            return False
+        f: FaultConfig = app.state.faults
+        if f.unauthorized_rate and rng.random() < f.unauthorized_rate:
+            app.state.tokens.discard(token)
+            return False
+        return True
+
+    async def api(request: Request, body: Optional[bytes] = None) -> Response:
+        path = request.url.path
+        error = await inject(path)
+        if error:
+            return error
+        if not authorized(request):
+            return JSONResponse({"error": "invalid token"}, status_code=401)
+        if body is None:
+            language = request.headers.get("accept-language", "de").split(",")[0].split("-")[0].strip() or "de"
+            body = payload(path, language)
+        return Response(body, media_type="application/json")
+
+    @app.get("/api/v2/waiting-times")
+    async def waiting_times(request: Request):
+        body = json.dumps(park.waiting_times(rng)).encode("utf-8")
+        return await api(request, body)
+
+    @app.get("/api/v2/poi-group")
+    async def poi_group(request: Request):
+        return await api(request)
+
+    @app.get("/api/v2/seasons")
+    async def seasons(request: Request):
+        return await api(request)
+
+    @app.get("/api/v2/season-opentime-details/europapark")
+    async def opening_times(request: Request):
+        return await api(request)
+
+    @app.get("/api/v2/show-times")
+    async def show_times(request: Request):
+        return await api(request)
+
+    @app.post("/token-srv/token")
+    async def token(request: Request):
+        error = await inject("/token-srv/token")
+        if error:
+            return error
+        payload = await request.json()
+        if payload.get("client_id") != CLIENT_ID or payload.get("client_secret") != CLIENT_SECRET:
+            return JSONResponse({"error": "invalid_client"}, status_code=401)
+        access_token = secrets.token_urlsafe(24)
+        app.state.tokens.add(access_token)
+        return {
+            "access_token": access_token,
+            "token_type": "Bearer",
+            "expires_in": app.state.faults.token_ttl_seconds,
+        }
+
+    @app.post("/v1/projects/{project_id}/namespaces/firebase:fetch")
+    async def remote_config(project_id: str):
+        error = await inject("/firebase:fetch")
+        if error:
+            return error
+        return {
+            "entries": {
+                user_key: encrypt_blowfish(CLIENT_ID, enc_key, enc_iv),
+                pass_key: encrypt_blowfish(CLIENT_SECRET, enc_key, enc_iv),
+            },
+            "state": "UPDATE",
+        }
+
+    @app.post("/v1/accounts:signUp")
+    async def identity_sign_up():
+        error = await inject("/accounts:signUp")
+        if error:
+            return error
+        # The real endpoint answers 400 without valid sign-up data
+        return JSONResponse({"error": {"code": 400, "message": "ADMIN_ONLY_OPERATION"}}, status_code=400)
+
+    @app.get("/_control")
+    async def get_control():
+        return {"faults": asdict(app.state.faults), "requests": app.state.counters}
+
+    @app.post("/_control")
+    async def set_control(request: Request):
+        updates = await request.json()
+        current = asdict(app.state.faults)
+        current.update({k: v for k, v in updates.items() if k in current})
+        app.state.faults = FaultConfig(**current)
+        if updates.get("revoke_tokens"):
+            app.state.tokens.clear()
+        return {"faults": current}
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake Europapark upstream with fault injection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--pois", type=int, default=300, help="Number of POIs (payload size)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0)
+    parser.add_argument("--token-ttl", type=int, default=86400)
+    parser.add_argument("--enc-key", default="fakekey1")
+    parser.add_argument("--enc-iv", default="fakeiv12")
+    args = parser.parse_args()
+
+    faults = FaultConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        unauthorized_rate=args.unauthorized_rate,
+        token_ttl_seconds=args.token_ttl,
+    )
+    app = create_app(SyntheticPark(args.pois, args.seed), faults, args.enc_key, args.enc_iv)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
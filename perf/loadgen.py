@@ -0,0 +1,286 @@
+"""
+Load Test Harness.
+Starts the fake upstream and the real server locally, drives HTTP load
+against the server and reports throughput and latency percentiles per
+endpoint. Runs fully offline.
+
+Run:
+    python -m perf.loadgen --duration 30 --concurrency 50 --pois 2000
+    python -m perf.loadgen --app-url http://127.0.0.1:8000   # existing server
+
+Exits with status 1 if --max-p99-ms or --max-error-rate is exceeded.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from perf.fake_upstream import CLIENT_ID, CLIENT_SECRET
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (name, path template, id source list endpoint, weight)
+ENDPOINTS = (
+    ("/times/waittimes", "/times/waittimes", None, 20),
+    ("/times/waittimes/{id}", "/times/waittimes/{id}", "/times/waittimes", 10),
+    ("/times/waittimes/stats", "/times/waittimes/stats", None, 6),
+    ("/times/showtimes", "/times/showtimes", None, 8),
+    ("/times/showtimes/{id}", "/times/showtimes/{id}", "/times/showtimes", 4),
+    ("/times/showtimes/upcoming", "/times/showtimes/upcoming?within=2h", None, 4),
+    ("/times/showtimes/{id}/next", "/times/showtimes/{id}/next", "/times/showtimes", 4),
+    ("/times/openingtimes", "/times/openingtimes", None, 6),
+    ("/times/seasons", "/times/seasons", None, 3),
+    ("/info/attractions", "/info/attractions", None, 8),
+    ("/info/attractions/{id}", "/info/attractions/{id}", "/info/attractions", 12),
+    ("/info/shows", "/info/shows", None, 4),
+    ("/info/shows/{id}", "/info/shows/{id}", "/info/shows", 6),
+    ("/info/shops", "/info/shops", None, 2),
+    ("/info/restaurants", "/info/restaurants", None, 3),
+    ("/info/services", "/info/services", None, 2),
+    ("/park/snapshot", "/park/snapshot", None, 10),
+)
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def record(self, name: str, latency_ms: float, ok: bool) -> None:
+        self.latencies[name].append(latency_ms)
+        if not ok:
+            self.errors[name] += 1
+
+    def report(self, duration: float) -> dict:
+        rows = {}
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            rows[name] = {
+                "requests": len(values),
+                "errors": self.errors[name],
+                "rps": round(len(values) / duration, 1),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+                "max_ms": round(values[-1], 2),
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        all_values = sorted(v for values in self.latencies.values() for v in values)
+        return {
+            "duration_s": round(duration, 2),
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "rps": round(total / duration, 1) if duration else 0.0,
+            "p50_ms": round(percentile(all_values, 50), 2),
+            "p95_ms": round(percentile(all_values, 95), 2),
+            "p99_ms": round(percentile(all_values, 99), 2),
+            "endpoints": rows,
+        }
+
+
+def print_report(report: dict) -> None:
+    header = f"{'endpoint':<28}{'req':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, row in report["endpoints"].items():
+        print(
+            f"{name:<28}{row['requests']:>8}{row['errors']:>6}{row['rps']:>9}"
+            f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}{row['max_ms']:>9}"
+        )
+    print("-" * len(header))
+    print(
+        f"{'total':<28}{report['requests']:>8}{report['errors']:>6}{report['rps']:>9}"
+        f"{report['p50_ms']:>9}{report['p95_ms']:>9}{report['p99_ms']:>9}"
+    )
+
+
+def _free_port() -> int:
+    import socket
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_process(args: list[str], env: Optional[dict] = None, log_path: Optional[Path] = None) -> subprocess.Popen:
+    stdout = open(log_path, "w") if log_path else subprocess.DEVNULL
+    return subprocess.Popen(args, cwd=ROOT, env=env, stdout=stdout, stderr=subprocess.STDOUT)
+
+
+async def _wait_ready(client: httpx.AsyncClient, url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            response = await client.get(url)
+            if response.status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError(f"Not ready after {timeout}s: {url}")
+
+
+async def _discover_ids(client: httpx.AsyncClient, base_url: str) -> dict[str, list[int]]:
+    ids = {}
+    for _, _, source, _ in ENDPOINTS:
+        if source is None or source in ids:
+            continue
+        response = await client.get(f"{base_url}{source}")
+        response.raise_for_status()
+        body = response.json()
+        items = next(v for k, v in body.items() if isinstance(v, list))
+        ids[source] = [item["id"] for item in items]
+    return ids
+
+
+async def run_load(base_url: str, duration: float, concurrency: int, seed: int, warmup: float) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=30.0, limits=limits) as client:
+        for name, path, _, _ in ENDPOINTS:
+            if "{id}" not in path:
+                await _wait_ready(client, f"{base_url}{path}", timeout=60)
+        ids = await _discover_ids(client, base_url)
+
+        names = [e[0] for e in ENDPOINTS]
+        weights = [e[3] for e in ENDPOINTS]
+        by_name = {e[0]: e for e in ENDPOINTS}
+        stats = Stats()
+        stop_at = 0.0
+        record_from = 0.0
+
+        async def worker(worker_id: int) -> None:
+            rng = random.Random(seed + worker_id)
+            while time.perf_counter() < stop_at:
+                name = rng.choices(names, weights)[0]
+                _, path, source, _ = by_name[name]
+                if source:
+                    if not ids[source]:
+                        continue
+                    path = path.replace("{id}", str(rng.choice(ids[source])))
+                start = time.perf_counter()
+                try:
+                    response = await client.get(f"{base_url}{path}")
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                end = time.perf_counter()
+                if start >= record_from:
+                    stats.record(name, (end - start) * 1000, ok)
+
+        begin = time.perf_counter()
+        record_from = begin + warmup
+        stop_at = record_from + duration
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        return stats.report(time.perf_counter() - record_from)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline load test against a local fake upstream")
+    parser.add_argument("--app-url", help="Use an already running server instead of starting one")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--pois", type=int, default=300, help="Fake upstream payload size")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the server")
+    parser.add_argument("--upstream-latency-ms", type=float, default=20.0)
+    parser.add_argument("--upstream-jitter-ms", type=float, default=10.0)
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    parser.add_argument("--upstream-unauthorized-rate", type=float, default=0.0)
+    parser.add_argument("--json", dest="json_path", help="Write the report as JSON")
+    parser.add_argument("--max-p99-ms", type=float, help="Fail if overall p99 exceeds this")
+    parser.add_argument("--max-error-rate", type=float, default=0.0, help="Fail if error ratio exceeds this")
+    args = parser.parse_args()
+
+    processes: list[subprocess.Popen] = []
+    workdir = Path(tempfile.mkdtemp(prefix="loadgen-"))
+    base_url = args.app_url
+
+    try:
+        if base_url is None:
+            upstream_port, app_port = _free_port(), _free_port()
+            upstream = f"http://127.0.0.1:{upstream_port}"
+            processes.append(_start_process([
+                sys.executable, "-m", "perf.fake_upstream",
+                "--port", str(upstream_port),
+                "--pois", str(args.pois),
+                "--latency-ms", str(args.upstream_latency_ms),
+                "--jitter-ms", str(args.upstream_jitter_ms),
+                "--error-rate", str(args.upstream_error_rate),
+                "--unauthorized-rate", str(args.upstream_unauthorized_rate),
+                "--enc-key", "fakekey1",
+                "--enc-iv", "fakeiv12",
+            ], log_path=workdir / "upstream.log"))
+
+            env = {
+                **os.environ,
+                "DATABASE_URL": f"sqlite:///{workdir / 'data.db'}",
+                "FB_APP_ID": "fake-app",
+                "FB_API_KEY": "fake-api-key",
+                "FB_PROJECT_ID": "fake-project",
+                "API_BASE": upstream,
+                "AUTH_URL": f"{upstream}/token-srv/token",
+                "FIREBASE_REMOTE_CONFIG_URL": f"{upstream}/v1/projects/{{project_id}}/namespaces/firebase:fetch",
+                "FIREBASE_IDENTITY_URL": f"{upstream}/v1/accounts:signUp",
+                "ENC_KEY": "fakekey1",
+                "ENC_IV": "fakeiv12",
+                "USER_KEY": "v3_live_android_exozet_api_username",
+                "PASS_KEY": "v3_live_android_exozet_api_password",
+                "API_USERNAME": CLIENT_ID,
+                "API_PASSWORD": CLIENT_SECRET,
+                "APP_VERSION": "0.0.0-loadtest",
+                # All simulated clients share one address: no per-client rate limits
+                "RATE_LIMITS": "",
+            }
+            processes.append(_start_process([
+                sys.executable, "-m", "uvicorn", "main:app",
+                "--host", "127.0.0.1", "--port", str(app_port),
+                "--workers", str(args.workers), "--log-level", "warning",
+            ], env=env, log_path=workdir / "server.log"))
+            base_url = f"http://127.0.0.1:{app_port}"
+            print(f"Upstream {upstream}, server {base_url}, logs in {workdir}")
+
+        report = asyncio.run(run_load(base_url, args.duration, args.concurrency, args.seed, args.warmup))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    print_report(report)
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+
+    failed = False
+    if args.max_p99_ms is not None and report["p99_ms"] > args.max_p99_ms:
+        print(f"FAIL: p99 {report['p99_ms']}ms > {args.max_p99_ms}ms")
+        failed = True
+    error_rate = report["errors"] / report["requests"] if report["requests"] else 1.0
+    if error_rate > args.max_error_rate:
+        print(f"FAIL: error rate {error_rate:.4f} > {args.max_error_rate}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Synthetic upstream data.
+Seeded generator for POI, wait time, show time, season and opening time
+payloads in the shape returned by the Europapark API.
+"""
+
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+PARK_CENTER = (48.2660, 7.7220)
+PARK_SPAN = (0.012, 0.018)
+
+POI_TYPES = (
+    ("attraction", 0.35),
+    ("gastronomy", 0.25),
+    ("shopping", 0.15),
+    ("service", 0.15),
+    ("showlocation", 0.10),
+)
+
+TIME_CODES = (91, 222, 333, 444, 555, 666, 777, 999)
+
+_SYLLABLES = (
+    "blue", "fire", "silver", "star", "wodan", "euro", "sat", "voltron", "nevera",
+    "arthur", "pegasus", "atlantica", "poseidon", "matterhorn", "alpen", "express",
+    "tiroler", "wildwasser", "bahn", "fjord", "rafting", "piraten", "batavia",
+    "café", "crêpes", "brasserie", "glühwein", "schloss", "über", "garten",
+)
+
+
+def _name(rng: random.Random) -> str:
+    words = rng.sample(_SYLLABLES, rng.randint(1, 3))
+    return " ".join(w.capitalize() for w in words)
+
+
+def _excerpt(rng: random.Random) -> str:
+    return " ".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(8, 30))).capitalize() + "."
+
+
+def _image(rng: random.Random, poi_id: int) -> dict:
+    return {
+        "small": f"https://cdn.example.invalid/img/{poi_id}_small.jpg",
+        "medium": f"https://cdn.example.invalid/img/{poi_id}_medium.jpg",
+    }
+
+
+def _pick_type(rng: random.Random) -> str:
+    roll = rng.random()
+    cumulative = 0.0
+    for poi_type, weight in POI_TYPES:
+        cumulative += weight
+        if roll < cumulative:
+            return poi_type
+    return POI_TYPES[-1][0]
+
+
+class SyntheticPark:
+    """
+    Deterministic synthetic dataset.
+
+    Args:
+        poi_count: Number of POIs (all scopes)
+        seed: RNG seed; same seed and size give identical payloads
+        rulantica_share: Fraction of POIs scoped to Rulantica instead of Europapark
+        today: Reference date for show times, seasons and opening times
+    """
+
+    def __init__(
+        self,
+        poi_count: int = 300,
+        seed: int = 42,
+        rulantica_share: float = 0.1,
+        today: Optional[date] = None,
+    ):
+        self.poi_count = poi_count
+        self.seed = seed
+        self.rulantica_share = rulantica_share
+        self.today = today or date.today()
+        self.tz = timezone(timedelta(hours=2))
+        self._rng = random.Random(seed)
+        self.pois = self._generate_pois()
+
+    def _generate_pois(self) -> list[dict]:
+        rng = self._rng
+        pois = []
+        show_id = 10_000_000
+        for index in range(self.poi_count):
+            poi_id = 1000 + index
+            poi_type = _pick_type(rng)
+            scope = "rulantica" if rng.random() < self.rulantica_share else "europapark"
+            poi = {
+                "id": poi_id,
+                "code": 100 + index,
+                "name": _name(rng),
+                "type": poi_type,
+                "scopes": [scope],
+                "areaId": rng.randint(1, 20),
+                "latitude": round(PARK_CENTER[0] + rng.uniform(-1, 1) * PARK_SPAN[0], 6),
+                "longitude": round(PARK_CENTER[1] + rng.uniform(-1, 1) * PARK_SPAN[1], 6),
+                "excerpt": _excerpt(rng),
+                "image": _image(rng, poi_id),
+                "icon": {"small": f"https://cdn.example.invalid/icon/{poi_type}.svg"},
+            }
+            if poi_type == "attraction":
+                poi.update({
+                    "minHeight": rng.choice([0, 100, 120, 140]),
+                    "minHeightAdult": rng.choice([0, 90, 100]),
+                    "maxHeight": rng.choice([0, 195]),
+                    "minAge": rng.choice([0, 4, 6, 8]),
+                    "minAgeAdult": rng.choice([0, 2, 4]),
+                    "maxAge": 0,
+                    "stressStrainsSensationsLevel": {
+                        key: rng.randint(0, 3)
+                        for key in (
+                            "light", "noise", "smoke", "smell", "darkness", "height",
+                            "fear", "narrowSpace", "gForce", "splashingWater",
+                        )
+                    },
+                })
+            if poi_type == "showlocation":
+                poi["shows"] = []
+                for _ in range(rng.randint(1, 3)):
+                    show_id += 1
+                    poi["shows"].append({
+                        "id": show_id,
+                        "name": _name(rng),
+                        "excerpt": _excerpt(rng),
+                        "duration": rng.choice([15, 20, 30, 45]),
+                        "image": _image(rng, show_id),
+                        "icon": {"small": "https://cdn.example.invalid/icon/show.svg"},
+                    })
+            pois.append(poi)
+        return pois
+
+    def _dt(self, day: date, hour: int, minute: int = 0) -> str:
+        return datetime(day.year, day.month, day.day, hour, minute, tzinfo=self.tz).isoformat()
+
+    def poi_group(self) -> dict:
+        return {"pois": self.pois}
+
+    def waiting_times(self, rng: Optional[random.Random] = None) -> list[dict]:
+        """Current wait times. Pass an RNG to vary times between calls."""
+        rng = rng or random.Random(self.seed + 1)
+        entries = []
+        for poi in self.pois:
+            if poi["type"] != "attraction":
+                continue
+            if rng.random() < 0.85:
+                time_value = rng.randint(0, 90)
+            else:
+                time_value = rng.choice(TIME_CODES)
+            entries.append({"code": poi["code"], "time": time_value})
+        return entries
+
+    def show_times(self) -> list[dict]:
+        rng = random.Random(self.seed + 2)
+        tomorrow = self.today + timedelta(days=1)
+        entries = []
+        for poi in self.pois:
+            for show in poi.get("shows", []):
+                hours = sorted(rng.sample(range(10, 19), rng.randint(1, 5)))
+                minute = rng.choice([0, 15, 30, 45])
+                entries.append({
+                    "showId": show["id"],
+                    "today": [self._dt(self.today, h, minute) for h in hours],
+                    "tomorrow": [self._dt(tomorrow, h, minute) for h in hours],
+                })
+        return entries
+
+    def seasons(self) -> list[dict]:
+        year = self.today.year
+        periods = (
+            ("summer", "Sommersaison", date(year, 3, 29), date(year, 11, 3)),
+            ("halloween", "Halloween", date(year, 9, 27), date(year, 11, 3)),
+            ("winter", "Wintersaison", date(year, 11, 29), date(year + 1, 1, 11)),
+        )
+        seasons = []
+        for index, (theme, name, start, end) in enumerate(periods, start=1):
+            for scope in ("europapark", "rulantica"):
+                seasons.append({
+                    "id": index * 10 + (0 if scope == "europapark" else 1),
+                    "theme": theme,
+                    "name": name,
+                    "description": f"{name} im {scope.capitalize()}.",
+                    "iconSvg": {"reference": f"https://cdn.example.invalid/season/{theme}.svg"},
+                    "startAt": self._dt(start, 0),
+                    "endAt": self._dt(end, 23, 59),
+                    "scopes": [scope],
+                })
+        return seasons
+
+    def opening_times(self) -> dict:
+        tomorrow = self.today + timedelta(days=1)
+
+        def day(d: date) -> dict:
+            return {"date": self._dt(d, 0), "start": self._dt(d, 9), "end": self._dt(d, 18)}
+
+        return {
+            "today": day(self.today),
+            "tomorrow": day(tomorrow),
+            "next": day(tomorrow),
+            "messages": [{"short": "Geöffnet", "long": "Der Park ist heute von 9 bis 18 Uhr geöffnet."}],
+        }
@@ -0,0 +1,104 @@
+"""Admin Router."""
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse
+
+from services.admin_auth import require_admin
+from services.admission import get_admission_controller
+from services.bundle import (
+    MEDIA_TYPE as BUNDLE_MEDIA_TYPE,
+    InvalidBundleError,
+    decode_bundle,
+    encode_bundle,
+    export_bundle,
+    import_bundle,
+)
+from services.ingest import get_ingest_pipeline
+from services.profiling import get_profiler
+from services.response_cache import get_response_cache, no_response_cache
+from services.scheduler import get_scheduler
+from services.webhooks import get_webhook_service
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles", summary="Stored request profiles")
+async def profiles():
+    """Returns metadata of the most recent request profiles (newest first)."""
+    entries = get_profiler().list_profiles()
+    return {
+        "count": len(entries),
+        "profiles": entries
+    }
+
+
+@router.get("/profiles/{profile_id}", summary="Request profile (folded stacks)", response_class=PlainTextResponse)
+async def profile(profile_id: int):
+    """Returns a profile in folded stack format for flame graph tools."""
+    entry = get_profiler().get_profile(profile_id)
+
+    if not entry:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return PlainTextResponse(entry.to_folded())
+
+
+@router.get("/response-cache", summary="Response cache statistics")
+async def response_cache():
+    """Returns size, hit and miss counts of the response cache."""
+    return get_response_cache().get_stats()
+
+
+@router.get("/admission", summary="Admission control status")
+async def admission():
+    """Returns in-flight requests, event loop lag, overload state and configured rate limits."""
+    return get_admission_controller().get_status()
+
+
+@router.get("/bundle", summary="Export cache bundle", dependencies=[Depends(no_response_cache)])
+async def bundle_export():
+    """Returns all cached datasets of the current generation as a gzip-compressed bundle."""
+    body = encode_bundle(await export_bundle())
+    filename = f"cache-bundle-{datetime.now():%Y%m%d-%H%M%S}.json.gz"
+    return Response(body, media_type=BUNDLE_MEDIA_TYPE, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+@router.post("/bundle", summary="Import cache bundle")
+async def bundle_import(request: Request):
+    """Imports a bundle (request body, gzip or plain JSON) as a new generation and rebuilds the derived data."""
+    try:
+        return await import_bundle(decode_bundle(await request.body()))
+    except InvalidBundleError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/scheduler", summary="Scheduled jobs")
+async def scheduler():
+    """Returns schedule, next run, last duration and last error of every background job, plus upstream slot usage."""
+    return get_scheduler().get_status()
+
+
+@router.post("/scheduler/{job}/run", summary="Run a job now")
+async def scheduler_run(job: str, wait: bool = False):
+    """
+    Runs a job (e.g. `waittimes`) immediately. Joins a run in progress and is
+    debounced right after a run; `wait=true` returns once the run has finished.
+    """
+    try:
+        return await get_scheduler().run_now(job, wait)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+
+@router.get("/ingest", summary="Ingest pipeline runs")
+async def ingest():
+    """Returns the pipeline stages and the last run per dataset and language with duration and size of every stage."""
+    return get_ingest_pipeline().get_status()
+
+
+@router.get("/webhooks", summary="Webhook delivery status")
+async def webhooks():
+    """Returns subscription count, queued batches and delivery counters and last error per endpoint."""
+    return get_webhook_service().get_status()
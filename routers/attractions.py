@@ -1,32 +1,42 @@
 """Attractions Router."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from services.attractions import get_attraction_info, get_all_attractions
+from fastapi import APIRouter, Depends, HTTPException
+
+from routers.params import ListParams, fields_param, json_response, multi_get_response, page_response, project, run_query
+from services.cdn import add_surrogate_keys
+from services.attractions import get_attraction_info, get_attraction_infos, query_attractions
+from services.projection import Projection
 
 router = APIRouter(prefix="/info", tags=["Info"])
 
 
 @router.get("/attractions", summary="All attractions")
-async def attractions():
-    """Returns all attractions with basic info and wait times."""
-    entries = await get_all_attractions()
+async def attractions(params: ListParams = Depends()):
+    """Returns all attractions with basic info and wait times. Sort orders: name, -name, id, -id."""
+    if params.ids is not None:
+        found = await get_attraction_infos(params.ids)
+        return multi_get_response("attractions", params.ids, found, params.projection)
+    
+    page = await run_query(query_attractions(
+        params.area_ids, params.sort, params.cursor, params.limit,
+        projection=params.projection,
+    ))
     
-    if not entries:
+    if page is None:
         raise HTTPException(status_code=503, detail="Cache not initialized")
     
-    return {
-        "count": len(entries),
-        "attractions": [e.model_dump(exclude_none=True) for e in entries]
-    }
+    return page_response("attractions", page, params)
 
 
 @router.get("/attractions/{attraction_id}", summary="Attraction details")
-async def attraction_info(attraction_id: int):
+async def attraction_info(attraction_id: int, fields: Optional[Projection] = Depends(fields_param)):
     """Returns full details including requirements, stress levels, and images."""
     info = await get_attraction_info(attraction_id)
     
     if not info:
         raise HTTPException(status_code=404, detail="Attraction not found")
     
-    return info.model_dump(exclude_none=True)
+    add_surrogate_keys("poi", [attraction_id])
+    return json_response(project(info, fields))
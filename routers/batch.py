@@ -0,0 +1,84 @@
+"""Batch Router."""
+
+import asyncio
+import json
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+import httpx
+from fastapi import APIRouter, Request
+from pydantic import BaseModel, Field
+
+from services.admission import get_admission_controller
+from services.cache import get_cache_service
+from services.language import get_language
+from services.parks import split_park_path
+
+router = APIRouter(tags=["Batch"])
+
+MAX_BATCH_SIZE = 50
+ALLOWED_PREFIXES = ("/times/", "/info/")
+
+
+class BatchItem(BaseModel):
+    """GET sub-request."""
+    id: Optional[str] = Field(None, description="Client reference, echoed in the response")
+    path: str = Field(..., description="Path with query string, e.g. /info/attractions/123?fields=id,name")
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+def _is_allowed(path: str) -> bool:
+    """
+    Relative path below an allowed prefix. Dot segments (also percent-encoded)
+    are rejected, since the HTTP client resolves them before sending.
+    """
+    parts = urlsplit(path)
+    if parts.scheme or parts.netloc:
+        return False
+    segments = unquote(parts.path).split("/")
+    if "." in segments or ".." in segments:
+        return False
+    return split_park_path(parts.path)[1].startswith(ALLOWED_PREFIXES)
+
+
+async def _run(client: httpx.AsyncClient, item: BatchItem) -> dict:
+    result = {"id": item.id, "path": item.path} if item.id is not None else {"path": item.path}
+
+    if not _is_allowed(item.path):
+        result.update(status=400, body={"detail": f"Only {', '.join(ALLOWED_PREFIXES)} paths (optionally below /{{park}}) are allowed"})
+        return result
+
+    response = await client.get(item.path)
+    try:
+        body = response.json()
+    except json.JSONDecodeError:
+        body = response.text
+    result.update(status=response.status_code, body=body)
+    return result
+
+
+@router.post("/batch", summary="Batch GET requests")
+async def batch(payload: BatchRequest, request: Request):
+    """
+    Runs several GET sub-requests against /times/* and /info/* (optionally
+    below /{park}) in one round trip. All sub-requests see the same data
+    generation; refreshes are published after the batch.
+    """
+    # Sub-requests use the language negotiated for the batch request (unless they set lang=)
+    headers = {"Accept-Language": get_language()}
+    # Sub-requests count against the rate limit of the calling client
+    client = (get_admission_controller().client_key(request.scope), 0)
+    transport = httpx.ASGITransport(app=request.app, client=client)
+
+    async with get_cache_service().pinned() as generations:
+        async with httpx.AsyncClient(transport=transport, base_url="http://batch", headers=headers) as client:
+            responses = await asyncio.gather(*(_run(client, item) for item in payload.requests))
+
+    return {
+        "count": len(responses),
+        "generations": generations,
+        "responses": responses
+    }
@@ -0,0 +1,76 @@
+"""Calendar Router."""
+
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from routers.params import fields_param, json_response, project
+from services.park_calendar import MAX_CALENDAR_DAYS, get_calendar_days, get_park_status
+from services.projection import Projection
+from services.response_cache import no_response_cache
+from services.showtimes import PARK_TIMEZONE
+
+# Defaults and status depend on the current date, so responses are not cached
+router = APIRouter(prefix="/times", tags=["Times"], dependencies=[Depends(no_response_cache)])
+
+DEFAULT_CALENDAR_DAYS = 31
+# Accepted dates and timestamps around today (keeps date arithmetic clear of date.min/date.max)
+MAX_CALENDAR_YEARS = 10
+
+
+def _check_window(day: date, name: str) -> None:
+    today = datetime.now(PARK_TIMEZONE).date()
+    if abs((day - today).days) > MAX_CALENDAR_YEARS * 366:
+        raise HTTPException(status_code=400, detail=f"{name} must be within {MAX_CALENDAR_YEARS} years of today")
+
+
+@router.get("/calendar", summary="Park calendar")
+async def calendar(
+    from_: Optional[date] = Query(None, alias="from", description="First date (default: today)"),
+    to: Optional[date] = Query(None, description=f"Last date, inclusive (default: {DEFAULT_CALENDAR_DAYS} days)"),
+    fields: Optional[Projection] = Depends(fields_param),
+):
+    """
+    Returns one entry per date with status (open, closed, unknown), opening hours
+    and active seasons. Opening hours are only published for the next days.
+    """
+    for value, name in ((from_, "from"), (to, "to")):
+        if value is not None:
+            _check_window(value, name)
+    first = from_ or datetime.now(PARK_TIMEZONE).date()
+    last = to or first + timedelta(days=DEFAULT_CALENDAR_DAYS - 1)
+    if last < first:
+        raise HTTPException(status_code=400, detail="to must not be before from")
+    if (last - first).days >= MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_CALENDAR_DAYS} days per request")
+    
+    days = await get_calendar_days(first, last)
+    
+    if days is None:
+        raise HTTPException(status_code=503, detail="No data available")
+    
+    return json_response({
+        "count": len(days),
+        "days": project(days, fields)
+    })
+
+
+@router.get("/calendar/status", summary="Park status at a time")
+async def calendar_status(
+    at: Optional[datetime] = Query(None, description="ISO timestamp (default: now, park time if no offset)"),
+    fields: Optional[Projection] = Depends(fields_param),
+):
+    """Returns whether the park is open at a time, the active seasons and the next opening."""
+    if at is not None:
+        _check_window(at.date(), "at")
+    moment = at or datetime.now(PARK_TIMEZONE)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=PARK_TIMEZONE)
+    
+    status = await get_park_status(moment)
+    
+    if status is None:
+        raise HTTPException(status_code=503, detail="No data available")
+    
+    return json_response(project(status, fields))
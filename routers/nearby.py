@@ -0,0 +1,48 @@
+"""Nearby Router."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from routers.params import fields_param, json_response, project, split_values
+from services.geo import get_nearby
+from services.projection import Projection
+
+router = APIRouter(prefix="/info", tags=["Info"])
+
+INCLUDE_OPTIONS = {"waittimes", "showtimes"}
+
+
+@router.get("/nearby", summary="POIs nearby")
+async def nearby(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude"),
+    radius: float = Query(500, gt=0, le=5000, description="Radius in meters"),
+    type: Optional[str] = Query(None, description="POI types, comma-separated (e.g. attraction,gastronomy)"),
+    include: Optional[str] = Query(None, description="Join current data: waittimes, showtimes"),
+    fields: Optional[Projection] = Depends(fields_param),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Returns POIs within the radius sorted by distance (meters), optionally with wait times and show times."""
+    includes = split_values(include)
+    unknown = includes - INCLUDE_OPTIONS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(sorted(unknown))}")
+    
+    entries = await get_nearby(
+        lat,
+        lon,
+        radius,
+        types=split_values(type) or None,
+        limit=limit,
+        with_waittimes="waittimes" in includes,
+        with_showtimes="showtimes" in includes,
+    )
+    
+    if entries is None:
+        raise HTTPException(status_code=503, detail="No data available")
+    
+    return json_response({
+        "count": len(entries),
+        "pois": project(entries, fields)
+    })
@@ -1,18 +1,24 @@
 """Openingtimes Router."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from services.openingtimes import get_opening_times
+from fastapi import APIRouter, Depends, HTTPException
+
+from routers.params import fields_param, json_response, project
+from services.projection import Projection
+from services.openingtimes import get_opening_times, opening_times_loaded
 
 router = APIRouter(prefix="/times", tags=["Times"])
 
 
 @router.get("/openingtimes", summary="Opening hours")
-async def openingtimes():
+async def openingtimes(fields: Optional[Projection] = Depends(fields_param)):
     """Returns current opening hours (today, tomorrow, next)."""
     info = await get_opening_times()
     
-    if not info:
-        raise HTTPException(status_code=503, detail="No data available")
+    if info is None:
+        if not opening_times_loaded():
+            raise HTTPException(status_code=503, detail="No data available")
+        raise HTTPException(status_code=404, detail="No opening times for this park")
     
-    return info.model_dump(exclude_none=True)
+    return json_response(project(info, fields))
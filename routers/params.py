@@ -0,0 +1,142 @@
+"""Shared query parameters and responses for list and detail endpoints."""
+
+from typing import Any, Optional
+
+from fastapi import HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from services.cdn import add_surrogate_keys
+from services.listing import InvalidQueryError, Page
+from services.projection import Projection, compile_projection
+
+FIELDS_DESCRIPTION = "Fields to include, comma-separated; nested with '.' (e.g. id,name,wait_time.time)"
+IDS_DESCRIPTION = "IDs, comma-separated: returns the details of these entries (multi-get)"
+MAX_IDS = 200
+
+
+def split_values(value: Optional[str]) -> set[str]:
+    """Splits a comma-separated query parameter."""
+    if not value:
+        return set()
+    return {part.strip() for part in value.split(",") if part.strip()}
+
+
+def parse_ids(value: Optional[str], name: str = "id") -> set[int]:
+    """Parses a comma-separated list of integer IDs (400 on invalid values)."""
+    try:
+        return {int(part) for part in split_values(value)}
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: expected comma-separated integers")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Projection]:
+    """Compiles a sparse fieldset (400 on invalid field lists)."""
+    if fields is None:
+        return None
+    try:
+        return compile_projection(fields)
+    except InvalidQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def fields_param(
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+) -> Optional[Projection]:
+    """Sparse fieldset dependency for endpoints without list parameters."""
+    return parse_fields(fields)
+
+
+def json_response(content: Any) -> JSONResponse:
+    """
+    Response for rendered, JSON-native data (validated when the data was ingested).
+    Returning a response object skips FastAPI's jsonable_encoder pass over the content.
+    """
+    return JSONResponse(content)
+
+
+def project(data: Any, projection: Optional[Projection]) -> Any:
+    """Applies a sparse fieldset to a response object or list of objects."""
+    return projection(data) if projection else data
+
+
+def parse_id_list(value: Optional[str], name: str = "ids") -> Optional[list[int]]:
+    """Parses an ordered, de-duplicated ID list (400 on invalid values or too many IDs)."""
+    if value is None:
+        return None
+    try:
+        ids = list(dict.fromkeys(int(part) for part in value.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: expected comma-separated integers")
+    if not ids:
+        raise HTTPException(status_code=400, detail=f"Invalid {name}: no IDs given")
+    if len(ids) > MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"Too many {name}: at most {MAX_IDS} allowed")
+    return ids
+
+
+def multi_get_response(
+    key: str,
+    ids: list[int],
+    found: Optional[dict[int, dict]],
+    projection: Optional[Projection],
+    item: str = "poi",
+) -> JSONResponse:
+    """
+    Multi-get response: entries in request order, unknown IDs in not_found.
+    `found` maps ID -> rendered entry (None if no data is cached, answered with 503).
+    The response is tagged with the surrogate key of every entry (`{item}-{id}`).
+    """
+    if found is None:
+        raise HTTPException(status_code=503, detail="No data available")
+    add_surrogate_keys(item, (i for i in ids if i in found))
+    entries = [project(found[i], projection) for i in ids if i in found]
+    return json_response({
+        "count": len(entries),
+        key: entries,
+        "not_found": [i for i in ids if i not in found]
+    })
+
+
+class ListParams:
+    """Filter, sort and pagination parameters shared by list endpoints."""
+
+    def __init__(
+        self,
+        area_id: Optional[str] = Query(None, description="Area IDs, comma-separated"),
+        sort: Optional[str] = Query(None, description="Sort order, prefix with '-' for descending"),
+        cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+        limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (default: all)"),
+        fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+        ids: Optional[str] = Query(None, description=IDS_DESCRIPTION),
+    ):
+        self.ids = parse_id_list(ids)
+        if self.ids is not None and (area_id or sort or cursor or limit):
+            raise HTTPException(status_code=400, detail="ids cannot be combined with area_id, sort, cursor or limit")
+        self.area_ids = parse_ids(area_id, "area_id") or None
+        self.sort = sort
+        self.cursor = cursor
+        self.limit = limit
+        self.projection = parse_fields(fields)
+
+    @property
+    def paginated(self) -> bool:
+        return self.limit is not None or self.cursor is not None
+
+
+async def run_query(query) -> Optional[Page]:
+    """Awaits a service query, mapping invalid sort orders and cursors to 400."""
+    try:
+        return await query
+    except InvalidQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def page_response(key: str, page: Page, params: ListParams) -> JSONResponse:
+    """List response; pagination adds next_cursor (null on the last page)."""
+    response = {
+        "count": len(page.rows),
+        key: page.rows
+    }
+    if params.paginated:
+        response["next_cursor"] = page.next_cursor
+    return json_response(response)
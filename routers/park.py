@@ -0,0 +1,58 @@
+"""Park Router."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+
+from services.response_cache import no_response_cache
+from services.snapshot import get_snapshot_renderer
+
+router = APIRouter(prefix="/park", tags=["Park"])
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """True if the Accept-Encoding header allows gzip (q > 0)."""
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip().lower()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@router.get("/snapshot", summary="Park snapshot", dependencies=[Depends(no_response_cache)])
+async def snapshot(
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Returns opening times, current season, all wait times and today's upcoming shows
+    in one pre-rendered document. Supports ETag / If-None-Match and gzip.
+    """
+    rendered = await get_snapshot_renderer().get()
+
+    if rendered is None:
+        raise HTTPException(status_code=503, detail="Cache not initialized")
+
+    headers = {"ETag": rendered.etag, "Vary": "Accept-Encoding"}
+    if etag_matches(if_none_match, rendered.etag):
+        return Response(status_code=304, headers=headers)
+
+    if accepts_gzip(accept_encoding):
+        headers["Content-Encoding"] = "gzip"
+        return Response(rendered.gzip_body, media_type="application/json", headers=headers)
+
+    return Response(rendered.body, media_type="application/json", headers=headers)
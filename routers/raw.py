@@ -1,6 +1,6 @@
 """Raw API Router."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
 from services.europapark_api import (
     get_waiting_times,
@@ -9,8 +9,9 @@ from services.europapark_api import (
     get_opening_times,
     get_show_times
 )
+from services.replication import require_upstream
 
-router = APIRouter(prefix="/raw", tags=["Raw"])
+router = APIRouter(prefix="/raw", tags=["Raw"], dependencies=[Depends(require_upstream)])
 
 
 @router.get("/waittimes", summary="Raw wait times")
@@ -0,0 +1,54 @@
+"""Internal Replication Router."""
+
+import gzip
+import json
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from pydantic import BaseModel
+
+from routers.park import accepts_gzip
+from services.cache import get_cache_service
+from services.replication import get_replica_follower, require_replication_token
+from services.response_cache import no_response_cache
+
+router = APIRouter(
+    prefix="/internal",
+    include_in_schema=False,
+    dependencies=[Depends(require_replication_token), Depends(no_response_cache)],
+)
+
+
+class ReplicationChanges(BaseModel):
+    epoch: str
+    since: int
+    generation: int
+    keys: list[str]
+    partitions: list[dict[str, Any]]
+
+
+@router.get("/replication")
+async def replication_changes(
+    since: int = Query(0, ge=0),
+    epoch: Optional[str] = Query(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    """Partitions changed since generation `since` of `epoch` (everything for another epoch)."""
+    if get_replica_follower() is not None:
+        raise HTTPException(status_code=404, detail="Replicas cannot be followed")
+
+    changes = await get_cache_service().export_changes(since, epoch or None)
+    body = json.dumps(changes, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if accepts_gzip(accept_encoding):
+        return Response(gzip.compress(body), media_type="application/json", headers={"Content-Encoding": "gzip"})
+    return Response(body, media_type="application/json")
+
+
+@router.post("/replication")
+async def replication_push(changes: ReplicationChanges):
+    """Receives changes pushed by the primary."""
+    follower = get_replica_follower()
+    if follower is None:
+        raise HTTPException(status_code=404, detail="Not a replica")
+    applied = await follower.receive(changes.model_dump())
+    return {"applied": applied, "generation": follower.generation}
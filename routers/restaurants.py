@@ -1,32 +1,42 @@
 """Restaurants Router."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from services.pois import get_all_restaurants, get_restaurant_by_id
+from fastapi import APIRouter, Depends, HTTPException
+
+from routers.params import ListParams, fields_param, json_response, multi_get_response, page_response, project, run_query
+from services.cdn import add_surrogate_keys
+from services.pois import get_restaurant_by_id, get_restaurants_by_ids, query_pois
+from services.projection import Projection
 
 router = APIRouter(prefix="/info", tags=["Info"])
 
 
 @router.get("/restaurants", summary="All restaurants")
-async def restaurants():
-    """Returns all restaurants and gastronomy with locations."""
-    entries = await get_all_restaurants()
+async def restaurants(params: ListParams = Depends()):
+    """Returns all restaurants and gastronomy with locations. Sort orders: name, -name, id, -id."""
+    if params.ids is not None:
+        found = await get_restaurants_by_ids(params.ids)
+        return multi_get_response("restaurants", params.ids, found, params.projection)
+    
+    page = await run_query(query_pois(
+        "gastronomy", params.area_ids, params.sort, params.cursor, params.limit,
+        projection=params.projection,
+    ))
     
-    if not entries:
+    if page is None:
         raise HTTPException(status_code=503, detail="No data available")
     
-    return {
-        "count": len(entries),
-        "restaurants": [e.model_dump(exclude_none=True) for e in entries]
-    }
+    return page_response("restaurants", page, params)
 
 
 @router.get("/restaurants/{restaurant_id}", summary="Restaurant details")
-async def restaurant_info(restaurant_id: int):
+async def restaurant_info(restaurant_id: int, fields: Optional[Projection] = Depends(fields_param)):
     """Returns restaurant details."""
     info = await get_restaurant_by_id(restaurant_id)
     
     if not info:
         raise HTTPException(status_code=404, detail="Restaurant not found")
     
-    return info.model_dump(exclude_none=True)
+    add_surrogate_keys("poi", [restaurant_id])
+    return json_response(project(info, fields))
@@ -0,0 +1,30 @@
+"""Search Router."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from routers.params import fields_param, json_response, project, split_values
+from services.projection import Projection
+from services.search import search as search_index
+
+router = APIRouter(prefix="/info", tags=["Info"])
+
+
+@router.get("/search", summary="Search POIs and shows")
+async def search(
+    q: str = Query(..., min_length=1, max_length=100, description="Search text (prefixes match, accents ignored)"),
+    type: Optional[str] = Query(None, description="Types, comma-separated (e.g. attraction,show)"),
+    fields: Optional[Projection] = Depends(fields_param),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Returns POIs and shows whose name or description match the query, ranked by relevance."""
+    entries = await search_index(q, split_values(type) or None, limit)
+    
+    if entries is None:
+        raise HTTPException(status_code=503, detail="No data available")
+    
+    return json_response({
+        "count": len(entries),
+        "results": project(entries, fields)
+    })
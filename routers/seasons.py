@@ -1,21 +1,25 @@
 """Seasons Router."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
+from fastapi import APIRouter, Depends, HTTPException
+
+from routers.params import fields_param, json_response, project
+from services.projection import Projection
 from services.seasons import get_seasons
 
 router = APIRouter(prefix="/times", tags=["Times"])
 
 
 @router.get("/seasons", summary="All seasons")
-async def seasons():
+async def seasons(fields: Optional[Projection] = Depends(fields_param)):
     """Returns all Europapark seasons with dates."""
     entries = await get_seasons()
     
-    if not entries:
+    if entries is None:
         raise HTTPException(status_code=503, detail="No data available")
     
-    return {
+    return json_response({
         "count": len(entries),
-        "seasons": [e.model_dump(exclude_none=True) for e in entries]
-    }
+        "seasons": project(entries, fields)
+    })
@@ -1,32 +1,42 @@
 """Services Router."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from services.pois import get_all_services, get_service_by_id
+from fastapi import APIRouter, Depends, HTTPException
+
+from routers.params import ListParams, fields_param, json_response, multi_get_response, page_response, project, run_query
+from services.cdn import add_surrogate_keys
+from services.pois import get_service_by_id, get_services_by_ids, query_pois
+from services.projection import Projection
 
 router = APIRouter(prefix="/info", tags=["Info"])
 
 
 @router.get("/services", summary="All services")
-async def services():
-    """Returns all service facilities (restrooms, info, first aid)."""
-    entries = await get_all_services()
+async def services(params: ListParams = Depends()):
+    """Returns all service facilities (restrooms, info, first aid). Sort orders: name, -name, id, -id."""
+    if params.ids is not None:
+        found = await get_services_by_ids(params.ids)
+        return multi_get_response("services", params.ids, found, params.projection)
+    
+    page = await run_query(query_pois(
+        "service", params.area_ids, params.sort, params.cursor, params.limit,
+        projection=params.projection,
+    ))
     
-    if not entries:
+    if page is None:
         raise HTTPException(status_code=503, detail="No data available")
     
-    return {
-        "count": len(entries),
-        "services": [e.model_dump(exclude_none=True) for e in entries]
-    }
+    return page_response("services", page, params)
 
 
 @router.get("/services/{service_id}", summary="Service details")
-async def service_info(service_id: int):
+async def service_info(service_id: int, fields: Optional[Projection] = Depends(fields_param)):
     """Returns service facility details."""
     info = await get_service_by_id(service_id)
     
     if not info:
         raise HTTPException(status_code=404, detail="Service not found")
     
-    return info.model_dump(exclude_none=True)
+    add_surrogate_keys("poi", [service_id])
+    return json_response(project(info, fields))
@@ -1,32 +1,42 @@
 """Shops Router."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from services.pois import get_all_shops, get_shop_by_id
+from fastapi import APIRouter, Depends, HTTPException
+
+from routers.params import ListParams, fields_param, json_response, multi_get_response, page_response, project, run_query
+from services.cdn import add_surrogate_keys
+from services.pois import get_shop_by_id, get_shops_by_ids, query_pois
+from services.projection import Projection
 
 router = APIRouter(prefix="/info", tags=["Info"])
 
 
 @router.get("/shops", summary="All shops")
-async def shops():
-    """Returns all shops with locations."""
-    entries = await get_all_shops()
+async def shops(params: ListParams = Depends()):
+    """Returns all shops with locations. Sort orders: name, -name, id, -id."""
+    if params.ids is not None:
+        found = await get_shops_by_ids(params.ids)
+        return multi_get_response("shops", params.ids, found, params.projection)
+    
+    page = await run_query(query_pois(
+        "shopping", params.area_ids, params.sort, params.cursor, params.limit,
+        projection=params.projection,
+    ))
     
-    if not entries:
+    if page is None:
         raise HTTPException(status_code=503, detail="No data available")
     
-    return {
-        "count": len(entries),
-        "shops": [e.model_dump(exclude_none=True) for e in entries]
-    }
+    return page_response("shops", page, params)
 
 
 @router.get("/shops/{shop_id}", summary="Shop details")
-async def shop_info(shop_id: int):
+async def shop_info(shop_id: int, fields: Optional[Projection] = Depends(fields_param)):
     """Returns shop details."""
     info = await get_shop_by_id(shop_id)
     
     if not info:
         raise HTTPException(status_code=404, detail="Shop not found")
     
-    return info.model_dump(exclude_none=True)
+    add_surrogate_keys("poi", [shop_id])
+    return json_response(project(info, fields))
@@ -1,32 +1,42 @@
 """Shows Router."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from services.shows import get_show_info, get_all_shows
+from fastapi import APIRouter, Depends, HTTPException
+
+from routers.params import ListParams, fields_param, json_response, multi_get_response, page_response, project, run_query
+from services.cdn import add_surrogate_keys
+from services.projection import Projection
+from services.shows import get_show_info, get_show_infos, query_shows
 
 router = APIRouter(prefix="/info", tags=["Info"])
 
 
 @router.get("/shows", summary="All shows")
-async def shows():
-    """Returns all shows with locations and times."""
-    entries = await get_all_shows()
+async def shows(params: ListParams = Depends()):
+    """Returns all shows with locations and times. Sort orders: name, -name, id, -id."""
+    if params.ids is not None:
+        found = await get_show_infos(params.ids)
+        return multi_get_response("shows", params.ids, found, params.projection, item="show")
+    
+    page = await run_query(query_shows(
+        params.area_ids, params.sort, params.cursor, params.limit,
+        projection=params.projection,
+    ))
     
-    if not entries:
+    if page is None:
         raise HTTPException(status_code=503, detail="Cache not initialized")
     
-    return {
-        "count": len(entries),
-        "shows": [e.model_dump(exclude_none=True) for e in entries]
-    }
+    return page_response("shows", page, params)
 
 
 @router.get("/shows/{show_id}", summary="Show details")
-async def show_info(show_id: int):
+async def show_info(show_id: int, fields: Optional[Projection] = Depends(fields_param)):
     """Returns full show details including location, duration, and times."""
     info = await get_show_info(show_id)
     
     if not info:
         raise HTTPException(status_code=404, detail="Show not found")
     
-    return info.model_dump(exclude_none=True)
+    add_surrogate_keys("show", [show_id])
+    return json_response(project(info, fields))
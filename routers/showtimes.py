@@ -1,32 +1,114 @@
 """Showtimes Router."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from services.showtimes import get_processed_showtimes, get_showtime_by_id
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from routers.params import IDS_DESCRIPTION, fields_param, json_response, multi_get_response, parse_id_list, project
+from services.cdn import add_surrogate_keys
+from services.projection import Projection
+from services.response_cache import no_response_cache
+from services.showtimes import get_showtime_by_id, get_showtime_rows, get_showtimes_by_ids
+from services.upcoming import get_next_show, get_upcoming_shows
 
 router = APIRouter(prefix="/times", tags=["Times"])
 
+MAX_WITHIN_MINUTES = 48 * 60
+DURATION_UNITS = {"m": 1, "h": 60}
+
+
+def parse_within(value: str) -> int:
+    """Parses a duration like 30m, 2h or 45 (minutes) into minutes (400 if invalid)."""
+    value = value.strip().lower()
+    factor = DURATION_UNITS.get(value[-1:], None)
+    number = value[:-1] if factor else value
+    try:
+        minutes = int(number) * (factor or 1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid within: expected e.g. 30m or 2h")
+    if not 0 <= minutes <= MAX_WITHIN_MINUTES:
+        raise HTTPException(status_code=400, detail=f"within must be between 0 and {MAX_WITHIN_MINUTES} minutes")
+    return minutes
+
+
+def parse_near(value: Optional[str]) -> Optional[tuple[float, float]]:
+    """Parses "lat,lon" (400 if invalid)."""
+    if value is None:
+        return None
+    try:
+        lat, lon = (float(part) for part in value.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid near: expected lat,lon")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise HTTPException(status_code=400, detail="Invalid near: coordinates out of range")
+    return lat, lon
+
 
 @router.get("/showtimes", summary="All show times")
-async def showtimes():
+async def showtimes(
+    ids: Optional[str] = Query(None, description=IDS_DESCRIPTION),
+    fields: Optional[Projection] = Depends(fields_param),
+):
     """Returns show times for today and tomorrow."""
-    entries = await get_processed_showtimes()
+    show_ids = parse_id_list(ids)
+    if show_ids is not None:
+        found = await get_showtimes_by_ids(show_ids)
+        return multi_get_response("showtimes", show_ids, found, fields, item="show")
+    
+    entries = await get_showtime_rows()
     
-    if not entries:
+    if entries is None:
         raise HTTPException(status_code=503, detail="Cache not initialized")
     
-    return {
+    return json_response({
         "count": len(entries),
-        "showtimes": [e.model_dump(exclude_none=True) for e in entries]
-    }
+        "showtimes": project(entries, fields)
+    })
+
+
+@router.get("/showtimes/upcoming", summary="Upcoming shows", dependencies=[Depends(no_response_cache)])
+async def upcoming_showtimes(
+    within: str = Query("30m", description="Time window from now, e.g. 30m or 2h (max. 48h)"),
+    near: Optional[str] = Query(None, description="Only shows near a position: lat,lon"),
+    radius: float = Query(500, gt=0, le=5000, description="Radius in meters around near"),
+    limit: int = Query(50, ge=1, le=500),
+    fields: Optional[Projection] = Depends(fields_param),
+):
+    """Returns show starts within the time window, earliest first (starts_in in minutes)."""
+    entries = await get_upcoming_shows(parse_within(within), parse_near(near), radius, limit)
+    
+    if entries is None:
+        raise HTTPException(status_code=503, detail="Cache not initialized")
+    
+    return json_response({
+        "count": len(entries),
+        "shows": project(entries, fields)
+    })
+
+
+@router.get("/showtimes/{show_id}/next", summary="Next start of a show", dependencies=[Depends(no_response_cache)])
+async def next_showtime(
+    show_id: int,
+    count: int = Query(1, ge=1, le=20, description="Number of starts"),
+    fields: Optional[Projection] = Depends(fields_param),
+):
+    """Returns the next starts of a show today or tomorrow (starts_in in minutes)."""
+    entry = await get_next_show(show_id, count)
+    
+    if not entry:
+        raise HTTPException(status_code=404, detail="Show not found")
+    
+    add_surrogate_keys("show", [show_id])
+    return json_response(project(entry, fields))
 
 
 @router.get("/showtimes/{show_id}", summary="Show times by ID")
-async def showtime_by_id(show_id: int):
+async def showtime_by_id(show_id: int, fields: Optional[Projection] = Depends(fields_param)):
     """Returns show times for a specific show."""
     entry = await get_showtime_by_id(show_id)
     
     if not entry:
         raise HTTPException(status_code=404, detail="Show not found")
     
-    return entry.model_dump(exclude_none=True)
+    add_surrogate_keys("show", [show_id])
+    return json_response(project(entry, fields))
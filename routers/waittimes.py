@@ -1,32 +1,92 @@
 """Waittimes Router."""
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
 
-from services.waittimes import get_processed_waittimes, get_waittime_by_id
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from routers.params import (
+    ListParams,
+    fields_param,
+    json_response,
+    multi_get_response,
+    page_response,
+    project,
+    run_query,
+    split_values,
+)
+from services.cdn import add_surrogate_keys
+from services.projection import Projection
+from services.waittime_stats import DEFAULT_TOP, MAX_TOP, get_waittime_stats
+from services.waittimes import AttractionStatus, get_waittime_by_id, get_waittimes_by_ids, query_waittimes
 
 router = APIRouter(prefix="/times", tags=["Times"])
 
+STATUS_VALUES = {s.value for s in AttractionStatus}
+
 
 @router.get("/waittimes", summary="All wait times")
-async def waittimes():
-    """Returns current wait times for all attractions with status."""
-    entries = await get_processed_waittimes()
+async def waittimes(
+    status: Optional[str] = Query(None, description="Statuses, comma-separated (e.g. operational)"),
+    min_time: Optional[int] = Query(None, ge=0, description="Minimum wait time in minutes"),
+    max_time: Optional[int] = Query(None, ge=0, description="Maximum wait time in minutes"),
+    type: Optional[str] = Query(None, description="POI types, comma-separated"),
+    params: ListParams = Depends(),
+):
+    """Returns current wait times for all attractions with status. Sort orders: time, -time, name, -name."""
+    statuses = split_values(status)
+    unknown = statuses - STATUS_VALUES
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown status: {', '.join(sorted(unknown))}")
+    
+    if params.ids is not None:
+        if statuses or min_time is not None or max_time is not None or type:
+            raise HTTPException(status_code=400, detail="ids cannot be combined with filters")
+        found = await get_waittimes_by_ids(params.ids)
+        return multi_get_response("waittimes", params.ids, found, params.projection)
+    
+    page = await run_query(query_waittimes(
+        statuses=statuses or None,
+        min_time=min_time,
+        max_time=max_time,
+        area_ids=params.area_ids,
+        types=split_values(type) or None,
+        sort=params.sort,
+        cursor=params.cursor,
+        limit=params.limit,
+        projection=params.projection,
+    ))
+    
+    if page is None:
+        raise HTTPException(status_code=503, detail="Cache not initialized")
+    
+    return page_response("waittimes", page, params)
+
+
+@router.get("/waittimes/stats", summary="Wait time statistics")
+async def waittime_stats(
+    top: int = Query(DEFAULT_TOP, ge=0, le=MAX_TOP, description="Number of longest and shortest waits per summary"),
+    fields: Optional[Projection] = Depends(fields_param),
+):
+    """
+    Returns park-wide and per-area wait time statistics: mean, median and p90 wait
+    of operational attractions, counts by status, longest and shortest waits and a
+    crowd index (mean wait relative to 90 minutes, 0-100).
+    """
+    stats = await get_waittime_stats()
     
-    if not entries:
+    if stats is None:
         raise HTTPException(status_code=503, detail="Cache not initialized")
     
-    return {
-        "count": len(entries),
-        "waittimes": [e.model_dump() for e in entries]
-    }
+    return json_response(project(stats.to_dict(top), fields))
 
 
 @router.get("/waittimes/{attraction_id}", summary="Wait time by ID")
-async def waittime_by_id(attraction_id: int):
+async def waittime_by_id(attraction_id: int, fields: Optional[Projection] = Depends(fields_param)):
     """Returns wait time for a specific attraction."""
     entry = await get_waittime_by_id(attraction_id)
     
     if not entry:
         raise HTTPException(status_code=404, detail="Attraction not found")
     
-    return entry.model_dump()
+    add_surrogate_keys("poi", [attraction_id])
+    return json_response(project(entry, fields))
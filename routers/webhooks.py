@@ -0,0 +1,49 @@
+"""Webhooks Router."""
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from services.admin_auth import require_admin
+from services.webhooks import WebhookSubscriptionCreate, get_webhook_service
+
+router = APIRouter(prefix="/webhooks", tags=["Webhooks"], dependencies=[Depends(require_admin)])
+
+
+@router.get("", summary="Webhook subscriptions")
+async def webhooks():
+    """Returns all webhook subscriptions with their rules (secrets are not returned)."""
+    subscriptions = await get_webhook_service().list_subscriptions()
+    return {
+        "count": len(subscriptions),
+        "webhooks": subscriptions
+    }
+
+
+@router.post("", summary="Create webhook subscription", status_code=201)
+async def create_webhook(subscription: WebhookSubscriptionCreate):
+    """
+    Subscribes an endpoint to wait time events. Each rule names an attraction and
+    fires when its wait time drops below `below` minutes, rises to `above` minutes
+    or its status changes (optionally from `status_from` and/or to `status_to`).
+    Events of one refresh are posted to the endpoint in one batch.
+    """
+    return await get_webhook_service().create_subscription(subscription)
+
+
+@router.get("/{webhook_id}", summary="Webhook subscription")
+async def webhook(webhook_id: int):
+    """Returns a webhook subscription."""
+    subscription = await get_webhook_service().get_subscription(webhook_id)
+
+    if not subscription:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+
+    return subscription
+
+
+@router.delete("/{webhook_id}", summary="Delete webhook subscription", status_code=204)
+async def delete_webhook(webhook_id: int):
+    """Deletes a webhook subscription."""
+    if not await get_webhook_service().delete_subscription(webhook_id):
+        raise HTTPException(status_code=404, detail="Webhook not found")
+
+    return Response(status_code=204)
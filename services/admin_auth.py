@@ -0,0 +1,29 @@
+"""
+Admin Authorization.
+Checks the X-Admin-Token header against the configured admin token.
+"""
+
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from config import get_settings
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def is_valid_admin_token(token: Optional[str]) -> bool:
+    """True if admin access is configured and the token matches."""
+    expected = get_settings().admin_token
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """FastAPI dependency guarding admin endpoints."""
+    if not get_settings().admin_token:
+        raise HTTPException(status_code=404, detail="Admin endpoints disabled")
+    if not is_valid_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
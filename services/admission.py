@@ -0,0 +1,255 @@
+"""
+Admission Control Service.
+Per-client rate limiting, a concurrency cap for /raw and load shedding.
+
+Every request is assigned to a route group by its path (below an optional
+park prefix). Groups with a configured limit get an in-memory token bucket
+per client (client IP, or the first X-Forwarded-For address behind a
+trusted proxy); an empty bucket is answered with 429 and Retry-After.
+
+/raw/* requests are passed straight to the upstream API, so at most
+`raw_max_concurrency` run at a time; further ones get 503 immediately.
+
+Under overload, i.e. when the event loop lags behind by more than
+`shed_loop_lag_ms` or more than `shed_max_in_flight` requests are running,
+expensive groups (/raw, /batch) are shed with 503 and Retry-After. Routes
+served from the cache (/times, /info, /park) and system and admin routes
+keep being served.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config import get_settings
+from services.metrics import event_loop_lag_seconds, requests_rejected_total
+from services.parks import split_park_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GROUP = "default"
+
+# Path prefix (below the park prefix) -> route group; everything else is DEFAULT_GROUP
+ROUTE_GROUPS = (
+    ("/raw/", "raw"),
+    ("/batch", "batch"),
+    ("/admin/", "admin"),
+    ("/internal/", "internal"),
+)
+SYSTEM_PATHS = frozenset({"/", "/health", "/metrics", "/docs", "/openapi.json"})
+
+# Groups shed under overload
+EXPENSIVE_GROUPS = frozenset({"raw", "batch"})
+
+# Number of clients with a bucket, least recently seen evicted
+MAX_TRACKED_CLIENTS = 10000
+
+LAG_SAMPLE_INTERVAL = 0.1
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """`requests` per `seconds`, with bursts of up to `requests`."""
+    requests: int
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        return self.requests / self.seconds
+
+
+def parse_rate_limits(value: str) -> dict[str, RateLimit]:
+    """Parses "group=requests/seconds" entries, comma-separated (invalid entries are ignored)."""
+    limits = {}
+    for part in value.split(","):
+        group, _, limit = part.strip().partition("=")
+        requests, _, seconds = limit.partition("/")
+        try:
+            parsed = RateLimit(int(requests), float(seconds or 1))
+        except ValueError:
+            if part.strip():
+                logger.warning(f"Ignoring invalid rate limit: {part.strip()}")
+            continue
+        if group.strip() and parsed.requests > 0 and parsed.seconds > 0:
+            limits[group.strip().lower()] = parsed
+    return limits
+
+
+def route_group(path: str) -> str:
+    """Route group of a request path."""
+    if path in SYSTEM_PATHS:
+        return "system"
+    path = split_park_path(path)[1]
+    for prefix, group in ROUTE_GROUPS:
+        if path.startswith(prefix):
+            return group
+    return DEFAULT_GROUP
+
+
+class TokenBucket:
+    """Token bucket, refilled lazily on access."""
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+
+    def take(self, limit: RateLimit, now: float) -> float:
+        """Takes a token; returns 0 on success, otherwise the seconds until the next token."""
+        self.tokens = min(limit.requests, self.tokens + (now - self.updated) * limit.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / limit.rate
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a periodic sleep."""
+
+    def __init__(self, interval: float = LAG_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+        event_loop_lag_seconds.set_function(lambda: self.lag)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, loop.time() - expected)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.lag = 0.0
+
+
+class AdmissionController:
+    """Rate limits, /raw concurrency and overload state."""
+
+    def __init__(self):
+        settings = get_settings()
+        self.limits = parse_rate_limits(settings.rate_limits)
+        self.trust_forwarded = settings.rate_limit_trust_forwarded
+        self.raw_max_concurrency = max(1, settings.raw_max_concurrency)
+        self.shed_loop_lag = settings.shed_loop_lag_ms / 1000
+        self.shed_max_in_flight = settings.shed_max_in_flight
+        self.shed_retry_after = max(1, settings.shed_retry_after)
+        self.monitor = LoopLagMonitor()
+        self.in_flight = 0
+        self.raw_in_flight = 0
+        self._buckets: OrderedDict[tuple[str, str], TokenBucket] = OrderedDict()
+
+    def client_key(self, scope: Scope) -> str:
+        if self.trust_forwarded:
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def retry_after(self, group: str, client: str) -> float:
+        """Takes a token of the client's bucket; returns 0 if admitted, otherwise the seconds to wait."""
+        limit = self.limits.get(group)
+        if limit is None:
+            return 0.0
+        now = time.monotonic()
+        key = (group, client)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(limit.requests, now)
+            if len(self._buckets) > MAX_TRACKED_CLIENTS:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.take(limit, now)
+
+    @property
+    def overloaded(self) -> bool:
+        return self.monitor.lag > self.shed_loop_lag or self.in_flight > self.shed_max_in_flight
+
+    def get_status(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "raw_in_flight": self.raw_in_flight,
+            "loop_lag_ms": round(self.monitor.lag * 1000, 1),
+            "overloaded": self.overloaded,
+            "tracked_clients": len(self._buckets),
+            "limits": {group: f"{limit.requests}/{limit.seconds:g}s" for group, limit in self.limits.items()},
+        }
+
+
+def _rejection(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying rate limits, the /raw concurrency cap and load shedding."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        controller = get_admission_controller()
+        group = route_group(scope["path"])
+
+        rejection = None
+        if group in EXPENSIVE_GROUPS and controller.overloaded:
+            rejection = ("overload", _rejection(503, "Server overloaded", controller.shed_retry_after))
+        else:
+            wait = controller.retry_after(group, controller.client_key(scope))
+            if wait > 0:
+                rejection = ("rate_limited", _rejection(429, "Rate limit exceeded", wait))
+            elif group == "raw" and controller.raw_in_flight >= controller.raw_max_concurrency:
+                rejection = ("concurrency", _rejection(503, "Too many concurrent raw requests", 1))
+
+        if rejection is not None:
+            reason, response = rejection
+            requests_rejected_total.labels(group, reason).inc()
+            await response(scope, receive, send)
+            return
+
+        raw = group == "raw"
+        controller.in_flight += 1
+        if raw:
+            controller.raw_in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.in_flight -= 1
+            if raw:
+                controller.raw_in_flight -= 1
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Returns the singleton AdmissionController."""
+    global _controller
+    if _controller is None:
+        _controller = AdmissionController()
+    return _controller
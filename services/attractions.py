@@ -5,8 +5,12 @@ from typing import Optional
 
 from pydantic import BaseModel
 
-from services.cache import get_cache_service, CACHE_KEYS
-from services.waittimes import get_waittime_by_id, WaitTimeEntry
+from services.cache import CACHE_KEYS
+from services.derived import DerivedData, RenderedMap
+from services.listing import ColumnTable, Page, list_table
+from services.pois import build_pois_by_id, pois_by_id
+from services.projection import Projection
+from services.waittimes import waittimes_by_id, WaitTimeEntry
 
 logger = logging.getLogger(__name__)
 
@@ -74,19 +78,8 @@ class AttractionInfo(BaseModel):
 
 
 async def get_poi_by_id(attraction_id: int) -> Optional[dict]:
-    """Get raw POI data by ID (Europapark only)."""
-    cache = get_cache_service()
-    pois_data = await cache.load(CACHE_KEYS["pois"])
-    
-    if not pois_data or "data" not in pois_data:
-        return None
-    
-    for poi in pois_data["data"].get("pois", []):
-        scopes = poi.get("scopes", [])
-        if poi.get("id") == attraction_id and "europapark" in scopes:
-            return poi
-    
-    return None
+    """Get raw POI data by ID (current park)."""
+    return (await pois_by_id.get()).get(attraction_id)
 
 
 def extract_image_urls(image_data: Optional[dict]) -> Optional[ImageUrls]:
@@ -118,14 +111,8 @@ def extract_location(poi: dict) -> Optional[Location]:
     return None
 
 
-async def get_attraction_info(attraction_id: int) -> Optional[AttractionInfo]:
-    """Get full attraction details."""
-    poi = await get_poi_by_id(attraction_id)
-    if not poi:
-        return None
-    
-    wait_time = await get_waittime_by_id(attraction_id)
-    
+def build_attraction_info(poi: dict, wait_time: Optional[WaitTimeEntry]) -> AttractionInfo:
+    """Full attraction details from a raw POI and its current wait time."""
     height_req = None
     if any([poi.get("minHeight"), poi.get("minHeightAdult"), poi.get("maxHeight")]):
         height_req = HeightRequirements(
@@ -159,18 +146,60 @@ async def get_attraction_info(attraction_id: int) -> Optional[AttractionInfo]:
     )
 
 
-async def get_all_attractions() -> list[AttractionListItem]:
-    """Get all attractions (compact list)."""
-    cache = get_cache_service()
-    pois_data = await cache.load(CACHE_KEYS["pois"])
+def render_attraction_info(poi: dict) -> dict:
+    """Rendered full attraction details without wait time (joined per request)."""
+    return build_attraction_info(poi, None).model_dump(mode="json", exclude_none=True)
+
+
+def _build_attraction_details(pois_raw: Optional[dict]) -> RenderedMap:
+    return RenderedMap(build_pois_by_id(pois_raw), render_attraction_info)
+
+
+# Attraction details by ID, rendered on first access, rebuilt once per POI refresh
+attraction_details = DerivedData("attraction_details", (CACHE_KEYS["pois"],), _build_attraction_details)
+
+
+def _with_wait_time(info: dict, wait_time: Optional[dict]) -> dict:
+    if not wait_time:
+        return info
+    return {**info, "wait_time": {k: v for k, v in wait_time.items() if v is not None}}
+
+
+async def get_attraction_info(attraction_id: int) -> Optional[dict]:
+    """Get rendered full attraction details."""
+    info = (await attraction_details.get()).get(attraction_id)
+    if not info:
+        return None
+    
+    wait_time = (await waittimes_by_id.get()).get(attraction_id)
+    return _with_wait_time(info, wait_time)
+
+
+async def get_attraction_infos(attraction_ids: list[int]) -> Optional[dict[int, dict]]:
+    """
+    Get rendered full details for several attractions (unknown IDs are left out).
+    Returns None if the POIs were never loaded.
+    """
+    details = await attraction_details.get()
+    if not details and not attraction_details.loaded():
+        return None
     
-    if not pois_data or "data" not in pois_data:
+    waittimes = await waittimes_by_id.get()
+    return {
+        attraction_id: _with_wait_time(details.get(attraction_id), waittimes.get(attraction_id))
+        for attraction_id in attraction_ids
+        if attraction_id in details
+    }
+
+
+def build_attraction_list(pois_raw: Optional[dict]) -> list[AttractionListItem]:
+    """All attractions (compact list) from raw POI data."""
+    if not pois_raw:
         return []
     
     results = []
-    for poi in pois_data["data"].get("pois", []):
-        scopes = poi.get("scopes", [])
-        if poi.get("type") != "attraction" or "europapark" not in scopes:
+    for poi in pois_raw.get("pois", []):
+        if poi.get("type") != "attraction":
             continue
         
         results.append(AttractionListItem(
@@ -183,3 +212,34 @@ async def get_all_attractions() -> list[AttractionListItem]:
         ))
     
     return results
+
+
+def _build_attractions_table(pois_raw: Optional[dict]) -> ColumnTable:
+    return list_table([e.model_dump(exclude_none=True) for e in build_attraction_list(pois_raw)])
+
+
+# Attraction list table, rebuilt once per POI refresh
+attractions_table = DerivedData("attractions_table", (CACHE_KEYS["pois"],), _build_attractions_table)
+
+
+async def query_attractions(
+    area_ids: Optional[set[int]] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    projection: Optional[Projection] = None,
+) -> Optional[Page]:
+    """
+    Filtered, sorted page of attractions.
+    Returns None if the POIs were never loaded.
+    """
+    table = await attractions_table.get()
+    if not table and not attractions_table.loaded():
+        return None
+    return table.query(
+        equals={"area_id": area_ids} if area_ids else None,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+        projection=projection,
+    )
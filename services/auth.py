@@ -1,9 +1,19 @@
 """
 Authentifizierungs-Service für OAuth2 Token Management.
+
+Alle Prozesse teilen sich die Token-Zeile in der Datenbank (siehe
+token_storage). Steht eine Erneuerung an oder liefert die API 401, fordert
+nur der Prozess mit der Erneuerungs-Lease einen neuen Token an; die übrigen
+warten, bis eine höhere Version gespeichert ist, und übernehmen sie. So
+bleibt die Zahl der Token-Requests unabhängig von der Zahl der Instanzen.
 """
 
 import asyncio
 import logging
+import os
+import socket
+import time
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -11,6 +21,8 @@ import httpx
 
 from config import get_settings
 from services.firebase_config import get_firebase_config_service
+from services.metrics import token_refreshes_total
+from services.scheduler import PRIORITY_HIGH, IntervalSpec, get_scheduler
 from services.token_storage import TokenData, TokenStorage, get_token_storage
 
 logger = logging.getLogger(__name__)
@@ -20,7 +32,10 @@ class AuthService:
     """Verwaltet die OAuth2-Authentifizierung."""
     
     REFRESH_BUFFER_SECONDS = 600  # 10 Minuten vor Ablauf erneuern
-    MIN_REFRESH_INTERVAL_SECONDS = 60
+    SYNC_INTERVAL_SECONDS = 60  # Jede Minute: neuere Version übernehmen, bei Bedarf erneuern
+    RENEWAL_LEASE_SECONDS = 60  # Länger als Credentials-Abruf + Token-Request
+    RENEWAL_WAIT_SECONDS = 90  # Länger als die Lease, damit Wartende verwaiste Leases übernehmen
+    RENEWAL_POLL_SECONDS = 0.5
     
     def __init__(self):
         self.settings = get_settings()
@@ -28,7 +43,8 @@ class AuthService:
         self.firebase_config = get_firebase_config_service()
         
         self._current_token: Optional[TokenData] = None
-        self._refresh_task: Optional[asyncio.Task] = None
+        self._renew_lock = asyncio.Lock()
+        self.instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
     
     @property
     def is_authenticated(self) -> bool:
@@ -42,6 +58,10 @@ class AuthService:
             return self._current_token.access_token
         return None
     
+    @property
+    def token_version(self) -> int:
+        return self._current_token.version if self._current_token else 0
+    
     def get_auth_header(self) -> dict:
         """Gibt den jwtauthorization Header für API-Requests zurück."""
         if not self.access_token:
@@ -60,14 +80,71 @@ class AuthService:
             return True
         
         try:
-            await self._request_new_token()
+            await self.renew_token(saved_token.version if saved_token else 0)
             self._start_refresh_scheduler()
             return True
         except Exception as e:
             logger.error(f"Token-Anforderung fehlgeschlagen: {e}")
             return False
     
-    async def _request_new_token(self) -> None:
+    def _adopt(self, token: TokenData) -> None:
+        if self._current_token is not None and token.version != self._current_token.version:
+            logger.info(f"Token Version {token.version} übernommen. Gültig bis: {token.expires_at}")
+        self._current_token = token
+    
+    async def sync_token(self) -> bool:
+        """Übernimmt einen von einem anderen Prozess gespeicherten, neueren Token."""
+        stored = await self.token_storage.load()
+        if stored and stored.version > self.token_version and not stored.is_expired():
+            self._adopt(stored)
+            return True
+        return False
+    
+    async def renew_token(self, stale_version: int) -> None:
+        """
+        Sorgt für einen gültigen Token mit einer höheren Version als `stale_version`.
+        
+        Ist bereits eine neuere Version gespeichert, wird sie übernommen. Sonst
+        fordert der Prozess, der die Lease erhält, einen neuen Token an; alle
+        anderen warten auf dessen Ergebnis.
+        
+        Raises:
+            RuntimeError: Kein neuer Token innerhalb von RENEWAL_WAIT_SECONDS
+        """
+        async with self._renew_lock:
+            deadline = time.monotonic() + self.RENEWAL_WAIT_SECONDS
+            while True:
+                stored = await self.token_storage.load()
+                stored_version = stored.version if stored else 0
+                if stored and stored_version > stale_version and not stored.is_expired():
+                    self._adopt(stored)
+                    return
+                
+                if await self.token_storage.try_acquire_renewal(
+                    self.instance_id, stored_version, self.RENEWAL_LEASE_SECONDS
+                ):
+                    try:
+                        token = await self._request_new_token()
+                    except Exception:
+                        await self.token_storage.release_renewal(self.instance_id)
+                        raise
+                    if await self.token_storage.save_renewed(token, self.instance_id, stored_version):
+                        self._adopt(token)
+                        return
+                    continue
+                
+                if time.monotonic() >= deadline:
+                    raise RuntimeError("Kein erneuerter Token verfügbar (Erneuerung durch anderen Prozess ausstehend).")
+                await asyncio.sleep(self.RENEWAL_POLL_SECONDS)
+    
+    async def handle_unauthorized(self, token_version: int) -> None:
+        """
+        Reaktion auf 401 für einen Token der Version `token_version`: übernimmt einen
+        neueren Token oder erneuert koordiniert über die gemeinsame Token-Zeile.
+        """
+        await self.renew_token(token_version)
+    
+    async def _request_new_token(self) -> TokenData:
         logger.info("Fordere neuen OAuth2 Token an...")
         
         credentials = await self.firebase_config.get_decrypted_credentials()
@@ -84,67 +161,52 @@ class AuthService:
             "User-Agent": f"EuropaParkApp/{self.settings.app_version} (Android)"
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                self.settings.auth_url,
-                json=payload,
-                headers=headers
-            )
-            
-            if response.status_code != 200:
-                raise RuntimeError(f"Token Request fehlgeschlagen: {response.status_code} - {response.text}")
-            
-            data = response.json()
+        try:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                response = await client.post(
+                    self.settings.auth_url,
+                    json=payload,
+                    headers=headers
+                )
+                
+                if response.status_code != 200:
+                    raise RuntimeError(f"Token Request fehlgeschlagen: {response.status_code} - {response.text}")
+                
+                data = response.json()
+        except Exception:
+            token_refreshes_total.labels("failure").inc()
+            raise
+        
+        token_refreshes_total.labels("success").inc()
         
         expires_in = data.get("expires_in", 86400)
         expires_at = datetime.now() + timedelta(seconds=expires_in)
         
-        self._current_token = TokenData(
+        logger.info(f"Token erhalten. Gültig bis: {expires_at}")
+        return TokenData(
             access_token=data["access_token"],
             token_type=data.get("token_type", "Bearer"),
             expires_at=expires_at
         )
-        
-        await self.token_storage.save(self._current_token)
-        logger.info(f"Token erhalten. Gültig bis: {expires_at}")
+    
+    async def refresh_if_due(self) -> None:
+        """Übernimmt neuere Tokens anderer Prozesse und erneuert kurz vor Ablauf."""
+        await self.sync_token()
+        if self._current_token is None or self._current_token.is_expired(self.REFRESH_BUFFER_SECONDS):
+            await self.renew_token(self.token_version)
     
     def _start_refresh_scheduler(self) -> None:
-        if self._refresh_task and not self._refresh_task.done():
-            return
-        self._refresh_task = asyncio.create_task(self._refresh_loop())
-        logger.info("Token Refresh Scheduler gestartet.")
+        get_scheduler().add_job(
+            "token",
+            self.refresh_if_due,
+            IntervalSpec(self.SYNC_INTERVAL_SECONDS),
+            priority=PRIORITY_HIGH,
+            catch_up=True
+        )
+        logger.info("Token-Erneuerung im Scheduler registriert.")
     
     def _stop_refresh_scheduler(self) -> None:
-        if self._refresh_task:
-            self._refresh_task.cancel()
-            self._refresh_task = None
-            logger.info("Token Refresh Scheduler gestoppt.")
-    
-    async def _refresh_loop(self) -> None:
-        while True:
-            try:
-                if self._current_token is None:
-                    await asyncio.sleep(60)
-                    continue
-                
-                time_until_expiry = (
-                    self._current_token.expires_at - datetime.now()
-                ).total_seconds()
-                
-                sleep_time = max(
-                    time_until_expiry - self.REFRESH_BUFFER_SECONDS,
-                    self.MIN_REFRESH_INTERVAL_SECONDS
-                )
-                
-                await asyncio.sleep(sleep_time)
-                await self._request_new_token()
-                    
-            except asyncio.CancelledError:
-                logger.info("Token Refresh Loop beendet.")
-                break
-            except Exception as e:
-                logger.error(f"Fehler im Token Refresh: {e}")
-                await asyncio.sleep(60)
+        get_scheduler().remove_job("token")
     
     async def shutdown(self) -> None:
         self._stop_refresh_scheduler()
@@ -157,7 +219,8 @@ class AuthService:
         return {
             "authenticated": self.is_authenticated,
             "expires_at": self._current_token.expires_at.isoformat(),
-            "created_at": self._current_token.created_at.isoformat()
+            "created_at": self._current_token.created_at.isoformat(),
+            "version": self._current_token.version
         }
 
 
@@ -0,0 +1,178 @@
+"""
+Cache Bundle Service.
+Exports the cached datasets as one portable file and imports it elsewhere.
+
+A bundle holds every cache partition (dataset per park and language) of one
+generation with its update time, plus metadata, as gzip-compressed JSON.
+Derived indexes and rendered responses are not part of the file: they are
+in-memory Python objects tied to this code version, so an importing
+instance rebuilds them for every park and loaded language right after the
+import (`warm_derived_data`) and serves from them immediately.
+
+Use cases: booting a replica from a bundle (BUNDLE_PATH) while it
+authenticates against the upstream API in the background, and seeding
+test and staging environments without upstream access.
+
+CLI:
+    python -m services.bundle export bundle.json.gz
+    python -m services.bundle import bundle.json.gz
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from services.cache import CACHE_KEYS, get_cache_service, split_partition_key
+from services.derived import get_derived_registry
+from services.language import current_language
+from services.parks import PARKS, current_park
+from services.validation import DatasetValidationError, validate_dataset
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = "europapark-api-cache-bundle"
+BUNDLE_VERSION = 1
+MEDIA_TYPE = "application/gzip"
+
+
+class InvalidBundleError(ValueError):
+    """Raised for files that are not a readable cache bundle of a supported version."""
+
+
+async def export_bundle() -> dict:
+    """Bundle of all cached partitions of the current generation."""
+    cache = get_cache_service()
+    partitions = await cache.export_partitions()
+    return {
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "languages": cache.get_languages(),
+        "partitions": partitions,
+    }
+
+
+def encode_bundle(bundle: dict) -> bytes:
+    return gzip.compress(json.dumps(bundle, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_bundle(data: bytes) -> dict:
+    """
+    Parses a bundle (gzip-compressed or plain JSON). Partitions of known
+    datasets are checked with the same validators as upstream data.
+
+    Raises:
+        InvalidBundleError: Unreadable file, other format, unsupported version or invalid partition data
+    """
+    try:
+        if data[:2] == b"\x1f\x8b":
+            data = gzip.decompress(data)
+        bundle = json.loads(data)
+    except (OSError, EOFError, ValueError) as e:
+        raise InvalidBundleError(f"Unreadable bundle: {e}")
+
+    if not isinstance(bundle, dict) or bundle.get("format") != BUNDLE_FORMAT:
+        raise InvalidBundleError("Not a cache bundle")
+    if bundle.get("version") != BUNDLE_VERSION:
+        raise InvalidBundleError(f"Unsupported bundle version: {bundle.get('version')}")
+    partitions = bundle.get("partitions")
+    if not isinstance(partitions, list) or not all(
+        isinstance(p, dict) and isinstance(p.get("key"), str) and isinstance(p.get("updated_at"), str) and "data" in p
+        for p in partitions
+    ):
+        raise InvalidBundleError("Invalid partition list")
+    for partition in partitions:
+        key = split_partition_key(partition["key"])[0]
+        if key in CACHE_KEYS.values():
+            try:
+                validate_dataset(key, partition["data"])
+            except DatasetValidationError as e:
+                raise InvalidBundleError(f"Invalid partition {partition['key']}: {e}")
+    return bundle
+
+
+async def warm_derived_data() -> int:
+    """Builds all registered derived artifacts for every park and loaded language; returns the number built."""
+    cache = get_cache_service()
+    languages = cache.get_languages()
+    built = 0
+    for park in PARKS:
+        for language in languages["scheduled"] + languages["on_demand"]:
+            park_token = current_park.set(park)
+            language_token = current_language.set(language)
+            try:
+                for name, derived in get_derived_registry().items():
+                    try:
+                        await derived.get()
+                        built += 1
+                    except Exception as e:
+                        logger.warning(f"Derived data '{name}' could not be built for {park}/{language}: {e}")
+            finally:
+                current_language.reset(language_token)
+                current_park.reset(park_token)
+    return built
+
+
+async def import_bundle(bundle: dict, warm: bool = True) -> dict:
+    """Imports a decoded bundle as a new generation and optionally rebuilds the derived data."""
+    try:
+        imported = await get_cache_service().import_partitions(bundle["partitions"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise InvalidBundleError(f"Invalid partition: {e}")
+    built = await warm_derived_data() if warm and imported else 0
+    logger.info(f"Bundle from {bundle.get('created_at')} imported: {len(imported)} partitions, {built} derived artifacts built.")
+    return {
+        "created_at": bundle.get("created_at"),
+        "partitions": imported,
+        "skipped": len(bundle["partitions"]) - len(imported),
+        "derived": built,
+    }
+
+
+async def load_bundle_file(path: str) -> Optional[dict]:
+    """Imports a bundle file at boot; None if the file is missing or invalid (logged)."""
+    try:
+        bundle = decode_bundle(Path(path).read_bytes())
+        return await import_bundle(bundle)
+    except (OSError, InvalidBundleError) as e:
+        logger.error(f"Bundle {path} not imported: {e}")
+        return None
+
+
+async def _run_cli(command: str, path: Path) -> None:
+    from database import close_database, init_database
+
+    await init_database()
+    try:
+        if command == "export":
+            bundle = await export_bundle()
+            path.write_bytes(encode_bundle(bundle))
+            print(f"Exported {len(bundle['partitions'])} partitions to {path}")
+        else:
+            result = await import_bundle(decode_bundle(path.read_bytes()), warm=False)
+            print(f"Imported {len(result['partitions'])} partitions from {path} ({result['skipped']} skipped)")
+    finally:
+        await close_database()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export or import a cache bundle (uses DATABASE_URL).")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", type=Path, help="Bundle file (gzip-compressed JSON)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        asyncio.run(_run_cli(args.command, args.path))
+    except (OSError, InvalidBundleError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,20 @@ Speichert Daten in der Datenbank und aktualisiert sie periodisch.
 """
 
 import asyncio
+import itertools
 import json
 import logging
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 
+from config import get_settings
 from database import CacheModel, get_session
 from services.europapark_api import (
     get_waiting_times,
@@ -19,6 +26,16 @@ from services.europapark_api import (
     get_opening_times,
     get_show_times
 )
+from services.language import DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES, get_language
+from services.parks import DEFAULT_PARK, PARKS, get_park, partition_by_scope
+from services.scheduler import PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, IntervalSpec, get_scheduler
+from services.metrics import (
+    cache_data_age_seconds,
+    cache_loads_total,
+    cache_operation_duration_seconds,
+    cache_refresh_duration_seconds,
+    cache_refresh_total,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,39 +47,276 @@ CACHE_KEYS = {
     "openingtimes": "openingtimes"
 }
 
+# Abruf und Bezeichnung je Datensatz
+REFRESH_FETCHES = {
+    CACHE_KEYS["waittimes"]: (get_waiting_times, "Wartezeiten"),
+    CACHE_KEYS["showtimes"]: (get_show_times, "Showzeiten"),
+    CACHE_KEYS["pois"]: (get_pois, "POIs"),
+    CACHE_KEYS["seasons"]: (get_seasons, "Seasons"),
+    CACHE_KEYS["openingtimes"]: (get_opening_times, "Öffnungszeiten"),
+}
+
+# Geplante Aktualisierung je Datensatz: (Intervall in Sekunden, Priorität, Jitter in Sekunden)
+REFRESH_SCHEDULES = {
+    CACHE_KEYS["waittimes"]: (300, PRIORITY_HIGH, 5),
+    CACHE_KEYS["showtimes"]: (300, PRIORITY_NORMAL, 5),
+    CACHE_KEYS["pois"]: (86400, PRIORITY_LOW, 60),
+    CACHE_KEYS["seasons"]: (86400, PRIORITY_LOW, 60),
+    CACHE_KEYS["openingtimes"]: (86400, PRIORITY_LOW, 60),
+}
+
+# Datensätze mit sprachabhängigen Inhalten (Namen, Beschreibungen, Hinweise)
+LOCALIZED_KEYS = frozenset({CACHE_KEYS["pois"], CACHE_KEYS["seasons"], CACHE_KEYS["openingtimes"]})
+
+# Datensätze, die beim Speichern nach Park aufgeteilt werden
+SCOPED_KEYS = frozenset({CACHE_KEYS["pois"], CACHE_KEYS["seasons"], CACHE_KEYS["openingtimes"]})
+
+
+# Gesetzt innerhalb von pinned(): dort darf nichts gespeichert werden (Deadlock)
+_inside_pin: ContextVar[bool] = ContextVar("inside_pin", default=False)
+
+# Gesetzt innerhalb von track_reads(): gelesene Partitionen -> Generation
+_tracked_reads: ContextVar[Optional[dict[str, int]]] = ContextVar("tracked_reads", default=None)
+
+
+def parse_languages(value: str) -> list[str]:
+    """Kommagetrennte Sprachliste; nicht unterstützte Sprachen werden ignoriert."""
+    languages = [part.strip().lower() for part in value.split(",")]
+    return list(dict.fromkeys(l for l in languages if l in SUPPORTED_LANGUAGES))
+
+
+def split_by_park(key: str, data: Any) -> dict[str, Any]:
+    """
+    Teilt einen Datensatz in einem Durchlauf nach Park auf (über `scopes`).
+    Öffnungszeiten liefert die API nur für den Europa-Park.
+    """
+    if key == CACHE_KEYS["pois"] and isinstance(data, dict):
+        return {
+            park: {**data, "pois": pois}
+            for park, pois in partition_by_scope(data.get("pois") or []).items()
+        }
+    if key == CACHE_KEYS["seasons"] and isinstance(data, list):
+        return partition_by_scope(data)
+    return {DEFAULT_PARK: data}
+
+
+def split_partition_key(partition: str) -> tuple[str, str, str]:
+    """Datensatz, Park und Sprache eines Speicher-Schlüssels (Umkehrung von partition_key)."""
+    rest, _, language = partition.partition(":")
+    key, _, park = rest.partition("@")
+    return key, park or DEFAULT_PARK, language or DEFAULT_LANGUAGE
+
 
 class CacheService:
     """Verwaltet den Cache für API-Daten."""
     
     def __init__(self):
-        self._refresh_task_5min: Optional[asyncio.Task] = None
-        self._refresh_task_daily: Optional[asyncio.Task] = None
+        self._updated_at: dict[str, datetime] = {}
+        self._generations: dict[str, int] = {}
+        self._generation_counter = itertools.count(1)
+        # Generationen sind nur innerhalb einer Epoche (eines Prozesses) vergleichbar
+        self.epoch = uuid.uuid4().hex
+        self._publish_listeners: list[Callable[[list[str]], None]] = []
+        self._pins = 0
+        self._pending_saves = 0
+        self._pin_condition = asyncio.Condition()
+        
+        settings = get_settings()
+        self.replica = settings.is_replica
+        self.scheduled_languages = parse_languages(settings.scheduled_languages) or [DEFAULT_LANGUAGE]
+        if DEFAULT_LANGUAGE not in self.scheduled_languages:
+            self.scheduled_languages.insert(0, DEFAULT_LANGUAGE)
+        self.language_cache_size = max(0, settings.language_cache_size)
+        self._on_demand_languages: OrderedDict[str, None] = OrderedDict()
+        self._language_loads: dict[str, asyncio.Task] = {}
+        
+        for key in CACHE_KEYS.values():
+            cache_data_age_seconds.labels(key).set_function(
+                lambda key=key: self.get_data_age(key)
+            )
     
-    async def save(self, key: str, data: Any) -> None:
-        """Speichert Daten im Cache."""
-        async with get_session() as session:
+    def partition_key(self, key: str, language: Optional[str] = None, park: Optional[str] = None) -> str:
+        """
+        Speicher-Schlüssel eines Datensatzes für eine Sprache und einen Park
+        (Standard: Sprache und Park des Requests), z.B. "pois@rulantica:en".
+        Standardsprache, Standardpark und nicht aufgeteilte Datensätze behalten den Basisschlüssel.
+        """
+        language = language or get_language()
+        park = park or get_park()
+        partition = key
+        if key in SCOPED_KEYS and park != DEFAULT_PARK:
+            partition = f"{partition}@{park}"
+        if key in LOCALIZED_KEYS and language != DEFAULT_LANGUAGE:
+            partition = f"{partition}:{language}"
+        return partition
+    
+    @property
+    def language_partition_limit(self) -> int:
+        """Maximale Anzahl gleichzeitig gehaltener Sprachen."""
+        return len(self.scheduled_languages) + self.language_cache_size
+    
+    def get_generation(self, key: str, language: Optional[str] = None) -> int:
+        """
+        Generation des Datensatzes; wird bei jedem Speichern erhöht.
+        Generationen sind über alle Datensätze eindeutig, auch nach dem Verdrängen einer Sprache.
+        """
+        partition = self.partition_key(key, language)
+        generation = self._generations.get(partition, 0)
+        self._record_read(partition, generation)
+        return generation
+    
+    def is_loaded(self, key: str, language: Optional[str] = None) -> bool:
+        """
+        Ob der Datensatz schon geladen wurde (Generation > 0). Maßgeblich ist die
+        Partition des Standardparks, die bei jedem Speichern geschrieben wird; ein Park
+        ohne eigene Daten in einem geladenen Datensatz zählt daher als geladen.
+        """
+        partition = self.partition_key(key, language, DEFAULT_PARK)
+        generation = self._generations.get(partition, 0)
+        self._record_read(partition, generation)
+        return generation > 0
+    
+    def _record_read(self, partition: str, generation: int) -> None:
+        reads = _tracked_reads.get()
+        if reads is not None:
+            # Älteste gesehene Generation behalten: ein Ergebnis gilt nur, solange keine davon veraltet ist
+            reads[partition] = min(generation, reads.get(partition, generation))
+    
+    @contextmanager
+    def track_reads(self) -> Iterator[dict[str, int]]:
+        """
+        Erfasst alle Partitionen (mit Generation), die innerhalb des Blocks gelesen werden.
+        Ein daraus berechnetes Ergebnis ist aktuell, solange is_current() True liefert.
+        """
+        reads: dict[str, int] = {}
+        token = _tracked_reads.set(reads)
+        try:
+            yield reads
+        finally:
+            _tracked_reads.reset(token)
+    
+    def is_current(self, reads: dict[str, int]) -> bool:
+        """Prüft, ob alle erfassten Partitionen noch die erfasste Generation haben."""
+        generations = self._generations
+        return all(generations.get(partition, 0) == generation for partition, generation in reads.items())
+    
+    def get_generations(self) -> dict[str, int]:
+        """Generationen aller Datensätze (Sprache und Park des Requests)."""
+        return {key: self.get_generation(key) for key in CACHE_KEYS.values()}
+    
+    @asynccontextmanager
+    async def pinned(self) -> AsyncIterator[dict[str, int]]:
+        """
+        Hält die aktuelle Generation aller Datensätze fest, solange der Block läuft.
+        Speichervorgänge warten bis zum Ende; wartende Speichervorgänge haben
+        Vorrang vor neuen Pins, damit Refreshes nicht verhungern.
+        """
+        async with self._pin_condition:
+            await self._pin_condition.wait_for(lambda: self._pending_saves == 0)
+            self._pins += 1
+        token = _inside_pin.set(True)
+        try:
+            yield self.get_generations()
+        finally:
+            _inside_pin.reset(token)
+            async with self._pin_condition:
+                self._pins -= 1
+                self._pin_condition.notify_all()
+    
+    @asynccontextmanager
+    async def _publishing(self) -> AsyncIterator[None]:
+        """Exklusiver Abschnitt zum Veröffentlichen einer neuen Generation (wartet auf Pins)."""
+        async with self._pin_condition:
+            self._pending_saves += 1
+            try:
+                await self._pin_condition.wait_for(lambda: self._pins == 0)
+            except BaseException:
+                self._pending_saves -= 1
+                self._pin_condition.notify_all()
+                raise
+        try:
+            yield
+        finally:
+            async with self._pin_condition:
+                self._pending_saves -= 1
+                self._pin_condition.notify_all()
+    
+    def add_publish_listener(self, listener: Callable[[list[str]], None]) -> None:
+        """Registriert einen Callback, der nach jeder veröffentlichten Änderung die Speicher-Schlüssel erhält."""
+        self._publish_listeners.append(listener)
+    
+    def _notify_published(self, partitions: list[str]) -> None:
+        for listener in self._publish_listeners:
+            try:
+                listener(partitions)
+            except Exception as e:
+                logger.error(f"Fehler in Publish-Listener: {e}")
+    
+    def get_data_age(self, key: str, language: Optional[str] = None) -> Optional[float]:
+        """Alter der zuletzt gesehenen Daten in Sekunden (None wenn unbekannt)."""
+        updated_at = self._updated_at.get(self.partition_key(key, language))
+        if updated_at is None:
+            return None
+        return (datetime.now() - updated_at).total_seconds()
+    
+    async def save(self, key: str, data: Any, language: Optional[str] = None) -> None:
+        """
+        Speichert Daten im Cache.
+        Nach Park aufgeteilte Datensätze werden in einem Durchlauf zerlegt und
+        alle Park-Partitionen in einer Transaktion gespeichert.
+        """
+        await self.save_partitions(key, split_by_park(key, data), language)
+    
+    async def save_partitions(self, key: str, parts: dict[str, Any], language: Optional[str] = None) -> int:
+        """
+        Speichert bereits nach Park aufgeteilte Daten (Park -> Daten) als neue Generation,
+        alle Partitionen in einer Transaktion.
+        
+        Returns:
+            Größe der gespeicherten Daten in Bytes (JSON)
+        """
+        start = time.perf_counter()
+        rows = {
+            self.partition_key(key, language, park): json.dumps(part, ensure_ascii=False)
+            for park, part in parts.items()
+        }
+        
+        async with self._publishing(), get_session() as session:
             result = await session.execute(
-                select(CacheModel).where(CacheModel.key == key)
+                select(CacheModel).where(CacheModel.key.in_(rows))
             )
-            existing = result.scalar_one_or_none()
+            existing = {row.key: row for row in result.scalars()}
             
-            json_data = json.dumps(data, ensure_ascii=False)
-            
-            if existing:
-                existing.data = json_data
-                existing.updated_at = datetime.now()
-            else:
-                session.add(CacheModel(
-                    key=key,
-                    data=json_data,
-                    updated_at=datetime.now()
-                ))
+            now = datetime.now()
+            for partition, json_data in rows.items():
+                if partition in existing:
+                    existing[partition].data = json_data
+                    existing[partition].updated_at = now
+                else:
+                    session.add(CacheModel(
+                        key=partition,
+                        data=json_data,
+                        updated_at=now
+                    ))
             
             await session.commit()
-            logger.debug(f"Cache gespeichert: {key}")
+            for partition in rows:
+                self._updated_at[partition] = now
+                self._generations[partition] = next(self._generation_counter)
+                logger.debug(f"Cache gespeichert: {partition}")
+        self._notify_published(list(rows))
+        
+        cache_operation_duration_seconds.labels("save", self.partition_key(key, language, DEFAULT_PARK)).observe(
+            time.perf_counter() - start
+        )
+        return sum(len(json_data.encode("utf-8")) for json_data in rows.values())
     
-    async def load(self, key: str) -> Optional[dict]:
+    async def load(self, key: str, language: Optional[str] = None) -> Optional[dict]:
         """Lädt Daten aus dem Cache."""
+        start = time.perf_counter()
+        key = self.partition_key(key, language)
+        # Vor dem Lesen erfassen: neuere Daten mit älterer Generation machen das Ergebnis nur früher ungültig
+        self._record_read(key, self._generations.get(key, 0))
         async with get_session() as session:
             result = await session.execute(
                 select(CacheModel).where(CacheModel.key == key)
@@ -70,119 +324,299 @@ class CacheService:
             cached = result.scalar_one_or_none()
             
             if cached:
-                return {
+                self._updated_at[key] = cached.updated_at
+                data = {
                     "data": json.loads(cached.data),
                     "updated_at": cached.updated_at.isoformat()
                 }
-            return None
+            else:
+                data = None
+        
+        cache_operation_duration_seconds.labels("load", key).observe(
+            time.perf_counter() - start
+        )
+        cache_loads_total.labels(key, "hit" if data else "miss").inc()
+        return data
     
-    async def refresh_waittimes(self) -> None:
-        """Aktualisiert Wartezeiten."""
+    @staticmethod
+    async def _read_partitions(session, keys: Optional[list[str]] = None) -> list[dict]:
+        query = select(CacheModel).order_by(CacheModel.key)
+        if keys is not None:
+            query = query.where(CacheModel.key.in_(keys))
+        result = await session.execute(query)
+        return [
+            {"key": row.key, "updated_at": row.updated_at.isoformat(), "data": json.loads(row.data)}
+            for row in result.scalars()
+        ]
+    
+    async def export_partitions(self) -> list[dict]:
+        """
+        Alle gespeicherten Partitionen einer Generation (Refreshes warten bis zum Ende).
+        
+        Returns:
+            Liste von {"key", "updated_at", "data"}
+        """
+        async with self.pinned(), get_session() as session:
+            return await self._read_partitions(session)
+    
+    async def export_changes(self, since: int = 0, epoch: Optional[str] = None) -> dict:
+        """
+        Inkrementeller Export: Partitionen mit einer Generation größer als `since`.
+        Stammt `since` aus einer anderen Epoche (z.B. vor einem Neustart), wird alles exportiert.
+        
+        Returns:
+            {"epoch", "since", "generation", "keys" (alle vorhandenen Schlüssel), "partitions"}
+        """
+        if epoch != self.epoch:
+            since = 0
+        async with self.pinned(), get_session() as session:
+            generation = max(self._generations.values(), default=0)
+            result = await session.execute(select(CacheModel.key).order_by(CacheModel.key))
+            keys = list(result.scalars())
+            changed = None if since == 0 else [key for key in keys if self._generations.get(key, 0) > since]
+            partitions = await self._read_partitions(session, changed) if changed != [] else []
+        return {
+            "epoch": self.epoch,
+            "since": since,
+            "generation": generation,
+            "keys": keys,
+            "partitions": partitions,
+        }
+    
+    async def apply_changes(self, partitions: list[dict], keys: list[str]) -> list[str]:
+        """
+        Übernimmt einen inkrementellen Export (Replika-Modus): speichert die geänderten
+        Partitionen und entfernt lokale Partitionen, die es auf der Quelle nicht mehr gibt.
+        
+        Returns:
+            Die entfernten Speicher-Schlüssel
+        """
+        if partitions:
+            await self.import_partitions(partitions)
+        
+        async with get_session() as session:
+            result = await session.execute(select(CacheModel.key))
+            current = set(keys)
+            stale = [key for key in result.scalars() if key not in current]
+        if stale:
+            async with self._publishing(), get_session() as session:
+                await session.execute(delete(CacheModel).where(CacheModel.key.in_(stale)))
+                await session.commit()
+                for key in stale:
+                    self._generations.pop(key, None)
+                    self._updated_at.pop(key, None)
+            remaining = {split_partition_key(key)[2] for key in keys}
+            for language in [l for l in self._on_demand_languages if l not in remaining]:
+                del self._on_demand_languages[language]
+            self._notify_published(stale)
+        return stale
+    
+    async def import_partitions(self, partitions: list[dict]) -> list[str]:
+        """
+        Speichert exportierte Partitionen in einer Transaktion und veröffentlicht sie als neue Generation.
+        Unbekannte Datensätze werden übersprungen, ebenso Sprachen, die weder geplant
+        sind noch in den LRU seltener Sprachen passen.
+        
+        Returns:
+            Die importierten Speicher-Schlüssel
+        """
+        rows: dict[str, tuple[str, datetime]] = {}
+        languages: list[str] = []
+        for partition in partitions:
+            key, park, language = split_partition_key(partition["key"])
+            if key not in CACHE_KEYS.values() or park not in PARKS or language not in SUPPORTED_LANGUAGES:
+                continue
+            if language not in self.scheduled_languages and language not in languages:
+                if len(languages) >= self.language_cache_size:
+                    continue
+                languages.append(language)
+            rows[partition["key"]] = (
+                json.dumps(partition["data"], ensure_ascii=False),
+                datetime.fromisoformat(partition["updated_at"]),
+            )
+        
+        async with self._publishing(), get_session() as session:
+            result = await session.execute(select(CacheModel).where(CacheModel.key.in_(rows)))
+            existing = {row.key: row for row in result.scalars()}
+            for partition, (json_data, updated_at) in rows.items():
+                if partition in existing:
+                    existing[partition].data = json_data
+                    existing[partition].updated_at = updated_at
+                else:
+                    session.add(CacheModel(key=partition, data=json_data, updated_at=updated_at))
+            await session.commit()
+            
+            for partition, (_, updated_at) in rows.items():
+                self._updated_at[partition] = updated_at
+                self._generations[partition] = next(self._generation_counter)
+        self._notify_published(list(rows))
+        
+        for language in languages:
+            self._on_demand_languages[language] = None
+            self._on_demand_languages.move_to_end(language)
+        while len(self._on_demand_languages) > self.language_cache_size:
+            evicted, _ = self._on_demand_languages.popitem(last=False)
+            await self._evict_language(evicted)
+        
+        logger.info(f"{len(rows)} Cache-Partitionen importiert.")
+        return list(rows)
+    
+    async def _refresh(self, key: str, language: Optional[str] = None, raise_errors: bool = False) -> bool:
+        """
+        Aktualisiert einen Datensatz über die Ingest-Pipeline (Abruf bis abgeleitete Daten)
+        und erfasst Metriken. Bei sprachabhängigen Datensätzen wird `language` an den Abruf übergeben.
+        
+        Returns:
+            True bei Erfolg (Fehler werden mit `raise_errors` weitergereicht)
+        """
+        # Die Pipeline baut abgeleitete Daten, die ihrerseits den Cache importieren
+        from services.ingest import get_ingest_pipeline
+        
+        _, label = REFRESH_FETCHES[key]
+        start = time.perf_counter()
+        suffix = f" ({language})" if language and language != DEFAULT_LANGUAGE else ""
         try:
-            data = await get_waiting_times()
-            await self.save(CACHE_KEYS["waittimes"], data)
-            logger.info("Wartezeiten aktualisiert.")
+            await get_ingest_pipeline().run(CACHE_KEYS[key], language)
+            cache_refresh_total.labels(key, "success").inc()
+            logger.info(f"{label}{suffix} aktualisiert.")
+            return True
         except Exception as e:
-            logger.error(f"Fehler beim Aktualisieren der Wartezeiten: {e}")
+            cache_refresh_total.labels(key, "failure").inc()
+            logger.error(f"Fehler beim Aktualisieren der {label}{suffix}: {e}")
+            if raise_errors:
+                raise
+            return False
+        finally:
+            cache_refresh_duration_seconds.labels(key).observe(time.perf_counter() - start)
     
-    async def refresh_showtimes(self) -> None:
+    async def refresh_waittimes(self) -> bool:
+        """Aktualisiert Wartezeiten."""
+        return await self._refresh("waittimes")
+    
+    async def refresh_showtimes(self) -> bool:
         """Aktualisiert Showzeiten."""
-        try:
-            data = await get_show_times()
-            await self.save(CACHE_KEYS["showtimes"], data)
-            logger.info("Showzeiten aktualisiert.")
-        except Exception as e:
-            logger.error(f"Fehler beim Aktualisieren der Showzeiten: {e}")
+        return await self._refresh("showtimes")
     
-    async def refresh_pois(self) -> None:
+    async def refresh_pois(self, language: str = DEFAULT_LANGUAGE) -> bool:
         """Aktualisiert POIs."""
-        try:
-            data = await get_pois()
-            await self.save(CACHE_KEYS["pois"], data)
-            logger.info("POIs aktualisiert.")
-        except Exception as e:
-            logger.error(f"Fehler beim Aktualisieren der POIs: {e}")
+        return await self._refresh("pois", language)
     
-    async def refresh_seasons(self) -> None:
+    async def refresh_seasons(self, language: str = DEFAULT_LANGUAGE) -> bool:
         """Aktualisiert Seasons."""
-        try:
-            data = await get_seasons()
-            await self.save(CACHE_KEYS["seasons"], data)
-            logger.info("Seasons aktualisiert.")
-        except Exception as e:
-            logger.error(f"Fehler beim Aktualisieren der Seasons: {e}")
+        return await self._refresh("seasons", language)
     
-    async def refresh_openingtimes(self) -> None:
+    async def refresh_openingtimes(self, language: str = DEFAULT_LANGUAGE) -> bool:
         """Aktualisiert Öffnungszeiten."""
-        try:
-            data = await get_opening_times()
-            await self.save(CACHE_KEYS["openingtimes"], data)
-            logger.info("Öffnungszeiten aktualisiert.")
-        except Exception as e:
-            logger.error(f"Fehler beim Aktualisieren der Öffnungszeiten: {e}")
+        return await self._refresh("openingtimes", language)
     
-    async def refresh_all_5min(self) -> None:
-        """Aktualisiert alle 5-Minuten-Daten (parallel)."""
-        await asyncio.gather(
-            self.refresh_waittimes(),
-            self.refresh_showtimes()
+    async def refresh_language(self, language: str) -> bool:
+        """Aktualisiert alle sprachabhängigen Datensätze einer Sprache (parallel)."""
+        results = await asyncio.gather(
+            self.refresh_pois(language),
+            self.refresh_seasons(language),
+            self.refresh_openingtimes(language)
         )
+        return all(results)
     
-    async def refresh_all_daily(self) -> None:
-        """Aktualisiert alle täglichen Daten (parallel)."""
-        await asyncio.gather(
-            self.refresh_pois(),
-            self.refresh_seasons(),
-            self.refresh_openingtimes()
-        )
+    def get_languages(self) -> dict[str, list[str]]:
+        """Geplante und bei Bedarf geladene Sprachen (LRU, älteste zuerst)."""
+        return {
+            "scheduled": list(self.scheduled_languages),
+            "on_demand": list(self._on_demand_languages),
+        }
     
-    async def _loop_5min(self) -> None:
-        """5-Minuten-Refresh-Loop."""
-        while True:
-            try:
-                await self.refresh_all_5min()
-                await asyncio.sleep(300)  # 5 Minuten
-            except asyncio.CancelledError:
-                logger.info("5-Minuten Cache Loop beendet.")
-                break
-            except Exception as e:
-                logger.error(f"Fehler im 5-Minuten Cache Loop: {e}")
-                await asyncio.sleep(60)
+    async def ensure_language(self, language: str) -> bool:
+        """
+        Stellt sicher, dass die Cache-Partition einer Sprache geladen ist.
+        Geplante Sprachen werden periodisch aktualisiert; seltene Sprachen werden
+        beim ersten Zugriff abgerufen und in einem begrenzten LRU gehalten.
+        Gleichzeitige Anfragen für dieselbe Sprache teilen sich einen Abruf.
+        
+        Returns:
+            False, wenn die Sprache nicht geladen werden konnte
+        """
+        if language in self.scheduled_languages:
+            return True
+        if language in self._on_demand_languages:
+            self._on_demand_languages.move_to_end(language)
+            return True
+        # Replikas laden keine Sprachen nach, sie übernehmen die der Primärinstanz
+        if self.replica or self.language_cache_size == 0 or _inside_pin.get():
+            return False
+        
+        task = self._language_loads.get(language)
+        if task is None:
+            task = asyncio.create_task(self._load_language(language))
+            self._language_loads[language] = task
+            task.add_done_callback(lambda _: self._language_loads.pop(language, None))
+        return await asyncio.shield(task)
     
-    async def _loop_daily(self) -> None:
-        """Täglicher Refresh-Loop."""
-        while True:
-            try:
-                await self.refresh_all_daily()
-                await asyncio.sleep(86400)  # 24 Stunden
-            except asyncio.CancelledError:
-                logger.info("Täglicher Cache Loop beendet.")
-                break
-            except Exception as e:
-                logger.error(f"Fehler im täglichen Cache Loop: {e}")
-                await asyncio.sleep(3600)
+    async def _load_language(self, language: str) -> bool:
+        logger.info(f"Lade Sprache bei Bedarf: {language}")
+        if not await self.refresh_language(language):
+            await self._evict_language(language)
+            return False
+        
+        self._on_demand_languages[language] = None
+        while len(self._on_demand_languages) > self.language_cache_size:
+            evicted, _ = self._on_demand_languages.popitem(last=False)
+            await self._evict_language(evicted)
+        return True
     
-    def start(self) -> None:
-        """Startet die Cache-Scheduler."""
-        if self._refresh_task_5min is None or self._refresh_task_5min.done():
-            self._refresh_task_5min = asyncio.create_task(self._loop_5min())
-            logger.info("5-Minuten Cache Scheduler gestartet.")
+    async def _evict_language(self, language: str) -> None:
+        """Entfernt die Cache-Partition einer Sprache aus Datenbank und Speicher."""
+        keys = list({
+            self.partition_key(key, language, park)
+            for key in LOCALIZED_KEYS for park in PARKS
+        })
+        async with self._publishing(), get_session() as session:
+            await session.execute(delete(CacheModel).where(CacheModel.key.in_(keys)))
+            await session.commit()
+            for key in keys:
+                self._generations.pop(key, None)
+                self._updated_at.pop(key, None)
+        self._notify_published(keys)
+        logger.info(f"Sprache aus dem Cache verdrängt: {language}")
+    
+    async def refresh_dataset(self, key: str) -> None:
+        """
+        Aktualisiert einen Datensatz, sprachabhängige für alle geplanten und geladenen Sprachen (parallel).
         
-        if self._refresh_task_daily is None or self._refresh_task_daily.done():
-            self._refresh_task_daily = asyncio.create_task(self._loop_daily())
-            logger.info("Täglicher Cache Scheduler gestartet.")
+        Raises:
+            Exception: Der erste Fehler, nachdem alle Abrufe beendet sind
+        """
+        if key not in LOCALIZED_KEYS:
+            await self._refresh(key, raise_errors=True)
+            return
+        languages = self.scheduled_languages + list(self._on_demand_languages)
+        results = await asyncio.gather(
+            *(self._refresh(key, language, raise_errors=True) for language in languages),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+    
+    def start(self) -> None:
+        """Registriert die Aktualisierung aller Datensätze im Scheduler (erste Ausführung sofort)."""
+        scheduler = get_scheduler()
+        for key, (interval, priority, jitter) in REFRESH_SCHEDULES.items():
+            scheduler.add_job(
+                key,
+                lambda key=key: self.refresh_dataset(key),
+                IntervalSpec(interval),
+                run_at_start=True,
+                priority=priority,
+                jitter=jitter
+            )
+        logger.info("Cache-Aktualisierung im Scheduler registriert.")
     
     def stop(self) -> None:
-        """Stoppt die Cache-Scheduler."""
-        if self._refresh_task_5min:
-            self._refresh_task_5min.cancel()
-            self._refresh_task_5min = None
-        
-        if self._refresh_task_daily:
-            self._refresh_task_daily.cancel()
-            self._refresh_task_daily = None
-        
-        logger.info("Cache Scheduler gestoppt.")
+        """Entfernt die Cache-Aktualisierung aus dem Scheduler."""
+        scheduler = get_scheduler()
+        for key in REFRESH_SCHEDULES:
+            scheduler.remove_job(key)
+        logger.info("Cache-Aktualisierung gestoppt.")
 
 
 _cache_service: Optional[CacheService] = None
@@ -0,0 +1,147 @@
+"""
+CDN Service.
+Caching headers for a CDN or reverse proxy in front of the API, and purges.
+
+Responses built from cached datasets get `Cache-Control: public, max-age=N`
+and `Expires`, where N is the time until the next planned refresh of the
+datasets they were built from (the scheduler's next run of the dataset's
+job; on replicas estimated from the data age and the refresh interval),
+capped at CDN_MAX_AGE. Responses that also depend on the current time get
+`no-cache`, so the CDN revalidates them. Responses that read no cached
+data (raw upstream proxies, admin, health) get no caching headers.
+
+Every response built from cached data carries a `Surrogate-Key` header
+with the dataset keys it read (e.g. `waittimes pois`) plus item keys added
+by the route (`poi-123`, `show-45`). When a new generation of a dataset is
+published, the optional purge hook (CDN_PURGE_URL) receives the changed
+dataset keys, so the CDN drops the affected responses right away instead
+of at the end of their max-age. Purges are coalesced, one request in flight.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from email.utils import formatdate
+from typing import Iterable, Iterator, Optional
+
+import httpx
+
+from config import get_settings
+from services.cache import REFRESH_SCHEDULES, get_cache_service, split_partition_key
+from services.metrics import cdn_purges_total
+from services.scheduler import get_scheduler
+
+logger = logging.getLogger(__name__)
+
+SURROGATE_KEY_HEADER = b"surrogate-key"
+
+# Item keys added by the route handling the current request
+_item_keys: ContextVar[Optional[set[str]]] = ContextVar("cdn_item_keys", default=None)
+
+
+@contextmanager
+def collect_surrogate_keys() -> Iterator[set[str]]:
+    """Collects the item keys added with add_surrogate_keys() within the block."""
+    keys: set[str] = set()
+    token = _item_keys.set(keys)
+    try:
+        yield keys
+    finally:
+        _item_keys.reset(token)
+
+
+def add_surrogate_keys(kind: str, ids: Iterable[int]) -> None:
+    """Tags the current response with item keys, e.g. `poi-123`."""
+    keys = _item_keys.get()
+    if keys is not None:
+        keys.update(f"{kind}-{item_id}" for item_id in ids)
+
+
+def seconds_until_refresh(key: str) -> int:
+    """Seconds until the next planned refresh of a dataset, capped at CDN_MAX_AGE."""
+    next_run = get_scheduler().next_run(key)
+    if next_run is not None:
+        remaining = (next_run - datetime.now()).total_seconds()
+    else:
+        # Replicas run no refresh jobs: the primary refreshes once per interval
+        interval = REFRESH_SCHEDULES[key][0] if key in REFRESH_SCHEDULES else 0
+        age = get_cache_service().get_data_age(key)
+        remaining = interval - age if age is not None else 0
+    return int(max(0, min(get_settings().cdn_max_age, remaining)))
+
+
+def cdn_headers(
+    status: int,
+    headers: list[tuple[bytes, bytes]],
+    reads: dict[str, int],
+    cacheable: bool,
+    item_keys: Iterable[str],
+) -> list[tuple[bytes, bytes]]:
+    """
+    Caching headers for a response built from the cache partitions in `reads`.
+    `cacheable` is False for responses that also depend on the current time.
+    """
+    if status not in (200, 304) or not reads:
+        return []
+
+    datasets = sorted({split_partition_key(partition)[0] for partition in reads})
+    extra = [(SURROGATE_KEY_HEADER, " ".join(datasets + sorted(item_keys)).encode("latin-1"))]
+    if get_settings().cdn_max_age <= 0 or any(name == b"cache-control" for name, _ in headers):
+        return extra
+    if not cacheable:
+        return extra + [(b"cache-control", b"no-cache")]
+
+    max_age = min(seconds_until_refresh(key) for key in datasets)
+    return extra + [
+        (b"cache-control", f"public, max-age={max_age}".encode("latin-1")),
+        (b"expires", formatdate(time.time() + max_age, usegmt=True).encode("latin-1")),
+    ]
+
+
+class CdnPurger:
+    """Sends the dataset keys of newly published generations to the purge hook."""
+
+    def __init__(self, url: str, token: Optional[str], timeout: float = 10.0):
+        self.url = url
+        self.token = token
+        self.timeout = timeout
+        self._pending: set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self, partitions: list[str]) -> None:
+        """Publish listener: schedules a purge of the changed datasets."""
+        self._pending.update(split_partition_key(partition)[0] for partition in partitions)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            # Keys published while a purge is in flight are sent in the next request
+            while self._pending:
+                keys = sorted(self._pending)
+                self._pending.clear()
+                try:
+                    response = await client.post(self.url, json={"surrogate_keys": keys}, headers=headers)
+                    response.raise_for_status()
+                    cdn_purges_total.labels("success").inc()
+                    logger.info(f"CDN purge sent: {' '.join(keys)}")
+                except Exception as e:
+                    cdn_purges_total.labels("failure").inc()
+                    logger.warning(f"CDN purge of {' '.join(keys)} failed: {str(e) or type(e).__name__}")
+
+
+_purger: Optional[CdnPurger] = None
+
+
+def start_cdn_purge() -> None:
+    """Registers the purge hook as publish listener if CDN_PURGE_URL is set."""
+    global _purger
+    settings = get_settings()
+    if settings.cdn_purge_url and _purger is None:
+        _purger = CdnPurger(settings.cdn_purge_url, settings.cdn_purge_token)
+        get_cache_service().add_publish_listener(_purger.notify)
+        logger.info(f"CDN purges are sent to {settings.cdn_purge_url}.")
@@ -0,0 +1,176 @@
+"""
+Derived Data.
+Artifacts (indexes, lookup tables) computed from cached datasets.
+
+A derived artifact is built from the current content of one or more cache
+keys and kept in memory until the generation of one of those keys changes,
+i.e. it is rebuilt at most once per refresh instead of on every request.
+
+Artifacts over localized keys are kept per content language (the language of
+the current request), artifacts over park-scoped keys per park. The number of
+kept partitions is bounded by the cache's language partition limit times the
+number of parks, least recently used first out.
+
+Response objects are validated and rendered at build time (pydantic models
+dumped to JSON-native dicts), so request handlers only look up and join
+plain data. Per-ID details that are rarely all requested are rendered on
+first access instead (RenderedMap) and kept for the generation.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from services.cache import LOCALIZED_KEYS, SCOPED_KEYS, get_cache_service
+from services.language import DEFAULT_LANGUAGE, current_language, get_language
+from services.metrics import derived_build_duration_seconds
+from services.parks import DEFAULT_PARK, PARKS, current_park, get_park
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_registry: dict[str, "DerivedData"] = {}
+
+
+class RenderedMap:
+    """
+    Raw items by ID, rendered to response dicts on first access.
+    Lives inside a derived artifact, so renderings are kept for one generation.
+
+    Args:
+        raw: Raw items by ID
+        render: Builds the response dict of a raw item (validation happens here)
+    """
+
+    def __init__(self, raw: dict[int, Any], render: Callable[[Any], dict]):
+        self.raw = raw
+        self._render = render
+        self._rendered: dict[int, dict] = {}
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self.raw
+
+    def get(self, item_id: int) -> Optional[dict]:
+        """Rendered item (None if unknown). Treat as read-only: it is shared between requests."""
+        rendered = self._rendered.get(item_id)
+        if rendered is None:
+            raw = self.raw.get(item_id)
+            if raw is None:
+                return None
+            rendered = self._rendered[item_id] = self._render(raw)
+        return rendered
+
+
+class DerivedData(Generic[T]):
+    """
+    Lazily built artifact, memoized per generation of its source datasets.
+
+    Args:
+        name: Unique name (used in logs)
+        keys: Cache keys the artifact depends on
+        build: Synchronous builder receiving the raw data of each key
+            (None if the key is not cached yet), in the order of `keys`
+    """
+
+    def __init__(self, name: str, keys: tuple[str, ...], build: Callable[..., T]):
+        if name in _registry:
+            raise ValueError(f"Derived data already registered: {name}")
+        self.name = name
+        self.keys = keys
+        self.build = build
+        self.localized = any(key in LOCALIZED_KEYS for key in keys)
+        self.scoped = any(key in SCOPED_KEYS for key in keys)
+        # Partition ("park/language", parts left empty if not scoped/localized) -> (generations, artifact)
+        self._entries: OrderedDict[str, tuple[tuple[int, ...], T]] = OrderedDict()
+        self._lock = asyncio.Lock()
+        _registry[name] = self
+
+    def _current_generations(self) -> tuple[int, ...]:
+        cache = get_cache_service()
+        return tuple(cache.get_generation(key) for key in self.keys)
+
+    def loaded(self) -> bool:
+        """Whether all source datasets were loaded; an empty artifact then means no data for the park."""
+        cache = get_cache_service()
+        return all(cache.is_loaded(key) for key in self.keys)
+
+    def _partition(self) -> str:
+        park = get_park() if self.scoped else ""
+        language = get_language() if self.localized else ""
+        return f"{park}/{language}" if park or language else ""
+
+    def _lookup(self, partition: str, generations: tuple[int, ...]) -> tuple[bool, Optional[T]]:
+        entry = self._entries.get(partition)
+        if entry is None or entry[0] != generations:
+            return False, None
+        self._entries.move_to_end(partition)
+        return True, entry[1]
+
+    async def get(self) -> T:
+        """Returns the artifact for the current generation, park and language, rebuilding it if needed."""
+        partition = self._partition()
+        hit, value = self._lookup(partition, self._current_generations())
+        if hit:
+            return value
+
+        async with self._lock:
+            generations = self._current_generations()
+            hit, value = self._lookup(partition, generations)
+            if hit:
+                return value
+
+            cache = get_cache_service()
+            sources: list[Any] = []
+            for key in self.keys:
+                cached = await cache.load(key)
+                sources.append(cached["data"] if cached and "data" in cached else None)
+
+            start = time.perf_counter()
+            value = self.build(*sources)
+            duration = time.perf_counter() - start
+            derived_build_duration_seconds.labels(self.name).observe(duration)
+            logger.debug(
+                f"Derived data '{self.name}' rebuilt for generations {generations} "
+                f"({partition or 'all parks and languages'}) in {duration * 1000:.1f}ms"
+            )
+            self._entries[partition] = (generations, value)
+            self._entries.move_to_end(partition)
+            while len(self._entries) > max(1, cache.language_partition_limit * len(PARKS)):
+                self._entries.popitem(last=False)
+            return value
+
+    async def rebuild_held(self, language: Optional[str] = None) -> int:
+        """
+        Brings every partition currently held up to the current generation
+        (only those of `language` if given and the artifact is localized).
+        Used after a refresh, so requests find the artifact already built.
+
+        Returns:
+            Number of partitions built
+        """
+        built = 0
+        for partition in list(self._entries):
+            park, _, partition_language = partition.partition("/")
+            if language and self.localized and partition_language != language:
+                continue
+            park_token = current_park.set(park or DEFAULT_PARK)
+            language_token = current_language.set(partition_language or DEFAULT_LANGUAGE)
+            try:
+                if not self._lookup(partition, self._current_generations())[0]:
+                    await self.get()
+                    built += 1
+            finally:
+                current_language.reset(language_token)
+                current_park.reset(park_token)
+        return built
+
+
+def get_derived_registry() -> dict[str, DerivedData]:
+    """Returns all registered derived artifacts by name."""
+    return _registry
@@ -4,12 +4,16 @@ Universelle Funktion für API-Requests zur Europapark API.
 """
 
 import logging
+import time
 from typing import Any, Optional
 
 import httpx
 
 from config import get_settings
 from services.auth import get_auth_service
+from services.language import DEFAULT_LANGUAGE
+from services.metrics import upstream_request_duration_seconds, upstream_requests_total
+from services.scheduler import upstream_slot
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +24,8 @@ async def europapark_request(
     endpoint: str,
     method: str = "GET",
     params: Optional[dict] = None,
-    json_data: Optional[dict] = None
+    json_data: Optional[dict] = None,
+    language: str = DEFAULT_LANGUAGE
 ) -> Any:
     """
     Führt einen Request zur Europapark API durch.
@@ -30,6 +35,7 @@ async def europapark_request(
         method: HTTP-Methode
         params: Query-Parameter
         json_data: JSON-Body für POST-Requests
+        language: Sprache der Inhalte (Accept-Language)
     
     Returns:
         JSON-Response der API
@@ -44,44 +50,55 @@ async def europapark_request(
         raise RuntimeError("Nicht authentifiziert")
     
     url = f"{settings.api_base}{endpoint}"
+    token_version = auth_service.token_version
     
     headers = {
         **auth_service.get_auth_header(),
         "Accept": "application/json",
-        "Accept-Language": "de",
+        "Accept-Language": language,
         "User-Agent": f"EuropaParkApp/{settings.app_version} (Android)"
     }
     
     logger.info(f"API Request: {method} {endpoint}")
     
+    async def send(client: httpx.AsyncClient, headers: dict) -> httpx.Response:
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = await client.request(
+                method=method,
+                url=url,
+                params=params,
+                json=json_data,
+                headers=headers
+            )
+            status = response.status_code
+            return response
+        finally:
+            upstream_request_duration_seconds.labels(endpoint, method).observe(
+                time.perf_counter() - start
+            )
+            upstream_requests_total.labels(endpoint, method, status).inc()
+    
     async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.request(
-            method=method,
-            url=url,
-            params=params,
-            json=json_data,
-            headers=headers
-        )
+        async with upstream_slot():
+            response = await send(client, headers)
         
         if response.status_code == 401:
-            logger.warning("Token ungültig (401). Fordere neuen Token an...")
-            await auth_service._request_new_token()
+            # Ohne Upstream-Platz warten: die Erneuerung kann dauern, andere Requests laufen weiter
+            logger.warning("Token ungültig (401). Erneuere Token...")
+            await auth_service.handle_unauthorized(token_version)
             
             # Retry mit neuem Token
             headers = {
                 **auth_service.get_auth_header(),
                 "Accept": "application/json",
-                "Accept-Language": "de",
+                "Accept-Language": language,
                 "User-Agent": f"EuropaParkApp/{settings.app_version} (Android)"
             }
             
-            response = await client.request(
-                method=method,
-                url=url,
-                params=params,
-                json=json_data,
-                headers=headers
-            )
+            async with upstream_slot():
+                response = await send(client, headers)
         
         if response.status_code != 200:
             logger.error(f"API Error: {response.status_code} - {response.text}")
@@ -95,19 +112,19 @@ async def get_waiting_times() -> dict:
     return await europapark_request("/api/v2/waiting-times")
 
 
-async def get_pois() -> dict:
+async def get_pois(language: str = DEFAULT_LANGUAGE) -> dict:
     """Ruft alle POIs (Attraktionen) ab."""
-    return await europapark_request("/api/v2/poi-group", params={"status": "live"})
+    return await europapark_request("/api/v2/poi-group", params={"status": "live"}, language=language)
 
 
-async def get_seasons() -> dict:
+async def get_seasons(language: str = DEFAULT_LANGUAGE) -> dict:
     """Ruft Kalender/Saison-Daten ab."""
-    return await europapark_request("/api/v2/seasons", params={"status": "live"})
+    return await europapark_request("/api/v2/seasons", params={"status": "live"}, language=language)
 
 
-async def get_opening_times() -> dict:
+async def get_opening_times(language: str = DEFAULT_LANGUAGE) -> dict:
     """Ruft die aktuellen Öffnungszeiten ab."""
-    return await europapark_request("/api/v2/season-opentime-details/europapark")
+    return await europapark_request("/api/v2/season-opentime-details/europapark", language=language)
 
 
 async def get_show_times() -> dict:
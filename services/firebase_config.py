@@ -40,7 +40,6 @@ def generate_firebase_id() -> str:
 class FirebaseConfigService:
     """Service zum Abrufen und Entschlüsseln von Firebase Remote Config."""
     
-    REMOTE_CONFIG_URL = "https://firebaseremoteconfig.googleapis.com/v1/projects/{project_id}/namespaces/firebase:fetch"
     ANDROID_PACKAGE = "com.EuropaParkMackKG.EPGuide"
     
     def __init__(self, settings: Optional[Settings] = None):
@@ -54,7 +53,7 @@ class FirebaseConfigService:
         Returns:
             Dictionary mit den entschlüsselten Remote Config Einträgen
         """
-        url = self.REMOTE_CONFIG_URL.format(project_id=self.settings.fb_project_id)
+        url = self.settings.firebase_remote_config_url.format(project_id=self.settings.fb_project_id)
         fid = generate_firebase_id()
         
         payload = {
@@ -50,10 +50,7 @@ async def check_firebase_health(settings: Optional[Settings] = None) -> Firebase
         start_time = datetime.now()
         
         async with httpx.AsyncClient(timeout=30.0) as client:
-            firebase_url = (
-                f"https://identitytoolkit.googleapis.com/v1/accounts:signUp"
-                f"?key={settings.fb_api_key}"
-            )
+            firebase_url = f"{settings.firebase_identity_url}?key={settings.fb_api_key}"
             
             response = await client.post(
                 firebase_url,
@@ -0,0 +1,188 @@
+"""
+Geo Service.
+Spatial index over POIs for "nearby" queries.
+
+POI coordinates are projected once per POI refresh onto a local plane
+(equirectangular around the park, accurate to well below a meter at park
+scale) and bucketed into a uniform grid. Each grid cell stores its POIs as
+columnar coordinate arrays, so a query only touches the cells overlapping
+the search radius and computes the distances of a whole cell in one batch.
+"""
+
+import logging
+import math
+from array import array
+from typing import Optional
+
+from services.cache import CACHE_KEYS
+from services.derived import DerivedData
+from services.showtimes import showtimes_by_id
+from services.waittimes import waittimes_by_id
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE = math.pi / 180 * EARTH_RADIUS_M
+CELL_SIZE_M = 100.0
+NEARBY_SHOW_FIELDS = frozenset({"id", "name", "times_today", "times_tomorrow"})
+
+
+def ground_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distance in meters between two points at park scale (equirectangular approximation)."""
+    x = (lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2)) * METERS_PER_DEGREE
+    y = (lat2 - lat1) * METERS_PER_DEGREE
+    return math.hypot(x, y)
+
+
+class _Cell:
+    __slots__ = ("indices", "xs", "ys")
+
+    def __init__(self):
+        self.indices = array("l")
+        self.xs = array("d")
+        self.ys = array("d")
+
+
+class GeoIndex:
+    """Uniform grid over projected POI coordinates."""
+
+    def __init__(self, items: list[dict], cell_size: float = CELL_SIZE_M):
+        self.items = items
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], _Cell] = {}
+
+        if items:
+            self.ref_lat = sum(i["location"]["latitude"] for i in items) / len(items)
+            self.ref_lon = sum(i["location"]["longitude"] for i in items) / len(items)
+        else:
+            self.ref_lat = self.ref_lon = 0.0
+        self._lon_scale = math.cos(math.radians(self.ref_lat)) * METERS_PER_DEGREE
+
+        for index, item in enumerate(items):
+            x, y = self.project(item["location"]["latitude"], item["location"]["longitude"])
+            key = (math.floor(x / cell_size), math.floor(y / cell_size))
+            cell = self.cells.get(key)
+            if cell is None:
+                cell = self.cells[key] = _Cell()
+            cell.indices.append(index)
+            cell.xs.append(x)
+            cell.ys.append(y)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def project(self, lat: float, lon: float) -> tuple[float, float]:
+        """Projects WGS84 coordinates to meters relative to the index reference point."""
+        return (lon - self.ref_lon) * self._lon_scale, (lat - self.ref_lat) * METERS_PER_DEGREE
+
+    def _candidate_cells(self, x: float, y: float, radius: float) -> list[_Cell]:
+        size = self.cell_size
+        x0, x1 = math.floor((x - radius) / size), math.floor((x + radius) / size)
+        y0, y1 = math.floor((y - radius) / size), math.floor((y + radius) / size)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) >= len(self.cells):
+            return [
+                cell for (cx, cy), cell in self.cells.items()
+                if x0 <= cx <= x1 and y0 <= cy <= y1
+            ]
+        cells = self.cells
+        return [
+            cells[(cx, cy)]
+            for cx in range(x0, x1 + 1)
+            for cy in range(y0, y1 + 1)
+            if (cx, cy) in cells
+        ]
+
+    def query(
+        self,
+        lat: float,
+        lon: float,
+        radius: float,
+        types: Optional[set[str]] = None,
+        limit: Optional[int] = None,
+    ) -> list[tuple[float, dict]]:
+        """Returns (distance in meters, item) within the radius, nearest first."""
+        qx, qy = self.project(lat, lon)
+        hypot = math.hypot
+        items = self.items
+        hits: list[tuple[float, int]] = []
+
+        for cell in self._candidate_cells(qx, qy, radius):
+            distances = [hypot(x - qx, y - qy) for x, y in zip(cell.xs, cell.ys)]
+            hits.extend(
+                (distance, index)
+                for distance, index in zip(distances, cell.indices)
+                if distance <= radius
+            )
+
+        if types:
+            hits = [hit for hit in hits if items[hit[1]]["type"] in types]
+        hits.sort()
+        if limit is not None:
+            hits = hits[:limit]
+        return [(distance, items[index]) for distance, index in hits]
+
+
+def _build_geo_index(pois_raw: Optional[dict]) -> GeoIndex:
+    items = []
+    for poi in (pois_raw or {}).get("pois", []):
+        if not (poi.get("latitude") and poi.get("longitude")) or poi.get("id") is None:
+            continue
+        item = {
+            "id": poi["id"],
+            "name": poi.get("name", "Unknown"),
+            "type": poi.get("type", "unknown"),
+            "area_id": poi.get("areaId"),
+            "location": {"latitude": poi["latitude"], "longitude": poi["longitude"]},
+            "icon": poi.get("icon", {}).get("small") if poi.get("icon") else None,
+            "show_ids": [show["id"] for show in poi.get("shows", []) if show.get("id")],
+        }
+        items.append(item)
+
+    index = GeoIndex(items)
+    logger.info(f"Geo index built: {len(items)} POIs in {len(index.cells)} cells.")
+    return index
+
+
+# Spatial POI index, rebuilt once per POI refresh
+geo_index = DerivedData("geo_index", (CACHE_KEYS["pois"],), _build_geo_index)
+
+
+async def get_nearby(
+    lat: float,
+    lon: float,
+    radius: float,
+    types: Optional[set[str]] = None,
+    limit: int = 50,
+    with_waittimes: bool = False,
+    with_showtimes: bool = False,
+) -> Optional[list[dict]]:
+    """
+    Get POIs within `radius` meters, nearest first.
+    Returns None if no POI data is cached yet.
+    """
+    index = await geo_index.get()
+    if not index:
+        return None
+
+    waittimes = await waittimes_by_id.get() if with_waittimes else {}
+    showtimes = await showtimes_by_id.get() if with_showtimes else {}
+
+    results = []
+    for distance, item in index.query(lat, lon, radius, types, limit):
+        entry = {k: v for k, v in item.items() if k != "show_ids" and v is not None}
+        entry["distance"] = round(distance, 1)
+
+        if with_waittimes and item["id"] in waittimes:
+            wait_time = waittimes[item["id"]]
+            entry["wait_time"] = {"time": wait_time["time"], "status": wait_time["status"]}
+
+        if with_showtimes and item["show_ids"]:
+            entry["shows"] = [
+                {key: value for key, value in showtimes[show_id].items() if key in NEARBY_SHOW_FIELDS}
+                for show_id in item["show_ids"]
+                if show_id in showtimes
+            ]
+
+        results.append(entry)
+
+    return results
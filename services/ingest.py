@@ -0,0 +1,208 @@
+"""
+Ingest Pipeline.
+Runs every dataset refresh as a sequence of named stages.
+
+    fetch -> validate -> normalize -> publish -> derive
+
+- fetch: upstream request (size: top-level items)
+- validate: structural checks of the registered validators (services.validation,
+  shared with bundle imports); a failing batch is dropped and the previous
+  generation stays in place
+- normalize: split into park partitions (size: partitions)
+- publish: store all partitions as a new generation (size: JSON bytes)
+- derive: join, index and render the derived artifacts that depend on the
+  dataset, for the parks and languages they are currently held for
+  (size: artifacts built), so requests after a refresh are served from
+  precomputed results instead of rebuilding on first access
+
+Derived artifacts are memoized per generation, so they are built after
+publishing. Artifacts registered with DerivedData join the derive stage
+automatically; further stages and validators are added with
+`get_ingest_pipeline().add_stage()` and `services.validation.register_validator()`.
+
+Duration and output size of every stage are exported as metrics, the last
+run per dataset and language under /admin/ingest.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+
+from services.cache import LOCALIZED_KEYS, REFRESH_FETCHES, get_cache_service, split_by_park
+from services.derived import get_derived_registry
+from services.language import DEFAULT_LANGUAGE
+from services.metrics import ingest_stage_duration_seconds, ingest_stage_size
+from services.validation import validate_dataset
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestBatch:
+    """State of one dataset refresh, passed from stage to stage."""
+
+    key: str
+    language: Optional[str] = None
+    data: Any = None
+    # Park -> data of the park partition (set by normalize)
+    parts: dict[str, Any] = field(default_factory=dict)
+    # Stage -> {"duration_ms", "size", "unit"}
+    stages: dict[str, dict] = field(default_factory=dict)
+
+    @property
+    def content_language(self) -> str:
+        return self.language or DEFAULT_LANGUAGE
+
+
+@dataclass
+class IngestStage:
+    """
+    Named pipeline stage.
+
+    Args:
+        name: Unique stage name (metric label)
+        run: Coroutine processing the batch in place; returns the output size or None
+        unit: Unit of the output size (items, partitions, bytes, artifacts)
+        keys: Datasets the stage applies to (None = all)
+    """
+
+    name: str
+    run: Callable[[IngestBatch], Awaitable[Optional[int]]]
+    unit: str = "items"
+    keys: Optional[frozenset[str]] = None
+
+    def applies_to(self, key: str) -> bool:
+        return self.keys is None or key in self.keys
+
+
+def _size(data: Any) -> int:
+    return len(data) if isinstance(data, (list, dict)) else 0
+
+
+async def _fetch(batch: IngestBatch) -> int:
+    fetch, _ = REFRESH_FETCHES[batch.key]
+    batch.data = await (fetch(batch.language) if batch.language else fetch())
+    pois = batch.data.get("pois") if isinstance(batch.data, dict) else None
+    return _size(pois) if isinstance(pois, list) else _size(batch.data)
+
+
+async def _validate(batch: IngestBatch) -> int:
+    return validate_dataset(batch.key, batch.data)
+
+
+async def _normalize(batch: IngestBatch) -> int:
+    batch.parts = split_by_park(batch.key, batch.data)
+    return len(batch.parts)
+
+
+async def _publish(batch: IngestBatch) -> int:
+    return await get_cache_service().save_partitions(batch.key, batch.parts, batch.language)
+
+
+async def _derive(batch: IngestBatch) -> int:
+    built = 0
+    for name, derived in get_derived_registry().items():
+        if batch.key not in derived.keys:
+            continue
+        language = batch.content_language if batch.key in LOCALIZED_KEYS else None
+        try:
+            built += await derived.rebuild_held(language)
+        except Exception as e:
+            logger.warning(f"Derived data '{name}' could not be built after {batch.key} refresh: {e}")
+    return built
+
+
+class IngestPipeline:
+    """Ordered stages applied to every dataset refresh."""
+
+    def __init__(self, stages: list[IngestStage]):
+        self._stages = list(stages)
+        # "key" or "key:language" -> summary of the last run
+        self._last_runs: dict[str, dict] = {}
+
+    @property
+    def stage_names(self) -> list[str]:
+        return [stage.name for stage in self._stages]
+
+    def add_stage(self, stage: IngestStage, before: Optional[str] = None, after: Optional[str] = None) -> None:
+        """
+        Inserts a stage (default: at the end).
+
+        Raises:
+            ValueError: Stage name already used or unknown `before`/`after` stage
+        """
+        names = self.stage_names
+        if stage.name in names:
+            raise ValueError(f"Ingest stage already registered: {stage.name}")
+        anchor = before or after
+        if anchor is None:
+            self._stages.append(stage)
+            return
+        if anchor not in names:
+            raise ValueError(f"Unknown ingest stage: {anchor}")
+        index = names.index(anchor) + (1 if after else 0)
+        self._stages.insert(index, stage)
+
+    async def run(self, key: str, language: Optional[str] = None) -> IngestBatch:
+        """
+        Runs all stages for a dataset (and content language for localized datasets).
+
+        Raises:
+            Exception: The first stage error; later stages do not run
+        """
+        batch = IngestBatch(key, language)
+        run_key = f"{key}:{language}" if language else key
+        started_at = datetime.now()
+        error: Optional[str] = None
+        try:
+            for stage in self._stages:
+                if not stage.applies_to(key):
+                    continue
+                start = time.perf_counter()
+                try:
+                    size = await stage.run(batch)
+                except Exception as e:
+                    error = f"{stage.name}: {e}"
+                    raise
+                finally:
+                    duration = time.perf_counter() - start
+                    ingest_stage_duration_seconds.labels(key, stage.name).observe(duration)
+                    batch.stages[stage.name] = {"duration_ms": round(duration * 1000, 3), "size": None, "unit": stage.unit}
+                if size is not None:
+                    ingest_stage_size.labels(key, stage.name, stage.unit).set(size)
+                    batch.stages[stage.name]["size"] = size
+            return batch
+        finally:
+            self._last_runs[run_key] = {
+                "key": key,
+                "language": language,
+                "started_at": started_at.isoformat(),
+                "error": error,
+                "stages": batch.stages,
+            }
+
+    def get_status(self) -> dict:
+        runs = [self._last_runs[run_key] for run_key in sorted(self._last_runs)]
+        return {
+            "stages": self.stage_names,
+            "count": len(runs),
+            "runs": runs,
+        }
+
+
+_ingest_pipeline: Optional[IngestPipeline] = None
+
+
+def get_ingest_pipeline() -> IngestPipeline:
+    global _ingest_pipeline
+    if _ingest_pipeline is None:
+        _ingest_pipeline = IngestPipeline([
+            IngestStage("fetch", _fetch, "items"),
+            IngestStage("validate", _validate, "checks"),
+            IngestStage("normalize", _normalize, "partitions"),
+            IngestStage("publish", _publish, "bytes"),
+            IngestStage("derive", _derive, "artifacts"),
+        ])
+    return _ingest_pipeline
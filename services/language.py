@@ -0,0 +1,103 @@
+"""
+Language Service.
+Content language negotiation for localized data (POI names, descriptions,
+season texts, opening time messages).
+
+The language is resolved once per request (`lang` query parameter, then the
+Accept-Language header, then the default) and stored in a context variable,
+so services and cache lookups pick the matching cache partition without
+threading a parameter through every call.
+"""
+
+import logging
+from contextvars import ContextVar
+from typing import Optional
+from urllib.parse import parse_qs
+
+from services.parks import split_park_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LANGUAGE = "de"
+SUPPORTED_LANGUAGES = ("de", "en", "fr", "nl", "it", "es")
+
+# Paths served from localized cache partitions (also below a /{park} prefix)
+LOCALIZED_PATH_PREFIXES = ("/times/", "/info/", "/park/", "/batch")
+
+current_language: ContextVar[str] = ContextVar("current_language", default=DEFAULT_LANGUAGE)
+
+
+def get_language() -> str:
+    """Language of the current request (default language outside of requests)."""
+    return current_language.get()
+
+
+def parse_accept_language(header: Optional[str]) -> Optional[str]:
+    """Best supported language from an Accept-Language header (None if no match)."""
+    candidates = []
+    for position, part in enumerate((header or "").split(",")):
+        tag, _, params = part.strip().partition(";")
+        language = tag.strip().lower().split("-")[0]
+        quality = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        if language in SUPPORTED_LANGUAGES and quality > 0:
+            candidates.append((-quality, position, language))
+    return min(candidates)[2] if candidates else None
+
+
+def negotiate_language(lang: Optional[str], accept_language: Optional[str]) -> str:
+    """Resolves the content language: supported `lang` parameter, Accept-Language, default."""
+    if lang and lang.lower() in SUPPORTED_LANGUAGES:
+        return lang.lower()
+    return parse_accept_language(accept_language) or DEFAULT_LANGUAGE
+
+
+class LanguageMiddleware:
+    """
+    Sets the request language and makes sure its cache partition is loaded.
+    Rare languages are fetched on demand; if that fails the default language
+    is served. The served language is returned in Content-Language.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not split_park_path(scope["path"])[1].startswith(LOCALIZED_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        # Imported here: the cache service itself depends on this module
+        from services.cache import get_cache_service
+
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        accept_language = None
+        for name, value in scope.get("headers", []):
+            if name == b"accept-language":
+                accept_language = value.decode("latin-1")
+                break
+
+        language = negotiate_language(query.get("lang", [None])[-1], accept_language)
+        if not await get_cache_service().ensure_language(language):
+            language = DEFAULT_LANGUAGE
+
+        token = current_language.set(language)
+        content_language = language.encode("latin-1")
+
+        async def send_with_language(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"content-language", content_language))
+                headers.append((b"vary", b"Accept-Language"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_language)
+        finally:
+            current_language.reset(token)
@@ -0,0 +1,260 @@
+"""
+Listing Service.
+Columnar tables for filtering, sorting and cursor pagination of list endpoints.
+
+A table is built once per data generation from pre-rendered rows. Filterable
+fields are stored as column arrays with a value -> row set index for equality
+filters, and every supported sort order is precomputed together with its
+sort keys. A query intersects the row sets, walks the precomputed order from
+the cursor position and stops as soon as the page is full.
+
+Cursors are keyset-based (they carry the sort key of the last returned row,
+in the default order its position and row ID), so pagination stays stable
+when the data is refreshed between pages.
+
+Projected rows (sparse fieldsets) are memoized on the table per projection,
+so they live exactly as long as the data generation the table was built from.
+"""
+
+import base64
+import json
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+DEFAULT_ORDER = ""
+PROJECTED_ROWS_CACHE_SIZE = 16
+
+
+class InvalidQueryError(ValueError):
+    """Raised for unknown sort orders or malformed cursors."""
+
+
+@dataclass
+class SortSpec:
+    """Sort order definition: key per row (ascending) and iteration direction."""
+    key: Callable[[int], tuple]
+    reverse: bool = False
+
+
+@dataclass
+class Page:
+    rows: list[dict]
+    next_cursor: Optional[str]
+
+
+def _key_type(value: Any) -> type:
+    """JSON type of a sort key element (ints and floats compare with each other)."""
+    if isinstance(value, bool):
+        return bool
+    if isinstance(value, (int, float)):
+        return float
+    return type(value)
+
+
+class _Order:
+    __slots__ = ("positions", "keys", "reverse", "shape")
+
+    def __init__(self, row_count: int, spec: SortSpec):
+        keyed = sorted((spec.key(i), i) for i in range(row_count))
+        self.keys = [list(k) for k, _ in keyed]
+        self.positions = [i for _, i in keyed]
+        self.reverse = spec.reverse
+        self.shape = [_key_type(value) for value in self.keys[0]] if self.keys else None
+
+    def check_key(self, key: list) -> list:
+        """Cursor key with the length and element types of this order's keys."""
+        if self.shape is not None and (
+            len(key) != len(self.shape) or any(_key_type(v) is not t for v, t in zip(key, self.shape))
+        ):
+            raise InvalidQueryError("Invalid cursor")
+        return key
+
+
+def _encode_cursor(sort: str, key: list) -> str:
+    raw = json.dumps([sort, key], separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError):
+        raise InvalidQueryError("Invalid cursor")
+    if cursor_sort != sort or not isinstance(key, list):
+        raise InvalidQueryError("Cursor does not match the requested sort order")
+    return key
+
+
+def _in_ranges(row_index: int, predicates: list[tuple[list, Optional[float], Optional[float]]]) -> bool:
+    for column, low, high in predicates:
+        value = column[row_index]
+        if value is None or (low is not None and value < low) or (high is not None and value > high):
+            return False
+    return True
+
+
+class ColumnTable:
+    """
+    Pre-rendered rows with filter columns and precomputed sort orders.
+
+    Args:
+        rows: Response rows in default order
+        columns: Filterable columns (name -> value per row)
+        sorts: Additional sort orders by name (default order is always available)
+    """
+
+    def __init__(
+        self,
+        rows: list[dict],
+        columns: Optional[dict[str, list]] = None,
+        sorts: Optional[dict[str, SortSpec]] = None,
+    ):
+        self.rows = rows
+        self.columns = columns or {}
+        self._value_index: dict[str, dict[Any, set[int]]] = {}
+        for name, values in self.columns.items():
+            index: dict[Any, set[int]] = {}
+            for row_index, value in enumerate(values):
+                index.setdefault(value, set()).add(row_index)
+            self._value_index[name] = index
+
+        # Default order: row position plus row ID, the cursor follows the row across refreshes
+        ids = [row.get("id") for row in rows]
+        self._positions_by_id: dict[Any, int] = {}
+        for row_index, row_id in enumerate(ids):
+            if row_id is not None:
+                self._positions_by_id.setdefault(row_id, row_index)
+
+        specs = {DEFAULT_ORDER: SortSpec(key=lambda i: (i, ids[i]))}
+        specs.update(sorts or {})
+        self._orders = {name: _Order(len(rows), spec) for name, spec in specs.items()}
+        self._projected: dict[Callable, list] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def sort_names(self) -> list[str]:
+        return [name for name in self._orders if name != DEFAULT_ORDER]
+
+    def projected_rows(self, projection: Optional[Callable[[dict], dict]] = None) -> list:
+        """All rows, projected with `projection` (memoized per projection)."""
+        if projection is None:
+            return self.rows
+        rows = self._projected.get(projection)
+        if rows is None:
+            rows = [projection(row) for row in self.rows]
+            if len(self._projected) >= PROJECTED_ROWS_CACHE_SIZE:
+                self._projected.pop(next(iter(self._projected)))
+            self._projected[projection] = rows
+        return rows
+
+    def _seek(self, order: _Order, sort: str, cursor: str) -> int:
+        """Position in `order` where the page after the cursor starts (ends for reversed orders)."""
+        key = order.check_key(_decode_cursor(cursor, sort))
+        if not order.keys:
+            return 0
+        if sort == DEFAULT_ORDER:
+            # Continue after the cursor row; if it was removed, at its former position
+            position = self._positions_by_id.get(key[-1]) if key[-1] is not None else None
+            if position is None:
+                if not isinstance(key[0], int):
+                    raise InvalidQueryError("Invalid cursor")
+                return min(max(key[0], 0), len(order.positions))
+            return position if order.reverse else position + 1
+        return bisect_left(order.keys, key) if order.reverse else bisect_right(order.keys, key)
+
+    def query(
+        self,
+        equals: Optional[dict[str, Iterable]] = None,
+        ranges: Optional[dict[str, tuple[Optional[float], Optional[float]]]] = None,
+        sort: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        projection: Optional[Callable[[dict], dict]] = None,
+    ) -> Page:
+        """
+        Args:
+            equals: Column -> accepted values (row matches if its value is one of them)
+            ranges: Column -> (min, max) inclusive; rows with None never match
+            sort: Sort order name (None = default order)
+            cursor: Cursor from a previous page with the same sort order
+            limit: Page size (None = all rows)
+            projection: Compiled sparse fieldset applied to the returned rows
+        """
+        sort = sort or DEFAULT_ORDER
+        order = self._orders.get(sort)
+        if order is None:
+            raise InvalidQueryError(f"Unknown sort order: {sort}")
+
+        mask: Optional[set[int]] = None
+        for column, values in (equals or {}).items():
+            index = self._value_index[column]
+            matches: set[int] = set()
+            for value in values:
+                matches |= index.get(value, set())
+            mask = matches if mask is None else mask & matches
+            if not mask:
+                return Page([], None)
+
+        predicates = [
+            (self.columns[column], low, high)
+            for column, (low, high) in (ranges or {}).items()
+            if low is not None or high is not None
+        ]
+
+        count = len(order.positions)
+        if order.reverse:
+            end = self._seek(order, sort, cursor) if cursor else count
+            sequence = range(end - 1, -1, -1)
+        else:
+            start = self._seek(order, sort, cursor) if cursor else 0
+            sequence = range(start, count)
+
+        source = self.projected_rows(projection)
+        positions = order.positions
+        rows = []
+        last_position = None
+        for position in sequence:
+            row_index = positions[position]
+            if mask is not None and row_index not in mask:
+                continue
+            if predicates and not _in_ranges(row_index, predicates):
+                continue
+            if limit is not None and len(rows) == limit:
+                return Page(rows, _encode_cursor(sort, order.keys[last_position]))
+            rows.append(source[row_index])
+            last_position = position
+
+        return Page(rows, None)
+
+
+def name_sorts(names: list[str], ids: list[int]) -> dict[str, SortSpec]:
+    """Sort orders "name" / "-name" (case-insensitive, ties by ID)."""
+    folded = [name.casefold() for name in names]
+
+    def key(i: int) -> tuple:
+        return (folded[i], ids[i])
+
+    return {"name": SortSpec(key), "-name": SortSpec(key, reverse=True)}
+
+
+def id_sorts(ids: list[int]) -> dict[str, SortSpec]:
+    """Sort orders "id" / "-id"."""
+
+    def key(i: int) -> tuple:
+        return (ids[i],)
+
+    return {"id": SortSpec(key), "-id": SortSpec(key, reverse=True)}
+
+
+def list_table(rows: list[dict]) -> ColumnTable:
+    """Table for the /info list endpoints: filter by area_id, sort by name or ID."""
+    ids = [row["id"] for row in rows]
+    return ColumnTable(
+        rows,
+        columns={"area_id": [row.get("area_id") for row in rows]},
+        sorts={**name_sorts([row["name"] for row in rows], ids), **id_sorts(ids)},
+    )
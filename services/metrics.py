@@ -0,0 +1,387 @@
+"""
+Metrics Service.
+Minimal Prometheus-compatible metrics (counters, gauges, histograms).
+
+Collection is kept cheap on the hot path: every labeled child is resolved
+once and then only increments plain attributes, histograms use fixed,
+pre-sorted bucket bounds and a single bisect per observation. No locks are
+taken; all updates happen on the event loop thread.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labeled metric families."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: object):
+        """Returns the child for the given label values (created on first use)."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {key}")
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def _samples(self) -> Iterable[str]:
+        for key, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], Optional[float]]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], Optional[float]]) -> None:
+        """Evaluates the value lazily at scrape time (None = no sample)."""
+        self.function = function
+
+    def get(self) -> Optional[float]:
+        if self.function is not None:
+            return self.function()
+        return self.value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down or is computed at scrape time."""
+
+    type_name = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._children[()].set(value)
+
+    def set_function(self, function: Callable[[], Optional[float]]) -> None:
+        self._children[()].set_function(function)
+
+    def _samples(self) -> Iterable[str]:
+        for key, child in list(self._children.items()):
+            value = child.get()
+            if value is None:
+                continue
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    """Histogram with fixed bucket bounds."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._children[()].observe(value)
+
+    def _samples(self) -> Iterable[str]:
+        for key, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """Holds all metric families and renders the exposition format."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route")
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled."
+)
+
+# Cache
+cache_operation_duration_seconds = registry.histogram(
+    "cache_operation_duration_seconds", "Cache load/save latency.", ("operation", "key")
+)
+cache_loads_total = registry.counter(
+    "cache_loads_total", "Cache loads by result (hit/miss).", ("key", "result")
+)
+cache_data_age_seconds = registry.gauge(
+    "cache_data_age_seconds", "Age of the cached dataset.", ("key",)
+)
+
+# Admission control
+requests_rejected_total = registry.counter(
+    "requests_rejected_total", "Requests rejected by admission control.", ("group", "reason")
+)
+event_loop_lag_seconds = registry.gauge(
+    "event_loop_lag_seconds", "Delay of the event loop in waking up a periodic sleep."
+)
+
+# Response cache
+response_cache_requests_total = registry.counter(
+    "response_cache_requests_total", "GET requests by response cache result (hit/miss/bypass).", ("result",)
+)
+response_cache_entries = registry.gauge(
+    "response_cache_entries", "Responses held in the response cache."
+)
+response_cache_bytes = registry.gauge(
+    "response_cache_bytes", "Size of the responses held in the response cache."
+)
+
+# CDN
+cdn_purges_total = registry.counter(
+    "cdn_purges_total", "CDN purge hook requests by result.", ("result",)
+)
+
+# Replication
+replication_syncs_total = registry.counter(
+    "replication_syncs_total", "Replication pulls and pushes by result.", ("direction", "result")
+)
+replica_lag_seconds = registry.gauge(
+    "replica_lag_seconds", "Time since the replica last had the primary's newest generation."
+)
+
+# Refresh
+cache_refresh_duration_seconds = registry.histogram(
+    "cache_refresh_duration_seconds", "Duration of a dataset refresh.", ("key",)
+)
+cache_refresh_total = registry.counter(
+    "cache_refresh_total", "Dataset refreshes by result.", ("key", "result")
+)
+
+# Ingest
+ingest_stage_duration_seconds = registry.histogram(
+    "ingest_stage_duration_seconds", "Duration of an ingest pipeline stage.", ("key", "stage")
+)
+ingest_stage_size = registry.gauge(
+    "ingest_stage_size", "Output size of the last run of an ingest pipeline stage.", ("key", "stage", "unit")
+)
+derived_build_duration_seconds = registry.histogram(
+    "derived_build_duration_seconds", "Duration of building a derived artifact partition.", ("name",)
+)
+
+# Scheduler
+scheduler_job_runs_total = registry.counter(
+    "scheduler_job_runs_total", "Scheduled job runs by result (success/failure/skipped/missed).", ("job", "result")
+)
+scheduler_job_duration_seconds = registry.histogram(
+    "scheduler_job_duration_seconds", "Duration of a scheduled job run.", ("job",)
+)
+upstream_slots_in_use = registry.gauge(
+    "upstream_slots_in_use", "Upstream requests currently holding a concurrency slot."
+)
+upstream_queue_wait_seconds = registry.histogram(
+    "upstream_queue_wait_seconds", "Time spent waiting for an upstream concurrency slot.", ("priority",)
+)
+
+# Webhooks
+webhook_events_total = registry.counter(
+    "webhook_events_total", "Webhook events raised by trigger (below/above/status).", ("trigger",)
+)
+webhook_deliveries_total = registry.counter(
+    "webhook_deliveries_total", "Webhook batch deliveries by result (success/retry/failure/dropped).", ("result",)
+)
+webhook_delivery_duration_seconds = registry.histogram(
+    "webhook_delivery_duration_seconds", "Duration of a webhook delivery attempt."
+)
+webhook_queue_size = registry.gauge(
+    "webhook_queue_size", "Webhook batches waiting for a delivery worker."
+)
+
+# Upstream
+upstream_requests_total = registry.counter(
+    "upstream_requests_total", "Upstream API requests.", ("endpoint", "method", "status")
+)
+upstream_request_duration_seconds = registry.histogram(
+    "upstream_request_duration_seconds", "Upstream API request latency.", ("endpoint", "method")
+)
+
+# Auth
+token_refreshes_total = registry.counter(
+    "token_refreshes_total", "OAuth2 token requests by result.", ("result",)
+)
+
+
+def render_metrics() -> str:
+    """Renders all metrics in the Prometheus text exposition format."""
+    return registry.render()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route request counts and latency."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+        in_flight = http_requests_in_flight.labels()
+        in_flight.inc()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_request_duration_seconds.labels(method, route_path).observe(
+                time.perf_counter() - start
+            )
+            http_requests_total.labels(method, route_path, status_code).inc()
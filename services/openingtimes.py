@@ -7,7 +7,8 @@ from typing import Optional
 
 from pydantic import BaseModel
 
-from services.cache import get_cache_service, CACHE_KEYS
+from services.cache import CACHE_KEYS
+from services.derived import DerivedData
 
 
 class OpeningTime(BaseModel):
@@ -25,15 +26,8 @@ class OpeningTimesInfo(BaseModel):
     message: Optional[str] = None
 
 
-async def get_opening_times() -> Optional[OpeningTimesInfo]:
-    """Get formatted opening times."""
-    cache = get_cache_service()
-    data = await cache.load(CACHE_KEYS["openingtimes"])
-    
-    if not data or "data" not in data:
-        return None
-    
-    raw = data["data"]
+def build_opening_times(raw: dict) -> OpeningTimesInfo:
+    """Formatted opening times from raw opening time data."""
     
     def extract_time(dt_str: str | None) -> str | None:
         """Extract time only from ISO string."""
@@ -78,3 +72,23 @@ async def get_opening_times() -> Optional[OpeningTimesInfo]:
         next=next_open,
         message=message
     )
+
+
+def _render_opening_times(raw: Optional[dict]) -> Optional[dict]:
+    if raw is None:
+        return None
+    return build_opening_times(raw).model_dump(mode="json", exclude_none=True)
+
+
+# Rendered opening times, rebuilt once per opening time refresh
+opening_times = DerivedData("opening_times", (CACHE_KEYS["openingtimes"],), _render_opening_times)
+
+
+async def get_opening_times() -> Optional[dict]:
+    """Get rendered opening times (None if there are none for the current park)."""
+    return await opening_times.get()
+
+
+def opening_times_loaded() -> bool:
+    """Whether the opening times were loaded (only the Europa-Park has any)."""
+    return opening_times.loaded()
@@ -0,0 +1,219 @@
+"""
+Park Calendar Service.
+Interval index over seasons and opening times.
+
+Seasons are date ranges that may overlap (e.g. Halloween within the summer
+season). They are cut once per refresh into elementary, non-overlapping
+segments between all season boundaries, each with the list of seasons
+active in it, so "seasons on date D" is one binary search. Opening times
+are disjoint intervals of aware datetimes, sorted by start, so "open at X"
+and "next opening after X" are one binary search each.
+
+Opening hours are only published for a few days ahead (today, tomorrow,
+next opening). Other days are reported as closed when no season is active
+and as unknown otherwise.
+"""
+
+import logging
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Iterator, Optional
+
+from services.cache import CACHE_KEYS
+from services.derived import DerivedData
+from services.seasons import SeasonInfo, build_seasons
+from services.showtimes import PARK_TIMEZONE
+
+logger = logging.getLogger(__name__)
+
+MAX_CALENDAR_DAYS = 366
+
+
+@dataclass(frozen=True)
+class OpeningInterval:
+    """Opening hours of one day."""
+    date: date
+    start: datetime
+    end: datetime
+
+    def to_dict(self) -> dict:
+        return {"date": self.date.isoformat(), "start": self.start.isoformat(), "end": self.end.isoformat()}
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=PARK_TIMEZONE)
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    try:
+        return date.fromisoformat(value[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_opening_intervals(raw: Optional[dict]) -> tuple[list[OpeningInterval], set[date]]:
+    """
+    Opening intervals from raw opening time data (today, tomorrow, next),
+    and all dates the data makes a statement about (including closed days).
+    """
+    intervals: dict[date, OpeningInterval] = {}
+    known: set[date] = set()
+    for name in ("today", "tomorrow", "next"):
+        day = (raw or {}).get(name)
+        if not day:
+            continue
+        start, end = _parse_datetime(day.get("start")), _parse_datetime(day.get("end"))
+        day_date = _parse_date(day.get("date")) or (start.astimezone(PARK_TIMEZONE).date() if start else None)
+        if day_date is None:
+            continue
+        known.add(day_date)
+        if start and end and start < end:
+            intervals.setdefault(day_date, OpeningInterval(day_date, start, end))
+    return sorted(intervals.values(), key=lambda interval: interval.start), known
+
+
+class ParkCalendar:
+    """Season segments and opening intervals of a park."""
+
+    def __init__(self, seasons: list[SeasonInfo], openings: list[OpeningInterval], known_dates: set[date]):
+        # Elementary segments: segment i covers [boundaries[i], boundaries[i + 1])
+        ranges = []
+        for season in seasons:
+            start, end = _parse_date(season.start), _parse_date(season.end)
+            if start and end and start <= end:
+                ranges.append((start, end + timedelta(days=1), season))
+        self.boundaries: list[date] = sorted({d for start, end, _ in ranges for d in (start, end)})
+        self.segments: list[tuple[SeasonInfo, ...]] = [
+            tuple(season for start, end, season in ranges if start <= lower < end)
+            for lower in self.boundaries[:-1]
+        ]
+
+        self.openings = openings
+        self.opening_starts = [interval.start for interval in openings]
+        self.openings_by_date = {interval.date: interval for interval in openings}
+        self.known_dates = known_dates
+
+    def seasons_on(self, day: date) -> tuple[SeasonInfo, ...]:
+        """Seasons active on a date."""
+        index = bisect_right(self.boundaries, day) - 1
+        if index < 0 or index >= len(self.segments):
+            return ()
+        return self.segments[index]
+
+    def _season_runs(self, first: date, last: date) -> Iterator[tuple[date, date, tuple[SeasonInfo, ...]]]:
+        """(from, to inclusive, seasons) runs covering [first, last], walking the segments once."""
+        index = bisect_right(self.boundaries, first) - 1
+        current = first
+        while current <= last:
+            if index < 0:
+                upper = self.boundaries[0] if self.boundaries else last + timedelta(days=1)
+                seasons = ()
+            elif index >= len(self.segments):
+                upper = last + timedelta(days=1)
+                seasons = ()
+            else:
+                upper = self.boundaries[index + 1]
+                seasons = self.segments[index]
+            run_end = min(upper - timedelta(days=1), last)
+            yield current, run_end, seasons
+            current = run_end + timedelta(days=1)
+            index += 1
+
+    def opening_at(self, moment: datetime) -> Optional[OpeningInterval]:
+        """Opening interval containing `moment` (None if closed or unknown)."""
+        index = bisect_right(self.opening_starts, moment) - 1
+        if index >= 0 and moment < self.openings[index].end:
+            return self.openings[index]
+        return None
+
+    def is_open(self, moment: datetime) -> Optional[bool]:
+        """True/False if known for the day of `moment`; None if no opening hours are published for it."""
+        if self.opening_at(moment):
+            return True
+        day = moment.astimezone(PARK_TIMEZONE).date()
+        if day in self.known_dates or not self.seasons_on(day):
+            return False
+        return None
+
+    def next_opening(self, moment: datetime) -> Optional[OpeningInterval]:
+        """First opening interval starting after `moment` (None if none is published)."""
+        index = bisect_right(self.opening_starts, moment)
+        return self.openings[index] if index < len(self.openings) else None
+
+    def day_status(self, day: date, seasons: tuple[SeasonInfo, ...]) -> str:
+        if day in self.openings_by_date:
+            return "open"
+        if day in self.known_dates or not seasons:
+            return "closed"
+        return "unknown"
+
+    def days(self, first: date, last: date) -> list[dict]:
+        """Calendar entries for every date in [first, last]."""
+        results = []
+        for run_start, run_end, seasons in self._season_runs(first, last):
+            season_items = [{"id": s.id, "name": s.name} for s in seasons]
+            day = run_start
+            while day <= run_end:
+                opening = self.openings_by_date.get(day)
+                entry = {"date": day.isoformat(), "status": self.day_status(day, seasons), "seasons": season_items}
+                if opening:
+                    entry["start"] = opening.start.isoformat()
+                    entry["end"] = opening.end.isoformat()
+                results.append(entry)
+                day += timedelta(days=1)
+        return results
+
+
+def _build_park_calendar(seasons_raw: Optional[list], openingtimes_raw: Optional[dict]) -> Optional[ParkCalendar]:
+    if not seasons_raw and not openingtimes_raw:
+        return None
+    openings, known_dates = parse_opening_intervals(openingtimes_raw)
+    calendar = ParkCalendar(build_seasons(seasons_raw), openings, known_dates)
+    logger.info(
+        f"Park calendar built: {len(calendar.segments)} season segments, {len(openings)} opening intervals."
+    )
+    return calendar
+
+
+# Calendar index, rebuilt once per season or opening time refresh
+park_calendar = DerivedData(
+    "park_calendar",
+    (CACHE_KEYS["seasons"], CACHE_KEYS["openingtimes"]),
+    _build_park_calendar,
+)
+
+
+async def get_park_calendar() -> Optional[ParkCalendar]:
+    """Get the calendar of the current park (None if no seasons or opening times are cached yet)."""
+    return await park_calendar.get()
+
+
+async def get_calendar_days(first: date, last: date) -> Optional[list[dict]]:
+    """Calendar entries for [first, last]; None if nothing is cached yet."""
+    calendar = await park_calendar.get()
+    if calendar is None:
+        return None
+    return calendar.days(first, last)
+
+
+async def get_park_status(moment: datetime) -> Optional[dict]:
+    """Open state, active seasons and next opening at `moment`; None if nothing is cached yet."""
+    calendar = await park_calendar.get()
+    if calendar is None:
+        return None
+
+    local = moment.astimezone(PARK_TIMEZONE)
+    current = calendar.opening_at(local)
+    upcoming = calendar.next_opening(local)
+    return {
+        "at": local.isoformat(),
+        "open": calendar.is_open(local),
+        "opening": current.to_dict() if current else None,
+        "seasons": [{"id": s.id, "name": s.name} for s in calendar.seasons_on(local.date())],
+        "next_opening": upcoming.to_dict() if upcoming else None,
+    }
@@ -0,0 +1,59 @@
+"""
+Parks Service.
+The upstream API serves Europa-Park and Rulantica from the same endpoints;
+POIs and seasons carry the parks they belong to in `scopes`.
+
+Datasets are partitioned by park once when they are stored, so every park
+gets its own cache partition, derived indexes and rendered outputs, and
+request handlers never filter by scope. The park is resolved once per
+request (the `/{park}` route prefix, Europa-Park for unprefixed routes) and
+stored in a context variable, like the content language.
+"""
+
+from contextvars import ContextVar
+from typing import Iterable
+
+from fastapi import HTTPException, Path
+
+DEFAULT_PARK = "europapark"
+PARKS = ("europapark", "rulantica")
+
+current_park: ContextVar[str] = ContextVar("current_park", default=DEFAULT_PARK)
+
+
+def get_park() -> str:
+    """Park of the current request (default park outside of park-scoped routes)."""
+    return current_park.get()
+
+
+def partition_by_scope(items: Iterable[dict]) -> dict[str, list[dict]]:
+    """
+    Splits items by their `scopes` in one pass, preserving order.
+    Items in several parks are listed in each; unknown scopes are dropped.
+    """
+    partitions: dict[str, list[dict]] = {park: [] for park in PARKS}
+    for item in items:
+        for scope in item.get("scopes") or ():
+            partition = partitions.get(scope)
+            if partition is not None:
+                partition.append(item)
+    return partitions
+
+
+def split_park_path(path: str) -> tuple[str, str]:
+    """Park and remaining path of a request path (default park if unprefixed)."""
+    _, _, rest = path.partition("/")
+    park, slash, remainder = rest.partition("/")
+    if park in PARKS and slash:
+        return park, "/" + remainder
+    return DEFAULT_PARK, path
+
+
+async def park_scope(
+    park: str = Path(..., description=f"Park: {', '.join(PARKS)}", examples=[DEFAULT_PARK])
+) -> str:
+    """Route dependency for `/{park}` prefixed routers; sets the request park."""
+    if park not in PARKS:
+        raise HTTPException(status_code=404, detail=f"Unknown park: {park}")
+    current_park.set(park)
+    return park
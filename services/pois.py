@@ -5,7 +5,10 @@ from typing import Optional
 
 from pydantic import BaseModel
 
-from services.cache import get_cache_service, CACHE_KEYS
+from services.cache import CACHE_KEYS
+from services.derived import DerivedData, RenderedMap
+from services.listing import ColumnTable, Page, list_table
+from services.projection import Projection
 
 logger = logging.getLogger(__name__)
 
@@ -54,18 +57,29 @@ def extract_location(poi: dict) -> Optional[Location]:
     return None
 
 
-async def get_pois_by_type(poi_type: str) -> list[POIListItem]:
-    """Get all POIs of a type (compact list)."""
-    cache = get_cache_service()
-    pois_data = await cache.load(CACHE_KEYS["pois"])
-    
-    if not pois_data or "data" not in pois_data:
+def build_poi_search_documents(pois_raw: Optional[dict]) -> list[dict]:
+    """Search documents (name, description) for all POIs of the park."""
+    documents = []
+    for poi in (pois_raw or {}).get("pois", []):
+        if poi.get("id") is None:
+            continue
+        documents.append({
+            "id": poi["id"],
+            "name": poi.get("name", "Unknown"),
+            "description": poi.get("excerpt"),
+            "type": poi.get("type", "unknown"),
+        })
+    return documents
+
+
+def build_pois_by_type(pois_raw: Optional[dict], poi_type: str) -> list[POIListItem]:
+    """All POIs of a type (compact list) from raw POI data."""
+    if not pois_raw:
         return []
     
     results = []
-    for poi in pois_data["data"].get("pois", []):
-        scopes = poi.get("scopes", [])
-        if poi.get("type") != poi_type or "europapark" not in scopes:
+    for poi in pois_raw.get("pois", []):
+        if poi.get("type") != poi_type:
             continue
         
         results.append(POIListItem(
@@ -80,51 +94,127 @@ async def get_pois_by_type(poi_type: str) -> list[POIListItem]:
     return results
 
 
-async def get_poi_by_id_and_type(poi_id: int, poi_type: str) -> Optional[POIInfo]:
-    """Get full POI details by ID and type."""
-    cache = get_cache_service()
-    pois_data = await cache.load(CACHE_KEYS["pois"])
-    
-    if not pois_data or "data" not in pois_data:
+LIST_TYPES = ("shopping", "gastronomy", "service")
+
+
+def _build_poi_tables(pois_raw: Optional[dict]) -> dict[str, ColumnTable]:
+    return {
+        poi_type: list_table([e.model_dump(exclude_none=True) for e in build_pois_by_type(pois_raw, poi_type)])
+        for poi_type in LIST_TYPES
+    }
+
+
+# List tables per POI type, rebuilt once per POI refresh
+poi_tables = DerivedData("poi_tables", (CACHE_KEYS["pois"],), _build_poi_tables)
+
+
+async def query_pois(
+    poi_type: str,
+    area_ids: Optional[set[int]] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    projection: Optional[Projection] = None,
+) -> Optional[Page]:
+    """
+    Filtered, sorted page of POIs of a type.
+    Returns None if the POIs were never loaded.
+    """
+    table = (await poi_tables.get()).get(poi_type)
+    if table is None or (not table and not poi_tables.loaded()):
         return None
-    
-    for poi in pois_data["data"].get("pois", []):
-        scopes = poi.get("scopes", [])
-        if (poi.get("id") == poi_id and 
-            poi.get("type") == poi_type and 
-            "europapark" in scopes):
-            return POIInfo(
-                id=poi["id"],
-                name=poi.get("name", "Unknown"),
-                description=poi.get("excerpt"),
-                type=poi.get("type"),
-                area_id=poi.get("areaId"),
-                location=extract_location(poi),
-                image=extract_image_urls(poi.get("image")),
-                icon=poi.get("icon", {}).get("small") if poi.get("icon") else None
-            )
-    return None
+    return table.query(
+        equals={"area_id": area_ids} if area_ids else None,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+        projection=projection,
+    )
+
+
+def build_pois_by_id(pois_raw: Optional[dict]) -> dict[int, dict]:
+    """Raw POIs by ID (first occurrence wins)."""
+    by_id: dict[int, dict] = {}
+    for poi in (pois_raw or {}).get("pois", []):
+        if poi.get("id") is not None:
+            by_id.setdefault(poi["id"], poi)
+    return by_id
+
+
+# Raw POIs by ID, rebuilt once per POI refresh
+pois_by_id = DerivedData("pois_by_id", (CACHE_KEYS["pois"],), build_pois_by_id)
 
 
-async def get_all_shops() -> list[POIListItem]:
-    return await get_pois_by_type("shopping")
+def build_poi_info(poi: dict) -> POIInfo:
+    """Full POI details from a raw POI."""
+    return POIInfo(
+        id=poi["id"],
+        name=poi.get("name", "Unknown"),
+        description=poi.get("excerpt"),
+        type=poi.get("type"),
+        area_id=poi.get("areaId"),
+        location=extract_location(poi),
+        image=extract_image_urls(poi.get("image")),
+        icon=poi.get("icon", {}).get("small") if poi.get("icon") else None
+    )
 
 
-async def get_shop_by_id(shop_id: int) -> Optional[POIInfo]:
+def render_poi_info(poi: dict) -> dict:
+    """Rendered full POI details."""
+    return build_poi_info(poi).model_dump(mode="json", exclude_none=True)
+
+
+def _build_poi_details(pois_raw: Optional[dict]) -> RenderedMap:
+    return RenderedMap(build_pois_by_id(pois_raw), render_poi_info)
+
+
+# POI details by ID, rendered on first access, rebuilt once per POI refresh
+poi_details = DerivedData("poi_details", (CACHE_KEYS["pois"],), _build_poi_details)
+
+
+async def get_poi_by_id_and_type(poi_id: int, poi_type: str) -> Optional[dict]:
+    """Get rendered full POI details by ID and type."""
+    details = await poi_details.get()
+    poi = details.raw.get(poi_id)
+    if not poi or poi.get("type") != poi_type:
+        return None
+    return details.get(poi_id)
+
+
+async def get_pois_by_ids_and_type(poi_ids: list[int], poi_type: str) -> Optional[dict[int, dict]]:
+    """
+    Get rendered full POI details for several IDs of a type (unknown IDs are left out).
+    Returns None if the POIs were never loaded.
+    """
+    details = await poi_details.get()
+    if not details and not poi_details.loaded():
+        return None
+    return {
+        poi_id: details.get(poi_id)
+        for poi_id in poi_ids
+        if poi_id in details and details.raw[poi_id].get("type") == poi_type
+    }
+
+
+async def get_shop_by_id(shop_id: int) -> Optional[dict]:
     return await get_poi_by_id_and_type(shop_id, "shopping")
 
 
-async def get_all_restaurants() -> list[POIListItem]:
-    return await get_pois_by_type("gastronomy")
+async def get_shops_by_ids(shop_ids: list[int]) -> Optional[dict[int, dict]]:
+    return await get_pois_by_ids_and_type(shop_ids, "shopping")
 
 
-async def get_restaurant_by_id(restaurant_id: int) -> Optional[POIInfo]:
+async def get_restaurant_by_id(restaurant_id: int) -> Optional[dict]:
     return await get_poi_by_id_and_type(restaurant_id, "gastronomy")
 
 
-async def get_all_services() -> list[POIListItem]:
-    return await get_pois_by_type("service")
+async def get_restaurants_by_ids(restaurant_ids: list[int]) -> Optional[dict[int, dict]]:
+    return await get_pois_by_ids_and_type(restaurant_ids, "gastronomy")
 
 
-async def get_service_by_id(service_id: int) -> Optional[POIInfo]:
+async def get_service_by_id(service_id: int) -> Optional[dict]:
     return await get_poi_by_id_and_type(service_id, "service")
+
+
+async def get_services_by_ids(service_ids: list[int]) -> Optional[dict[int, dict]]:
+    return await get_pois_by_ids_and_type(service_ids, "service")
@@ -0,0 +1,282 @@
+"""
+Profiling Service.
+Opt-in per-request sampling profiler with a bounded in-memory profile store.
+
+A single background thread samples every profiled request at a fixed
+interval. Each sample is the request's logical async stack: the await chain
+of the request task's coroutines (so time spent awaiting e.g.
+CacheService.load or upstream calls is attributed to those frames), extended
+by the synchronous frames on the event loop thread while the task is running.
+Profiles are stored as folded stacks ("collapsed" format), readable by
+flamegraph.pl, inferno and speedscope.
+"""
+
+import asyncio
+import itertools
+import logging
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import get_settings
+from services.admin_auth import ADMIN_TOKEN_HEADER, is_valid_admin_token
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# Raw ASGI header names (lowercase bytes) and query marker, matched without decoding the request
+_PROFILE_HEADER_RAW = PROFILE_HEADER.encode("latin-1")
+_ADMIN_TOKEN_HEADER_RAW = ADMIN_TOKEN_HEADER.lower().encode("latin-1")
+_PROFILE_QUERY_RAW = PROFILE_QUERY_PARAM.encode("latin-1")
+_ENABLED_VALUES = ("1", "true")
+
+_MAX_STACK_DEPTH = 128
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename.rsplit("/", 2)
+    short = "/".join(filename[-2:])
+    return f"{code.co_qualname} ({short}:{code.co_firstlineno})"
+
+
+class Profile:
+    """A finished request profile."""
+
+    def __init__(self, profile_id: int, method: str, path: str, reason: str):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.reason = reason
+        self.started_at = datetime.now()
+        self.duration_ms: float = 0.0
+        self.status_code: Optional[int] = None
+        self.stacks: Counter = Counter()
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.stacks.values())
+
+    def to_folded(self) -> str:
+        """Folded stack format: 'frame;frame;frame count' per line."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "reason": self.reason,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 3),
+            "status_code": self.status_code,
+            "samples": self.sample_count,
+        }
+
+
+class _Session:
+    """A profile being recorded for a running request task."""
+
+    __slots__ = ("profile", "task", "loop_thread_id")
+
+    def __init__(self, profile: Profile, task: asyncio.Task, loop_thread_id: int):
+        self.profile = profile
+        self.task = task
+        self.loop_thread_id = loop_thread_id
+
+
+class Profiler:
+    """Samples active request tasks and keeps finished profiles in a ring buffer."""
+
+    def __init__(self, interval_ms: float = 5.0, buffer_size: int = 50):
+        self.interval = max(interval_ms, 0.5) / 1000
+        self._profiles: deque[Profile] = deque(maxlen=max(buffer_size, 1))
+        self._sessions: dict[int, _Session] = {}
+        self._ids = itertools.count(1)
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+
+    def start(self, method: str, path: str, reason: str) -> Optional[_Session]:
+        task = asyncio.current_task()
+        if task is None:
+            return None
+        profile = Profile(next(self._ids), method, path, reason)
+        session = _Session(profile, task, threading.get_ident())
+        self._sessions[profile.id] = session
+        self._ensure_thread()
+        self._wakeup.set()
+        return session
+
+    def finish(self, session: _Session, duration_ms: float, status_code: Optional[int]) -> Profile:
+        self._sessions.pop(session.profile.id, None)
+        session.profile.duration_ms = duration_ms
+        session.profile.status_code = status_code
+        self._profiles.append(session.profile)
+        return session.profile
+
+    def list_profiles(self) -> list[dict]:
+        return [p.to_dict() for p in reversed(self._profiles)]
+
+    def get_profile(self, profile_id: int) -> Optional[Profile]:
+        for profile in self._profiles:
+            if profile.id == profile_id:
+                return profile
+        return None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            if not self._sessions:
+                self._wakeup.clear()
+                self._wakeup.wait()
+                continue
+            time.sleep(self.interval)
+            thread_frames = sys._current_frames()
+            for session in list(self._sessions.values()):
+                try:
+                    stack = self._sample(session, thread_frames)
+                except Exception:  # coroutine state changed while sampling
+                    continue
+                if stack:
+                    session.profile.stacks[stack] += 1
+
+    @staticmethod
+    def _sample(session: _Session, thread_frames: dict) -> Optional[str]:
+        """Builds the logical stack of the request task."""
+        labels: list[str] = []
+        frames: list = []
+        awaitable = session.task.get_coro()
+
+        while awaitable is not None and len(frames) < _MAX_STACK_DEPTH:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+            if frame is None:
+                # Leaf of the await chain, usually a Future
+                if not hasattr(awaitable, "cr_await"):
+                    labels.append(f"<await {type(awaitable).__name__}>")
+                break
+            frames.append(frame)
+            labels.append(_frame_label(frame))
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+
+        if not frames:
+            return None
+
+        # Task is currently running: append the synchronous frames above the
+        # innermost coroutine (everything it called that has not returned yet).
+        top = thread_frames.get(session.loop_thread_id)
+        innermost = frames[-1]
+        sync_frames = []
+        frame = top
+        while frame is not None and len(sync_frames) < _MAX_STACK_DEPTH:
+            if frame is innermost:
+                if labels[-1].startswith("<await"):
+                    labels.pop()
+                labels.extend(_frame_label(f) for f in reversed(sync_frames))
+                break
+            sync_frames.append(frame)
+            frame = frame.f_back
+
+        return ";".join(labels)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware enabling the profiler for a request.
+
+    Explicit: authorized callers send "X-Profile: 1" or "?profile=1" together
+    with a valid X-Admin-Token. Sampled: a configurable fraction of all
+    requests is profiled automatically.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def _requested(scope: Scope) -> bool:
+        """Whether the request asks for a profile (header or query flag), without decoding other headers."""
+        query = scope.get("query_string")
+        if query and _PROFILE_QUERY_RAW in query:
+            if parse_qs(query.decode("latin-1")).get(PROFILE_QUERY_PARAM, [""])[0] in _ENABLED_VALUES:
+                return True
+        for name, value in scope["headers"]:
+            if name == _PROFILE_HEADER_RAW:
+                return value.decode("latin-1") in _ENABLED_VALUES
+        return False
+
+    def _reason(self, scope: Scope) -> Optional[str]:
+        if self._requested(scope):
+            token = next((value for name, value in scope["headers"] if name == _ADMIN_TOKEN_HEADER_RAW), None)
+            if token is not None and is_valid_admin_token(token.decode("latin-1")):
+                return "requested"
+
+        sample_rate = get_settings().profiling_sample_rate
+        if sample_rate > 0 and random.random() < sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reason = self._reason(scope)
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        profiler = get_profiler()
+        session = profiler.start(scope["method"], scope["path"], reason)
+        if session is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code: Optional[int] = None
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (PROFILE_ID_HEADER.encode("latin-1"), str(session.profile.id).encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile = profiler.finish(session, (time.perf_counter() - start) * 1000, status_code)
+            logger.info(
+                f"Profile {profile.id} recorded for {profile.method} {profile.path}: "
+                f"{profile.duration_ms:.1f}ms, {profile.sample_count} samples"
+            )
+
+
+_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Profiler:
+    global _profiler
+    if _profiler is None:
+        settings = get_settings()
+        _profiler = Profiler(
+            interval_ms=settings.profiling_interval_ms,
+            buffer_size=settings.profiling_buffer_size,
+        )
+    return _profiler
@@ -0,0 +1,82 @@
+"""
+Projection Service.
+Sparse fieldsets: reduce response objects to the fields a client asked for.
+
+A field list such as "id,name,wait_time.time" is parsed into a field tree and
+compiled into a projection function once per distinct field set. Nested
+paths descend into objects; lists are projected element-wise.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable
+
+from services.listing import InvalidQueryError
+
+PROJECTION_CACHE_SIZE = 256
+
+Projection = Callable[[Any], Any]
+
+
+def _parse(fields: str) -> tuple[tuple[str, ...], ...]:
+    paths = set()
+    for field in fields.split(","):
+        field = field.strip()
+        if not field:
+            continue
+        parts = tuple(part.strip() for part in field.split("."))
+        if not all(parts):
+            raise InvalidQueryError(f"Invalid field: {field}")
+        paths.add(parts)
+    if not paths:
+        raise InvalidQueryError("No fields given")
+    return tuple(sorted(paths))
+
+
+def _tree(paths: tuple[tuple[str, ...], ...]) -> dict:
+    """Field tree: key -> subtree, or None for the whole value."""
+    tree: dict = {}
+    for path in paths:  # sorted, so "a" comes before "a.b"
+        node = tree
+        for part in path[:-1]:
+            if part in node and node[part] is None:
+                break  # parent already selected completely
+            node = node.setdefault(part, {})
+        else:
+            node[path[-1]] = None
+    return tree
+
+
+def _compile(tree: dict) -> Projection:
+    subs = {key: _compile(sub) if sub is not None else None for key, sub in tree.items()}
+
+    def project(value: Any) -> Any:
+        if isinstance(value, list):
+            return [project(v) for v in value]
+        if not isinstance(value, dict):
+            return value
+        # Iterate the value, not the field list, to keep the response field order
+        result = {}
+        for key, v in value.items():
+            if key in subs:
+                sub = subs[key]
+                result[key] = sub(v) if sub is not None and v is not None else v
+        return result
+
+    return project
+
+
+@lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def _compile_paths(paths: tuple[tuple[str, ...], ...]) -> Projection:
+    return _compile(_tree(paths))
+
+
+def compile_projection(fields: str) -> Projection:
+    """
+    Projection for a comma-separated field list ("id,name,wait_time.time").
+    Equal field sets (in any order) return the same projection object.
+    Unknown fields are omitted from the result.
+
+    Raises:
+        InvalidQueryError: Empty field list or empty path segment
+    """
+    return _compile_paths(_parse(fields))
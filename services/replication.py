@@ -0,0 +1,243 @@
+"""
+Replication Service.
+Read replicas that follow a primary instance instead of the upstream API.
+
+A replica (REPLICA_OF set) never authenticates with the upstream API. It
+pulls changes from the primary's internal endpoint every few seconds:
+partitions with a generation newer than the last one it applied, plus the
+list of all partition keys so removed partitions (evicted languages) are
+removed on the replica too. Generations are only comparable within one
+primary process (its epoch); after a primary restart the replica gets a
+full export. Responses are gzip-compressed.
+
+A primary can additionally push changes to its replicas right after every
+refresh (REPLICA_PUSH_URLS). Pushes that do not continue the replica's
+state make it pull instead, so pushes and pulls can race safely.
+
+Replica lag is the time since the replica last confirmed it has the
+primary's newest generation; it is reported in /health.
+"""
+
+import asyncio
+import hmac
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+
+import httpx
+from fastapi import Header, HTTPException
+
+from config import get_settings
+from services.cache import get_cache_service
+from services.metrics import replica_lag_seconds, replication_syncs_total
+
+logger = logging.getLogger(__name__)
+
+REPLICATION_TOKEN_HEADER = "X-Replication-Token"
+REPLICATION_PATH = "/internal/replication"
+
+
+def is_valid_replication_token(token: Optional[str]) -> bool:
+    """True if replication is configured and the token matches."""
+    expected = get_settings().replication_token
+    if not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))
+
+
+async def require_replication_token(x_replication_token: Optional[str] = Header(default=None)) -> None:
+    """FastAPI dependency guarding the internal replication endpoints."""
+    if not get_settings().replication_token:
+        raise HTTPException(status_code=404, detail="Replication disabled")
+    if not is_valid_replication_token(x_replication_token):
+        raise HTTPException(status_code=403, detail="Invalid replication token")
+
+
+async def require_upstream() -> None:
+    """FastAPI dependency for routes calling the upstream API (not available on replicas)."""
+    if get_settings().is_replica:
+        raise HTTPException(status_code=503, detail="Upstream data is not available on replicas")
+
+
+class ReplicaFollower:
+    """Keeps the local cache in sync with a primary instance."""
+
+    def __init__(self, primary_url: str, token: Optional[str], interval: float, max_lag: float):
+        self.primary_url = primary_url.rstrip("/")
+        self.token = token
+        self.interval = max(0.5, interval)
+        self.max_lag = max_lag
+        self.epoch: Optional[str] = None
+        self.generation = 0
+        self.last_sync: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._synced_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        replica_lag_seconds.set_function(self.lag_seconds)
+
+    def lag_seconds(self) -> Optional[float]:
+        """Seconds since the replica last had the primary's newest generation (None before the first sync)."""
+        if self._synced_at is None:
+            return None
+        return time.monotonic() - self._synced_at
+
+    async def _apply(self, changes: dict) -> None:
+        removed = await get_cache_service().apply_changes(changes["partitions"], changes["keys"])
+        if changes["partitions"] or removed:
+            logger.info(
+                f"Replicated generation {changes['generation']} from {self.primary_url}: "
+                f"{len(changes['partitions'])} partitions updated, {len(removed)} removed."
+            )
+        self.epoch = changes["epoch"]
+        self.generation = changes["generation"]
+        self._synced_at = time.monotonic()
+        self.last_sync = datetime.now()
+        self.last_error = None
+
+    async def pull(self) -> bool:
+        """Fetches and applies the changes since the last applied generation."""
+        async with self._lock:
+            headers = {REPLICATION_TOKEN_HEADER: self.token} if self.token else {}
+            params = {"since": self.generation, "epoch": self.epoch or ""}
+            try:
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    response = await client.get(f"{self.primary_url}{REPLICATION_PATH}", params=params, headers=headers)
+                    response.raise_for_status()
+                    await self._apply(response.json())
+            except Exception as e:
+                self.last_error = str(e) or type(e).__name__
+                replication_syncs_total.labels("pull", "failure").inc()
+                logger.warning(f"Replication from {self.primary_url} failed: {self.last_error}")
+                return False
+        replication_syncs_total.labels("pull", "success").inc()
+        return True
+
+    async def receive(self, changes: dict) -> bool:
+        """
+        Applies pushed changes if they continue the local state (or are a full export).
+        Otherwise a pull is triggered and False returned.
+        """
+        async with self._lock:
+            same_epoch = changes["epoch"] == self.epoch
+            if same_epoch and changes["generation"] <= self.generation:
+                return True
+            if changes["since"] == 0 or (same_epoch and changes["since"] <= self.generation):
+                await self._apply(changes)
+                replication_syncs_total.labels("push", "success").inc()
+                return True
+        replication_syncs_total.labels("push", "gap").inc()
+        self._wakeup.set()
+        return False
+
+    async def _run(self) -> None:
+        while True:
+            await self.pull()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Replica mode: following {self.primary_url} every {self.interval:g}s.")
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def get_status(self) -> dict:
+        lag = self.lag_seconds()
+        return {
+            "healthy": lag is not None and lag <= self.max_lag,
+            "primary": self.primary_url,
+            "epoch": self.epoch,
+            "generation": self.generation,
+            "last_sync": self.last_sync.isoformat() if self.last_sync else None,
+            "lag_seconds": round(lag, 3) if lag is not None else None,
+            "last_error": self.last_error,
+        }
+
+
+class ReplicationPublisher:
+    """Pushes new generations of a primary to its replicas (one push in flight per replica)."""
+
+    def __init__(self, urls: list[str], token: Optional[str]):
+        self.urls = [url.rstrip("/") for url in urls]
+        self.token = token
+        # Replica URL -> (epoch, generation) of the last acknowledged push
+        self._cursors: dict[str, tuple[Optional[str], int]] = {url: (None, 0) for url in self.urls}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._pending: set[str] = set()
+
+    def notify(self, partitions: list[str]) -> None:
+        """Publish listener: schedules a push to every replica."""
+        for url in self.urls:
+            if url in self._tasks:
+                self._pending.add(url)
+                continue
+            task = asyncio.create_task(self._push(url))
+            self._tasks[url] = task
+            task.add_done_callback(lambda _, url=url: self._tasks.pop(url, None))
+
+    async def _push(self, url: str) -> None:
+        headers = {REPLICATION_TOKEN_HEADER: self.token} if self.token else {}
+        while True:
+            self._pending.discard(url)
+            epoch, since = self._cursors[url]
+            changes = await get_cache_service().export_changes(since, epoch)
+            try:
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    response = await client.post(f"{url}{REPLICATION_PATH}", json=changes, headers=headers)
+                    response.raise_for_status()
+                self._cursors[url] = (changes["epoch"], changes["generation"])
+                replication_syncs_total.labels("push_out", "success").inc()
+            except Exception as e:
+                replication_syncs_total.labels("push_out", "failure").inc()
+                logger.warning(f"Push to replica {url} failed: {str(e) or type(e).__name__}")
+            if url not in self._pending:
+                return
+
+
+_follower: Optional[ReplicaFollower] = None
+_publisher: Optional[ReplicationPublisher] = None
+
+
+def get_replica_follower() -> Optional[ReplicaFollower]:
+    """Returns the ReplicaFollower singleton (None if this instance is a primary)."""
+    global _follower
+    settings = get_settings()
+    if _follower is None and settings.is_replica:
+        _follower = ReplicaFollower(
+            settings.replica_of,
+            settings.replication_token,
+            settings.replica_poll_interval,
+            settings.replica_max_lag,
+        )
+    return _follower
+
+
+def start_replication() -> None:
+    """Replica: starts following the primary. Primary: pushes to the configured replicas."""
+    global _publisher
+    settings = get_settings()
+    follower = get_replica_follower()
+    if follower is not None:
+        follower.start()
+        return
+
+    urls = [url.strip() for url in settings.replica_push_urls.split(",") if url.strip()]
+    if urls and _publisher is None:
+        _publisher = ReplicationPublisher(urls, settings.replication_token)
+        get_cache_service().add_publish_listener(_publisher.notify)
+        logger.info(f"Pushing new generations to {len(urls)} replica(s).")
+
+
+def stop_replication() -> None:
+    if _follower is not None:
+        _follower.stop()
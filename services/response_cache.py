@@ -0,0 +1,287 @@
+"""
+Response Cache Service.
+Caches complete GET responses until the data they were built from changes.
+
+While a request is handled, CacheService records every cache partition the
+handler reads together with its generation (`track_reads`). A successful
+response is stored with these reads and served again for the same request
+key as long as none of the partitions has been refreshed since, so new
+routes are cached without any code in the router. Responses that read no
+cached data (raw upstream proxies, health) are never stored.
+
+Protected routes are never looked up or stored: a hit is served before the
+route's dependencies run, so it would skip their authorization checks. This
+covers the /admin, /internal and /webhooks paths (also under a park prefix)
+and every request carrying credentials (X-Admin-Token, X-Replication-Token,
+Authorization).
+
+The request key is method, path (including the park prefix), query string
+(parameters sorted by name, `lang` left out), content language and whether
+the client accepts gzip. Requests with If-None-Match are passed through so
+the route can answer 304. Routes whose output also depends on the current
+time opt out with the `no_response_cache` dependency.
+
+Memory is bounded by the total size of the stored responses, least recently
+used first out.
+
+The middleware also adds the CDN caching headers (see services.cdn) to
+every GET response, including hits: they are derived from the same reads.
+"""
+
+import logging
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import get_settings
+from services.cache import get_cache_service
+from services.cdn import cdn_headers, collect_surrogate_keys
+from services.language import get_language
+from services.metrics import response_cache_bytes, response_cache_entries, response_cache_requests_total
+from services.parks import split_park_path
+
+logger = logging.getLogger(__name__)
+
+CACHE_STATUS_HEADER = b"x-cache"
+
+# Routes behind an authorization dependency and headers carrying credentials
+PRIVATE_PREFIXES = ("/admin", "/internal", "/webhooks")
+CREDENTIAL_HEADERS = frozenset((b"x-admin-token", b"x-replication-token", b"authorization"))
+
+# Fixed per-entry overhead added to the body size (key, headers, bookkeeping)
+_ENTRY_OVERHEAD = 512
+
+
+class CachedResponse:
+    """A stored response and the cache partitions it was built from."""
+
+    __slots__ = ("status", "headers", "body", "reads", "route", "surrogate_keys", "size")
+
+    def __init__(
+        self, status: int, headers: list, body: bytes, reads: dict[str, int], route, surrogate_keys: set[str]
+    ):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.reads = reads
+        self.route = route
+        self.surrogate_keys = surrogate_keys
+        self.size = len(body) + _ENTRY_OVERHEAD
+
+
+class ResponseCache:
+    """
+    LRU store of responses, bounded by total size.
+
+    Args:
+        max_bytes: Total size of all stored responses (0 disables the cache)
+        max_entry_bytes: Responses larger than this are not stored
+    """
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int):
+        self.max_bytes = max(0, max_bytes)
+        self.max_entry_bytes = min(max(0, max_entry_bytes), self.max_bytes)
+        self.enabled = self.max_bytes > 0
+        self._entries: OrderedDict[tuple, CachedResponse] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+        response_cache_entries.set_function(lambda: len(self._entries))
+        response_cache_bytes.set_function(lambda: self.bytes)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[CachedResponse]:
+        """Stored response for `key` if all data it was built from is still current."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not get_cache_service().is_current(entry.reads):
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: tuple, entry: CachedResponse) -> None:
+        if entry.size > self.max_entry_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self.bytes += entry.size
+        while self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: tuple) -> None:
+        self.bytes -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def record(self, result: str) -> None:
+        """Counts a request by result (hit, miss or bypass)."""
+        if result == "hit":
+            self.hits += 1
+        elif result == "miss":
+            self.misses += 1
+        else:
+            self.bypasses += 1
+        response_cache_requests_total.labels(result).inc()
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class _RequestState:
+    __slots__ = ("cacheable",)
+
+    def __init__(self):
+        self.cacheable = True
+
+
+_request_state: ContextVar[Optional[_RequestState]] = ContextVar("response_cache_request", default=None)
+
+
+async def no_response_cache() -> None:
+    """Route dependency: the response depends on more than the cached data (e.g. the current time)."""
+    state = _request_state.get()
+    if state is not None:
+        state.cacheable = False
+
+
+def _is_private(path: str) -> bool:
+    path = split_park_path(path)[1]
+    return any(path == prefix or path.startswith(prefix + "/") for prefix in PRIVATE_PREFIXES)
+
+
+def _request_key(scope: Scope) -> Optional[tuple]:
+    """Cache key of a request; None if it must not be served from the cache."""
+    if _is_private(scope["path"]):
+        return None
+    gzip = False
+    for name, value in scope["headers"]:
+        if name == b"if-none-match" or name in CREDENTIAL_HEADERS:
+            return None
+        if name == b"accept-encoding" and b"gzip" in value.lower():
+            gzip = True
+
+    query = scope.get("query_string", b"")
+    if query:
+        # Sorted by name only (stable), so repeated parameters keep their order
+        params = sorted(
+            ((name, value) for name, value in parse_qsl(query.decode("latin-1"), keep_blank_values=True)
+             if name != "lang"),
+            key=lambda param: param[0],
+        )
+        query = urlencode(params)
+    return scope["method"], scope["path"], query or "", get_language(), gzip
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware serving GET responses from the response cache.
+    Must run inside LanguageMiddleware, which resolves the content language.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        cache = get_response_cache()
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        key = None
+        if cache.enabled:
+            key = _request_key(scope)
+            if key is None:
+                cache.record("bypass")
+
+        entry = cache.get(key) if key is not None else None
+        if entry is not None:
+            cache.record("hit")
+            if entry.route is not None:
+                scope["route"] = entry.route
+            # CDN headers are computed per response: max-age and Expires count down to the next refresh
+            extra = cdn_headers(entry.status, entry.headers, entry.reads, True, entry.surrogate_keys)
+            await send({
+                "type": "http.response.start",
+                "status": entry.status,
+                "headers": entry.headers + extra + [(CACHE_STATUS_HEADER, b"HIT")],
+            })
+            await send({"type": "http.response.body", "body": entry.body})
+            return
+
+        status = 0
+        headers: list = []
+        chunks: list[bytes] = []
+        size = 0
+        capture = key is not None
+        state = _RequestState()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, headers, size, capture
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                capture = capture and status == 200 and not any(
+                    name == b"cache-control" and b"no-store" in value.lower() for name, value in headers
+                )
+                extra = cdn_headers(status, headers, reads, state.cacheable, surrogate_keys)
+                if key is not None:
+                    extra.append((CACHE_STATUS_HEADER, b"MISS"))
+                message = {**message, "headers": headers + extra}
+            elif message["type"] == "http.response.body" and capture:
+                body = message.get("body", b"")
+                size += len(body)
+                if size > cache.max_entry_bytes:
+                    capture = False
+                    chunks.clear()
+                else:
+                    chunks.append(body)
+            await send(message)
+
+        token = _request_state.set(state)
+        try:
+            with get_cache_service().track_reads() as reads, collect_surrogate_keys() as surrogate_keys:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_state.reset(token)
+
+        if key is None:
+            return
+        if capture and state.cacheable and reads:
+            cache.put(key, CachedResponse(status, headers, b"".join(chunks), reads, scope.get("route"), surrogate_keys))
+            cache.record("miss")
+        else:
+            cache.record("bypass")
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Returns the singleton ResponseCache."""
+    global _response_cache
+    if _response_cache is None:
+        settings = get_settings()
+        _response_cache = ResponseCache(settings.response_cache_max_bytes, settings.response_cache_max_entry_bytes)
+    return _response_cache
@@ -1,86 +1,498 @@
 """
 Scheduler Service für periodische Tasks.
-Führt den täglichen Firebase Health-Check durch.
+
+Ein Scheduler führt alle Hintergrundaufgaben aus (Cache-Aktualisierung,
+Token-Erneuerung, täglicher Firebase Health-Check):
+
+- Zeitpläne als Intervall (Sekunden) oder Cron-Ausdruck (5 Felder), mit Jitter
+- Verpasste Ausführungen (Prozess blockiert, Aufgabe läuft noch) werden
+  einmal nachgeholt statt mehrfach oder gar nicht; Aufgaben ohne `catch_up`
+  lassen eine Ausführung aus, die mehr als `misfire_grace` Sekunden zu spät ist
+- Jede Aufgabe läuft höchstens einmal gleichzeitig; "Jetzt ausführen" teilt
+  sich eine laufende Ausführung und wird kurz nach einer Ausführung entprellt
+- Upstream-Requests laufen über einen gemeinsamen Limiter: begrenzte
+  Parallelität, Wartende nach Priorität, reservierte Plätze für hohe
+  Priorität (Wartezeiten warten nie hinter einem langsamen POI-Abruf)
+
+Zeitpläne lassen sich per JOB_SCHEDULES überschreiben,
+z.B. "waittimes=120;pois=0 4 * * *".
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
-from datetime import datetime, time, timedelta
-from typing import Optional
+import random
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable, Optional, Union
+
+from config import get_settings
+from services.metrics import (
+    scheduler_job_duration_seconds,
+    scheduler_job_runs_total,
+    upstream_queue_wait_seconds,
+    upstream_slots_in_use,
+)
 
 logger = logging.getLogger(__name__)
 
-_scheduler_task: Optional[asyncio.Task] = None
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_NORMAL: "normal", PRIORITY_LOW: "low"}
+
+# Priorität der laufenden Aufgabe; Requests außerhalb des Schedulers laufen mit normaler Priorität
+current_priority: ContextVar[int] = ContextVar("task_priority", default=PRIORITY_NORMAL)
+
+# Obergrenze beim Durchzählen verpasster Ausführungen
+MAX_MISSED_COUNT = 10000
+
+
+@dataclass(frozen=True)
+class IntervalSpec:
+    """Ausführung alle `seconds` Sekunden."""
+    seconds: float
+
+    def next_after(self, previous: datetime) -> datetime:
+        return previous + timedelta(seconds=self.seconds)
+
+    def __str__(self) -> str:
+        return f"every {self.seconds:g}s"
 
 
-def _calculate_next_run(target_time: time) -> datetime:
-    """Berechnet den nächsten Ausführungszeitpunkt."""
-    now = datetime.now()
-    next_run = datetime.combine(now.date(), target_time)
-    
-    if now.time() >= target_time:
-        next_run += timedelta(days=1)
-    
-    return next_run
+def _parse_cron_field(value: str, low: int, high: int) -> frozenset[int]:
+    values: set[int] = set()
+    for part in value.split(","):
+        expression, _, step = part.partition("/")
+        if expression == "*":
+            start, end = low, high
+        elif "-" in expression:
+            start, end = (int(v) for v in expression.split("-", 1))
+        else:
+            start = end = int(expression)
+        if step:
+            if int(step) <= 0:
+                raise ValueError(f"Ungültige Schrittweite: {part}")
+            if expression != "*" and "-" not in expression:
+                end = high
+        if start < low or end > high or start > end:
+            raise ValueError(f"Wert außerhalb von {low}-{high}: {part}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return frozenset(values)
 
 
-async def daily_health_check_loop():
+class CronSpec:
     """
-    Endlosschleife die den täglichen Health-Check durchführt.
-    Läuft jeden Tag um 03:00 Uhr.
+    Cron-Ausdruck mit 5 Feldern (Minute Stunde Tag Monat Wochentag, 0 und 7 = Sonntag).
+    Unterstützt *, Listen, Bereiche und Schrittweiten. Sind Tag und Wochentag
+    beide eingeschränkt, genügt einer der beiden (wie bei cron).
     """
-    from services.firebase_health import check_and_refresh_secrets
-    
-    target_time = time(hour=3, minute=0, second=0)
-    
-    while True:
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron-Ausdruck braucht 5 Felder: {expression}")
+        self.expression = " ".join(fields)
+        self.minutes = _parse_cron_field(fields[0], 0, 59)
+        self.hours = _parse_cron_field(fields[1], 0, 23)
+        self.days = _parse_cron_field(fields[2], 1, 31)
+        self.months = _parse_cron_field(fields[3], 1, 12)
+        self.weekdays = frozenset(d % 7 for d in _parse_cron_field(fields[4], 0, 7))
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, day: datetime) -> bool:
+        if day.month not in self.months:
+            return False
+        day_match = day.day in self.days
+        weekday_match = (day.isoweekday() % 7) in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_match and weekday_match
+        return day_match or weekday_match
+
+    def next_after(self, previous: datetime) -> datetime:
+        """Nächster passender Zeitpunkt echt nach `previous` (minutengenau)."""
+        start = previous.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        for _ in range(366 * 8):
+            if self._day_matches(day):
+                for hour in sorted(self.hours):
+                    for minute in sorted(self.minutes):
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate >= start:
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Cron-Ausdruck trifft nie zu: {self.expression}")
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CronSpec) and other.expression == self.expression
+
+    def __str__(self) -> str:
+        return self.expression
+
+
+Schedule = Union[IntervalSpec, CronSpec]
+
+
+def parse_schedule(value: str) -> Schedule:
+    """Sekunden ("300") als Intervall, sonst Cron-Ausdruck ("0 3 * * *")."""
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        return CronSpec(value)
+    if seconds <= 0:
+        raise ValueError(f"Intervall muss positiv sein: {value}")
+    return IntervalSpec(seconds)
+
+
+def parse_schedule_overrides(value: str) -> dict[str, Schedule]:
+    """Parst "job=spec;job=spec" (ungültige Einträge werden ignoriert)."""
+    overrides = {}
+    for part in value.split(";"):
+        name, _, spec = part.partition("=")
+        if not name.strip() or not spec.strip():
+            continue
         try:
-            next_run = _calculate_next_run(target_time)
-            sleep_seconds = (next_run - datetime.now()).total_seconds()
-            
-            logger.info(
-                f"Nächster Health-Check geplant für {next_run.isoformat()}. "
-                f"Warte {sleep_seconds / 3600:.2f} Stunden."
-            )
-            
-            await asyncio.sleep(sleep_seconds)
-            
-            logger.info("Starte geplanten täglichen Health-Check...")
-            status, secrets_refreshed = await check_and_refresh_secrets()
-            
-            if status.is_healthy:
-                logger.info("Täglicher Health-Check erfolgreich.")
-            else:
-                logger.warning(f"Täglicher Health-Check fehlgeschlagen: {status.last_error}")
-            
-            if secrets_refreshed:
-                logger.info("Secrets wurden während des Health-Checks aktualisiert.")
-                
+            overrides[name.strip()] = parse_schedule(spec)
+        except ValueError as e:
+            logger.warning(f"Ignoriere Zeitplan {part.strip()}: {e}")
+    return overrides
+
+
+class UpstreamLimiter:
+    """
+    Begrenzt gleichzeitige Upstream-Requests. Wartende werden nach Priorität
+    (dann in Ankunftsreihenfolge) bedient; `reserved` Plätze bleiben Aufgaben
+    mit hoher Priorität vorbehalten.
+    """
+
+    def __init__(self, limit: int, reserved: int = 0):
+        self.limit = max(1, limit)
+        self.reserved = min(max(0, reserved), self.limit - 1)
+        self.in_use = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        upstream_slots_in_use.set_function(lambda: self.in_use)
+
+    def _capacity(self, priority: int) -> int:
+        return self.limit if priority <= PRIORITY_HIGH else self.limit - self.reserved
+
+    def _grant(self) -> None:
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.in_use >= self._capacity(priority):
+                return
+            heapq.heappop(self._waiters)
+            self.in_use += 1
+            future.set_result(None)
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._grant()
+        try:
+            await future
         except asyncio.CancelledError:
-            logger.info("Scheduler wird beendet...")
-            break
+            if future.done() and not future.cancelled():
+                # Platz bereits zugeteilt, aber nicht mehr benötigt
+                self.release()
+            else:
+                future.cancel()
+            raise
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._grant()
+
+    def get_status(self) -> dict:
+        return {
+            "limit": self.limit,
+            "reserved_high_priority": self.reserved,
+            "in_use": self.in_use,
+            "waiting": sum(1 for _, _, future in self._waiters if not future.done()),
+        }
+
+
+@dataclass
+class Job:
+    """Eine geplante Aufgabe und ihr Laufzeitzustand."""
+    name: str
+    func: Callable[[], Awaitable[object]]
+    schedule: Schedule
+    priority: int = PRIORITY_NORMAL
+    jitter: float = 0.0
+    # Verspätete Ausführung nachholen; sonst nur innerhalb von misfire_grace Sekunden
+    catch_up: bool = True
+    misfire_grace: float = 60.0
+
+    scheduled: Optional[datetime] = None  # Planzeitpunkt ohne Jitter
+    next_run: Optional[datetime] = None
+    last_run: Optional[datetime] = None
+    last_duration: Optional[float] = None
+    last_success: Optional[datetime] = None
+    last_error: Optional[str] = None
+    runs: int = 0
+    failures: int = 0
+    missed: int = 0
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    finished_at: Optional[float] = None  # time.monotonic()
+    pending: bool = False
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def plan(self, scheduled: datetime) -> None:
+        self.scheduled = scheduled
+        self.next_run = scheduled + timedelta(seconds=random.uniform(0, self.jitter) if self.jitter else 0)
+
+    def get_status(self) -> dict:
+        return {
+            "name": self.name,
+            "schedule": str(self.schedule),
+            "priority": PRIORITY_NAMES.get(self.priority, self.priority),
+            "running": self.running,
+            "next_run": self.next_run.isoformat() if self.next_run else None,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_duration_ms": round(self.last_duration * 1000, 1) if self.last_duration is not None else None,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "last_error": self.last_error,
+            "runs": self.runs,
+            "failures": self.failures,
+            "missed": self.missed,
+        }
+
+
+class Scheduler:
+    """Führt registrierte Aufgaben nach Zeitplan oder auf Anforderung aus."""
+
+    def __init__(
+        self,
+        upstream_concurrency: int = 4,
+        upstream_reserved: int = 1,
+        debounce_seconds: float = 30.0,
+        overrides: Optional[dict[str, Schedule]] = None
+    ):
+        self.limiter = UpstreamLimiter(upstream_concurrency, upstream_reserved)
+        self.debounce_seconds = debounce_seconds
+        self.overrides = overrides or {}
+        self._jobs: dict[str, Job] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[object]],
+        schedule: Schedule,
+        run_at_start: bool = False,
+        **options
+    ) -> Job:
+        """Registriert eine Aufgabe (idempotent je Name); `run_at_start` führt sie sofort aus."""
+        if name in self._jobs:
+            return self._jobs[name]
+        job = Job(name, func, self.overrides.get(name, schedule), **options)
+        now = datetime.now()
+        if run_at_start:
+            job.scheduled = job.next_run = now
+        else:
+            job.plan(job.schedule.next_after(now))
+        self._jobs[name] = job
+        self._wakeup.set()
+        return job
+
+    def remove_job(self, name: str) -> None:
+        job = self._jobs.pop(name, None)
+        if job is not None and job.task is not None:
+            job.task.cancel()
+
+    def get_job(self, name: str) -> Optional[Job]:
+        return self._jobs.get(name)
+
+    def next_run(self, name: str) -> Optional[datetime]:
+        """Nächste geplante Ausführung einer Aufgabe (None, wenn nicht registriert)."""
+        job = self._jobs.get(name)
+        return job.next_run if job else None
+
+    def _start(self, job: Job) -> None:
+        job.task = asyncio.create_task(self._execute(job))
+
+    async def _execute(self, job: Job) -> None:
+        current_priority.set(job.priority)
+        job.last_run = datetime.now()
+        start = time.perf_counter()
+        try:
+            await job.func()
+            job.last_success = datetime.now()
+            job.last_error = None
+            scheduler_job_runs_total.labels(job.name, "success").inc()
         except Exception as e:
-            logger.error(f"Fehler im Scheduler: {e}")
-            await asyncio.sleep(3600)
+            job.failures += 1
+            job.last_error = str(e) or type(e).__name__
+            scheduler_job_runs_total.labels(job.name, "failure").inc()
+            logger.error(f"Aufgabe {job.name} fehlgeschlagen: {job.last_error}")
+        finally:
+            job.runs += 1
+            job.last_duration = time.perf_counter() - start
+            job.finished_at = time.monotonic()
+            scheduler_job_duration_seconds.labels(job.name).observe(job.last_duration)
+            if job.pending and self._jobs.get(job.name) is job:
+                # Während der Ausführung fällig geworden: einmal nachholen
+                job.pending = False
+                job.next_run = datetime.now()
+                self._wakeup.set()
+
+    def _due(self, job: Job, now: datetime) -> None:
+        late = (now - job.next_run).total_seconds()
+        scheduled = job.schedule.next_after(job.scheduled or now)
+        missed = 0
+        while scheduled <= now and missed < MAX_MISSED_COUNT:
+            missed += 1
+            scheduled = job.schedule.next_after(scheduled)
+        job.plan(scheduled)
+
+        if job.running:
+            job.missed += 1
+            scheduler_job_runs_total.labels(job.name, "skipped").inc()
+            job.pending = job.catch_up
+            return
+        if missed:
+            job.missed += missed
+            scheduler_job_runs_total.labels(job.name, "missed").inc(missed)
+            logger.warning(f"Aufgabe {job.name}: {missed} Ausführung(en) verpasst.")
+        if late > job.misfire_grace and not job.catch_up:
+            scheduler_job_runs_total.labels(job.name, "skipped").inc()
+            logger.warning(f"Aufgabe {job.name}: {late:.0f} s zu spät, ausgelassen bis {job.next_run:%Y-%m-%d %H:%M}.")
+            return
+        self._start(job)
+
+    async def _run(self) -> None:
+        while True:
+            now = datetime.now()
+            for job in list(self._jobs.values()):
+                if job.next_run is not None and job.next_run <= now:
+                    self._due(job, now)
+
+            upcoming = [job.next_run for job in self._jobs.values() if job.next_run is not None]
+            timeout = max(0.0, (min(upcoming) - datetime.now()).total_seconds()) if upcoming else 3600.0
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_now(self, name: str, wait: bool = False) -> dict:
+        """
+        Führt eine Aufgabe sofort aus (Zeitplan bleibt unverändert).
+        Läuft sie bereits, wird die laufende Ausführung geteilt; kurz nach einer
+        Ausführung (debounce_seconds) wird nicht erneut ausgeführt.
+
+        Raises:
+            KeyError: Unbekannte Aufgabe
+        """
+        job = self._jobs[name]
+        if job.running:
+            status = "running"
+        elif job.finished_at is not None and time.monotonic() - job.finished_at < self.debounce_seconds:
+            status = "debounced"
+        else:
+            self._start(job)
+            status = "started"
+
+        if wait and job.task is not None:
+            await asyncio.shield(job.task)
+        return {"status": status, "job": job.get_status()}
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info("Scheduler gestartet.")
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for job in self._jobs.values():
+            if job.task is not None:
+                job.task.cancel()
+        logger.info("Scheduler gestoppt.")
+
+    def get_status(self) -> dict:
+        jobs = sorted(self._jobs.values(), key=lambda job: (job.priority, job.name))
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "count": len(jobs),
+            "jobs": [job.get_status() for job in jobs],
+            "upstream": self.limiter.get_status(),
+        }
+
+
+_scheduler: Optional[Scheduler] = None
+
+
+def get_scheduler() -> Scheduler:
+    """Gibt die Scheduler-Instanz zurück."""
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = Scheduler(
+            settings.upstream_max_concurrency,
+            settings.upstream_reserved_slots,
+            settings.refresh_debounce_seconds,
+            parse_schedule_overrides(settings.job_schedules),
+        )
+    return _scheduler
+
+
+@asynccontextmanager
+async def upstream_slot() -> AsyncIterator[None]:
+    """Belegt einen Upstream-Platz mit der Priorität der laufenden Aufgabe."""
+    limiter = get_scheduler().limiter
+    priority = current_priority.get()
+    start = time.perf_counter()
+    await limiter.acquire(priority)
+    upstream_queue_wait_seconds.labels(PRIORITY_NAMES.get(priority, str(priority))).observe(time.perf_counter() - start)
+    try:
+        yield
+    finally:
+        limiter.release()
+
+
+async def daily_health_check() -> None:
+    """Täglicher Firebase Health-Check (aktualisiert bei Bedarf die Secrets)."""
+    from services.firebase_health import check_and_refresh_secrets
+
+    logger.info("Starte geplanten täglichen Health-Check...")
+    status, secrets_refreshed = await check_and_refresh_secrets()
+
+    if secrets_refreshed:
+        logger.info("Secrets wurden während des Health-Checks aktualisiert.")
+
+    if not status.is_healthy:
+        logger.warning(f"Täglicher Health-Check fehlgeschlagen: {status.last_error}")
+        raise RuntimeError(status.last_error or "Firebase Health-Check fehlgeschlagen")
+    logger.info("Täglicher Health-Check erfolgreich.")
 
 
 def start_scheduler():
-    """Startet den Scheduler als Background-Task."""
-    global _scheduler_task
-    
-    if _scheduler_task is not None and not _scheduler_task.done():
-        logger.warning("Scheduler läuft bereits.")
-        return
-    
-    _scheduler_task = asyncio.create_task(daily_health_check_loop())
-    logger.info("Scheduler gestartet.")
+    """Registriert den täglichen Health-Check (03:00 Uhr) und startet den Scheduler."""
+    scheduler = get_scheduler()
+    # Mehr als eine Stunde verpasst (z.B. Host pausiert): nicht tagsüber nachholen, sondern am nächsten Tag um 03:00
+    scheduler.add_job(
+        "firebase_health", daily_health_check, CronSpec("0 3 * * *"), catch_up=False, misfire_grace=3600.0
+    )
+    scheduler.start()
 
 
 def stop_scheduler():
-    """Stoppt den Scheduler."""
-    global _scheduler_task
-    
-    if _scheduler_task is not None:
-        _scheduler_task.cancel()
-        _scheduler_task = None
-        logger.info("Scheduler gestoppt.")
+    """Stoppt den Scheduler und laufende Aufgaben."""
+    if _scheduler is not None:
+        _scheduler.stop()
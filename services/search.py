@@ -0,0 +1,163 @@
+"""
+Search Service.
+Prefix-aware, accent-insensitive full-text search over POIs and shows.
+
+The inverted index is built once per POI refresh. Terms are normalized
+(Unicode decomposition without combining marks, casefolded), postings hold
+precomputed field-weighted scores, and a sorted term list allows prefix
+expansion by binary search, so a typeahead query only touches the postings
+of the matching terms.
+"""
+
+import heapq
+import logging
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Optional
+
+from services.cache import CACHE_KEYS
+from services.derived import DerivedData
+from services.pois import build_poi_search_documents
+from services.shows import build_show_search_documents
+
+logger = logging.getLogger(__name__)
+
+FIELD_WEIGHTS = {"name": 3.0, "description": 1.0}
+PREFIX_FACTOR = 0.6
+NAME_PREFIX_BONUS = 2.0
+MAX_PREFIX_EXPANSION = 200
+TOKEN_CACHE_SIZE = 1024
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, accent-free form of `text` (e.g. 'Glühwein' -> 'gluhwein')."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return stripped.casefold()
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    if not text:
+        return []
+    return _TOKEN_PATTERN.findall(normalize(text))
+
+
+class SearchIndex:
+    """Inverted index over search documents."""
+
+    def __init__(self, documents: list[dict]):
+        self.documents = documents
+        self.postings: dict[str, dict[int, float]] = {}
+        self.normalized_names: list[str] = []
+
+        for doc_index, doc in enumerate(documents):
+            self.normalized_names.append(" ".join(tokenize(doc["name"])))
+            for field, weight in FIELD_WEIGHTS.items():
+                tokens = tokenize(doc.get(field))
+                if not tokens:
+                    continue
+                # Saturating term frequency: repeated words count less than distinct ones
+                increment = weight / len(tokens) ** 0.5
+                for token in tokens:
+                    posting = self.postings.setdefault(token, {})
+                    posting[doc_index] = posting.get(doc_index, 0.0) + increment
+
+        self.terms = sorted(self.postings)
+        # Typeahead repeats the same prefixes ("g", "gl", "glu", ...)
+        self._token_cache: dict[str, dict[int, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _expand(self, token: str) -> list[str]:
+        """All indexed terms starting with `token` (bounded)."""
+        start = bisect_left(self.terms, token)
+        matches = []
+        for term in self.terms[start:start + MAX_PREFIX_EXPANSION]:
+            if not term.startswith(token):
+                break
+            matches.append(term)
+        return matches
+
+    def _token_scores(self, token: str) -> dict[int, float]:
+        cached = self._token_cache.get(token)
+        if cached is not None:
+            return cached
+
+        scores: dict[int, float] = {}
+        for term in self._expand(token):
+            factor = 1.0 if term == token else PREFIX_FACTOR
+            for doc_index, score in self.postings[term].items():
+                weighted = score * factor
+                if weighted > scores.get(doc_index, 0.0):
+                    scores[doc_index] = weighted
+
+        if len(self._token_cache) >= TOKEN_CACHE_SIZE:
+            self._token_cache.pop(next(iter(self._token_cache)))
+        self._token_cache[token] = scores
+        return scores
+
+    def search(self, query: str, types: Optional[set[str]] = None, limit: int = 20) -> list[tuple[float, dict]]:
+        """Documents matching every query token (as word prefix), best first."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        # Rarest token first keeps the intersection small
+        token_scores = sorted((self._token_scores(t) for t in dict.fromkeys(tokens)), key=len)
+        candidates = token_scores[0]
+        for scores in token_scores[1:]:
+            candidates = {
+                doc_index: score + scores[doc_index]
+                for doc_index, score in candidates.items()
+                if doc_index in scores
+            }
+            if not candidates:
+                return []
+
+        phrase = " ".join(tokens)
+        results = []
+        for doc_index, score in candidates.items():
+            doc = self.documents[doc_index]
+            if types and doc["type"] not in types:
+                continue
+            if self.normalized_names[doc_index].startswith(phrase):
+                score += NAME_PREFIX_BONUS
+            results.append((score, doc_index))
+
+        top = heapq.nsmallest(limit, results, key=lambda r: (-r[0], self.normalized_names[r[1]]))
+        return [(score, self.documents[doc_index]) for score, doc_index in top]
+
+
+def _build_search_index(pois_raw: Optional[dict]) -> SearchIndex:
+    documents = build_poi_search_documents(pois_raw) + build_show_search_documents(pois_raw)
+    index = SearchIndex(documents)
+    logger.info(f"Search index built: {len(documents)} documents, {len(index.terms)} terms.")
+    return index
+
+
+# Search index over POIs and shows, rebuilt once per POI refresh
+search_index = DerivedData("search_index", (CACHE_KEYS["pois"],), _build_search_index)
+
+
+async def search(query: str, types: Optional[set[str]] = None, limit: int = 20) -> Optional[list[dict]]:
+    """
+    Search POIs and shows by name and description.
+    Returns None if the POIs were never loaded; an index without documents gives [].
+    """
+    if not search_index.loaded():
+        return None
+    index = await search_index.get()
+
+    return [
+        {
+            "id": doc["id"],
+            "name": doc["name"],
+            "type": doc["type"],
+            "score": round(score, 3),
+        }
+        for score, doc in index.search(query, types, limit)
+    ]
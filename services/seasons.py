@@ -1,13 +1,14 @@
 """
 Seasons Service.
-Processes season data from cache (Europapark only).
+Processes season data from cache (partitioned by park).
 """
 
 from typing import Optional
 
 from pydantic import BaseModel
 
-from services.cache import get_cache_service, CACHE_KEYS
+from services.cache import CACHE_KEYS
+from services.derived import DerivedData
 
 
 class SeasonInfo(BaseModel):
@@ -21,22 +22,10 @@ class SeasonInfo(BaseModel):
     end: Optional[str] = None
 
 
-async def get_seasons() -> list[SeasonInfo]:
-    """Get all Europapark seasons."""
-    cache = get_cache_service()
-    data = await cache.load(CACHE_KEYS["seasons"])
-    
-    if not data or "data" not in data:
-        return []
-    
+def build_seasons(seasons_raw: Optional[list]) -> list[SeasonInfo]:
+    """Seasons of the park from its raw season data."""
     results = []
-    for season in data["data"]:
-        scopes = season.get("scopes", [])
-        
-        # Europapark only
-        if "europapark" not in scopes:
-            continue
-        
+    for season in seasons_raw or []:
         start = season.get("startAt")
         end = season.get("endAt")
         
@@ -56,3 +45,19 @@ async def get_seasons() -> list[SeasonInfo]:
         ))
     
     return results
+
+
+def _build_season_rows(seasons_raw: Optional[list]) -> list[dict]:
+    return [season.model_dump(mode="json", exclude_none=True) for season in build_seasons(seasons_raw)]
+
+
+# Rendered seasons, rebuilt once per season refresh
+season_rows = DerivedData("season_rows", (CACHE_KEYS["seasons"],), _build_season_rows)
+
+
+async def get_seasons() -> Optional[list[dict]]:
+    """Get all rendered seasons of the current park; None if the seasons were never loaded."""
+    entries = await season_rows.get()
+    if not entries and not season_rows.loaded():
+        return None
+    return entries
@@ -5,8 +5,11 @@ from typing import Optional
 
 from pydantic import BaseModel
 
-from services.cache import get_cache_service, CACHE_KEYS
-from services.showtimes import get_showtime_by_id, ShowTimeEntry
+from services.cache import CACHE_KEYS
+from services.derived import DerivedData, RenderedMap
+from services.listing import ColumnTable, Page, list_table
+from services.projection import Projection
+from services.showtimes import showtimes_by_id, ShowTimeEntry
 
 logger = logging.getLogger(__name__)
 
@@ -56,44 +59,35 @@ def extract_location(poi: dict) -> Optional[Location]:
     return None
 
 
-async def get_all_shows_from_pois() -> list[dict]:
-    """Get all shows from POI data."""
-    cache = get_cache_service()
-    pois_data = await cache.load(CACHE_KEYS["pois"])
-    
-    if not pois_data or "data" not in pois_data:
-        return []
-    
-    shows = []
-    for poi in pois_data["data"].get("pois", []):
-        scopes = poi.get("scopes", [])
-        if "europapark" not in scopes:
-            continue
-        
+def build_show_search_documents(pois_raw: Optional[dict]) -> list[dict]:
+    """Search documents (name, description) for all shows of the park."""
+    documents = []
+    for poi in (pois_raw or {}).get("pois", []):
         for show in poi.get("shows", []):
-            shows.append({"show": show, "location_poi": poi})
-    
-    return shows
-
-
-async def get_show_by_id(show_id: int) -> Optional[dict]:
-    """Get raw show data by ID."""
-    all_shows = await get_all_shows_from_pois()
-    for item in all_shows:
-        if item["show"].get("id") == show_id:
-            return item
-    return None
+            if show.get("id") is None:
+                continue
+            documents.append({
+                "id": show["id"],
+                "name": show.get("name", "Unknown"),
+                "description": show.get("excerpt"),
+                "type": "show",
+            })
+    return documents
+
+
+def _build_shows_by_id(pois_raw: Optional[dict]) -> dict[int, dict]:
+    by_id: dict[int, dict] = {}
+    for poi in (pois_raw or {}).get("pois", []):
+        for show in poi.get("shows", []):
+            if show.get("id") is not None:
+                by_id.setdefault(show["id"], {"show": show, "location_poi": poi})
+    return by_id
 
 
-async def get_show_info(show_id: int) -> Optional[ShowInfo]:
-    """Get full show details."""
-    item = await get_show_by_id(show_id)
-    if not item:
-        return None
-    
+def build_show_info(item: dict, showtimes: Optional[ShowTimeEntry]) -> ShowInfo:
+    """Full show details from a raw show item and its show times."""
     show = item["show"]
     location_poi = item["location_poi"]
-    showtimes = await get_showtime_by_id(show_id)
     
     return ShowInfo(
         id=show["id"],
@@ -108,22 +102,98 @@ async def get_show_info(show_id: int) -> Optional[ShowInfo]:
     )
 
 
-async def get_all_shows() -> list[ShowListItem]:
-    """Get all shows (compact list)."""
-    all_shows = await get_all_shows_from_pois()
+def render_show_info(item: dict) -> dict:
+    """Rendered show details without show times (joined per request)."""
+    return build_show_info(item, None).model_dump(mode="json", exclude_none=True)
+
+
+def _build_show_details(pois_raw: Optional[dict]) -> RenderedMap:
+    return RenderedMap(_build_shows_by_id(pois_raw), render_show_info)
+
+
+# Raw shows with their location POI by show ID, rendered on first access, rebuilt once per POI refresh
+shows_by_id = DerivedData("shows_by_id", (CACHE_KEYS["pois"],), _build_show_details)
+
+
+async def get_show_by_id(show_id: int) -> Optional[dict]:
+    """Get raw show data by ID."""
+    return (await shows_by_id.get()).raw.get(show_id)
+
+
+def _with_showtimes(info: dict, showtimes: Optional[dict]) -> dict:
+    return {**info, "showtimes": showtimes} if showtimes else info
+
+
+async def get_show_info(show_id: int) -> Optional[dict]:
+    """Get rendered full show details."""
+    info = (await shows_by_id.get()).get(show_id)
+    if not info:
+        return None
+    
+    showtimes = (await showtimes_by_id.get()).get(show_id)
+    return _with_showtimes(info, showtimes)
+
+
+async def get_show_infos(show_ids: list[int]) -> Optional[dict[int, dict]]:
+    """
+    Get rendered full details for several shows (unknown IDs are left out).
+    Returns None if the POIs were never loaded.
+    """
+    shows = await shows_by_id.get()
+    if not shows and not shows_by_id.loaded():
+        return None
     
+    showtimes = await showtimes_by_id.get()
+    return {
+        show_id: _with_showtimes(shows.get(show_id), showtimes.get(show_id))
+        for show_id in show_ids
+        if show_id in shows
+    }
+
+
+def build_show_list(pois_raw: Optional[dict]) -> list[ShowListItem]:
+    """All shows (compact list) from raw POI data."""
     results = []
-    for item in all_shows:
-        show = item["show"]
-        location_poi = item["location_poi"]
-        
-        results.append(ShowListItem(
-            id=show["id"],
-            name=show.get("name", "Unknown"),
-            type="show",
-            area_id=location_poi.get("areaId"),
-            location=extract_location(location_poi),
-            icon=show.get("icon", {}).get("small") if show.get("icon") else None
-        ))
+    for poi in (pois_raw or {}).get("pois", []):
+        for show in poi.get("shows", []):
+            results.append(ShowListItem(
+                id=show["id"],
+                name=show.get("name", "Unknown"),
+                type="show",
+                area_id=poi.get("areaId"),
+                location=extract_location(poi),
+                icon=show.get("icon", {}).get("small") if show.get("icon") else None
+            ))
     
     return results
+
+
+def _build_shows_table(pois_raw: Optional[dict]) -> ColumnTable:
+    return list_table([e.model_dump(exclude_none=True) for e in build_show_list(pois_raw)])
+
+
+# Show list table, rebuilt once per POI refresh
+shows_table = DerivedData("shows_table", (CACHE_KEYS["pois"],), _build_shows_table)
+
+
+async def query_shows(
+    area_ids: Optional[set[int]] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    projection: Optional[Projection] = None,
+) -> Optional[Page]:
+    """
+    Filtered, sorted page of shows.
+    Returns None if the POIs were never loaded.
+    """
+    table = await shows_table.get()
+    if not table and not shows_table.loaded():
+        return None
+    return table.query(
+        equals={"area_id": area_ids} if area_ids else None,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+        projection=projection,
+    )
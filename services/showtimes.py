@@ -4,14 +4,19 @@ Processes show times and links them with POI data.
 """
 
 import logging
+from datetime import date, datetime
 from typing import Optional
+from zoneinfo import ZoneInfo
 
 from pydantic import BaseModel
 
-from services.cache import get_cache_service, CACHE_KEYS
+from services.cache import CACHE_KEYS
+from services.derived import DerivedData
 
 logger = logging.getLogger(__name__)
 
+PARK_TIMEZONE = ZoneInfo("Europe/Berlin")
+
 
 class Location(BaseModel):
     """Location."""
@@ -28,25 +33,16 @@ class ShowTimeEntry(BaseModel):
     times_tomorrow: list[str]
 
 
-async def get_show_info_map() -> dict[int, dict]:
+def build_show_info_map(pois_raw: Optional[dict]) -> dict[int, dict]:
     """
-    Create a mapping from show ID to show information from POI data.
+    Create a mapping from show ID to show information from raw POI data.
     Shows are nested under showlocation POIs.
     """
-    cache = get_cache_service()
-    pois_data = await cache.load(CACHE_KEYS["pois"])
-    
-    if not pois_data or "data" not in pois_data:
+    if not pois_raw:
         return {}
     
     show_map = {}
-    for poi in pois_data["data"].get("pois", []):
-        scopes = poi.get("scopes", [])
-        
-        # Europapark only (no Rulantica)
-        if "europapark" not in scopes:
-            continue
-        
+    for poi in pois_raw.get("pois", []):
         shows = poi.get("shows", [])
         for show in shows:
             show_id = show.get("id")
@@ -60,18 +56,28 @@ async def get_show_info_map() -> dict[int, dict]:
     return show_map
 
 
-async def get_processed_showtimes() -> list[ShowTimeEntry]:
-    """Get processed show times with names and location."""
-    cache = get_cache_service()
-    
-    showtimes_data = await cache.load(CACHE_KEYS["showtimes"])
-    if not showtimes_data or "data" not in showtimes_data:
+def parse_show_time(value: str, day: date) -> Optional[datetime]:
+    """
+    Aware start time of a raw show time: ISO timestamp, or "HH:MM" on `day`.
+    Times without offset are park time. Returns None for unparseable values.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.combine(day, datetime.strptime(value, "%H:%M").time())
+        except (TypeError, ValueError):
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=PARK_TIMEZONE)
+
+
+def build_showtimes(showtimes_raw: Optional[list], show_map: dict[int, dict]) -> list[ShowTimeEntry]:
+    """Link raw show times with show names and locations."""
+    if not showtimes_raw:
         return []
     
-    show_map = await get_show_info_map()
-    
     results = []
-    for entry in showtimes_data["data"]:
+    for entry in showtimes_raw:
         show_id = entry.get("showId")
         
         show_info = show_map.get(show_id)
@@ -96,12 +102,55 @@ async def get_processed_showtimes() -> list[ShowTimeEntry]:
     return results
 
 
-async def get_showtime_by_id(show_id: int) -> Optional[ShowTimeEntry]:
-    """Get show times for a specific show."""
-    showtimes = await get_processed_showtimes()
-    
-    for entry in showtimes:
-        if entry.id == show_id:
-            return entry
-    
-    return None
+def _build_showtime_rows(showtimes_raw: Optional[list], pois_raw: Optional[dict]) -> list[dict]:
+    return [
+        entry.model_dump(mode="json", exclude_none=True)
+        for entry in build_showtimes(showtimes_raw, build_show_info_map(pois_raw))
+    ]
+
+
+# Rendered show times, rebuilt once per show time or POI refresh
+showtime_rows = DerivedData(
+    "showtime_rows",
+    (CACHE_KEYS["showtimes"], CACHE_KEYS["pois"]),
+    _build_showtime_rows,
+)
+
+
+async def get_showtime_rows() -> Optional[list[dict]]:
+    """Get all rendered show times; None if the show times were never loaded."""
+    rows = await showtime_rows.get()
+    if not rows and not showtime_rows.loaded():
+        return None
+    return rows
+
+
+def _build_showtimes_by_id(showtimes_raw: Optional[list], pois_raw: Optional[dict]) -> dict[int, dict]:
+    by_id: dict[int, dict] = {}
+    for row in _build_showtime_rows(showtimes_raw, pois_raw):
+        by_id.setdefault(row["id"], row)
+    return by_id
+
+
+# Rendered show times by show ID, rebuilt once per show time or POI refresh
+showtimes_by_id = DerivedData(
+    "showtimes_by_id",
+    (CACHE_KEYS["showtimes"], CACHE_KEYS["pois"]),
+    _build_showtimes_by_id,
+)
+
+
+async def get_showtime_by_id(show_id: int) -> Optional[dict]:
+    """Get the rendered show times of a specific show."""
+    return (await showtimes_by_id.get()).get(show_id)
+
+
+async def get_showtimes_by_ids(show_ids: list[int]) -> Optional[dict[int, dict]]:
+    """
+    Get rendered show times for several shows (unknown IDs are left out).
+    Returns None if the show times were never loaded.
+    """
+    entries = await showtimes_by_id.get()
+    if not entries and not showtimes_by_id.loaded():
+        return None
+    return {i: entries[i] for i in show_ids if i in entries}
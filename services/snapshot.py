@@ -0,0 +1,202 @@
+"""
+Snapshot Service.
+Pre-rendered park overview (opening times, current season, wait times and
+upcoming shows) for the app home screen.
+
+The processed datasets are rebuilt once per refresh of any of the underlying
+cache keys. The document is rendered from them, serialized and gzip-compressed
+once and then served as bytes with a content-hash ETag. Because the current
+season and the upcoming shows depend on the clock, a rendered document also
+expires at the next show start or at midnight (park time), whichever is first.
+Show times are kept for the day the sources were built and the day after, so
+a document rendered after midnight uses the show times for the new day even
+before the next show time refresh.
+Rendered documents are kept per park and content language.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from services.cache import CACHE_KEYS, get_cache_service
+from services.derived import DerivedData
+from services.language import get_language
+from services.openingtimes import OpeningTimesInfo, build_opening_times
+from services.parks import PARKS, get_park
+from services.seasons import SeasonInfo, build_seasons
+from services.showtimes import PARK_TIMEZONE, ShowTimeEntry, build_show_info_map, build_showtimes, parse_show_time
+from services.waittimes import WaitTimeEntry, build_poi_name_map, build_waittimes
+
+logger = logging.getLogger(__name__)
+
+GZIP_LEVEL = 6
+
+
+@dataclass
+class SnapshotSources:
+    """Processed datasets the snapshot is rendered from."""
+    opening_times: Optional[OpeningTimesInfo]
+    seasons: list[SeasonInfo]
+    waittimes: list[WaitTimeEntry]
+    # Show with its parsed and raw start times today and tomorrow (relative to `day`)
+    showtimes: list[tuple[ShowTimeEntry, list[tuple[Optional[datetime], str]], list[tuple[Optional[datetime], str]]]]
+    # Park date the sources were built on
+    day: date
+
+
+@dataclass
+class RenderedSnapshot:
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    expires_at: datetime
+
+
+def _build_sources(
+    waittimes_raw: Optional[list],
+    showtimes_raw: Optional[list],
+    pois_raw: Optional[dict],
+    seasons_raw: Optional[list],
+    openingtimes_raw: Optional[dict],
+) -> Optional[SnapshotSources]:
+    if not any((waittimes_raw, showtimes_raw, seasons_raw, openingtimes_raw)):
+        return None
+
+    today = datetime.now(PARK_TIMEZONE).date()
+    tomorrow = today + timedelta(days=1)
+    showtimes = [
+        (
+            entry,
+            [(parse_show_time(t, today), t) for t in entry.times_today],
+            [(parse_show_time(t, tomorrow), t) for t in entry.times_tomorrow],
+        )
+        for entry in build_showtimes(showtimes_raw, build_show_info_map(pois_raw))
+    ]
+    return SnapshotSources(
+        opening_times=build_opening_times(openingtimes_raw) if openingtimes_raw else None,
+        seasons=build_seasons(seasons_raw),
+        waittimes=build_waittimes(waittimes_raw, build_poi_name_map(pois_raw)),
+        showtimes=showtimes,
+        day=today,
+    )
+
+
+# Processed snapshot inputs, rebuilt once per refresh of any underlying dataset
+snapshot_sources = DerivedData(
+    "snapshot_sources",
+    (
+        CACHE_KEYS["waittimes"],
+        CACHE_KEYS["showtimes"],
+        CACHE_KEYS["pois"],
+        CACHE_KEYS["seasons"],
+        CACHE_KEYS["openingtimes"],
+    ),
+    _build_sources,
+)
+
+
+def _current_season(seasons: list[SeasonInfo], today: date) -> Optional[SeasonInfo]:
+    iso_today = today.isoformat()
+    for season in seasons:
+        if season.start and season.end and season.start <= iso_today <= season.end:
+            return season
+    return None
+
+
+def render_snapshot(sources: SnapshotSources, now: datetime) -> RenderedSnapshot:
+    """Renders, serializes and compresses the snapshot document for `now` (aware)."""
+    local_now = now.astimezone(PARK_TIMEZONE)
+    today = local_now.date()
+    expires_at = datetime.combine(today + timedelta(days=1), time.min, PARK_TIMEZONE)
+    # Days since the sources were built: after midnight yesterday's "tomorrow" is today
+    days_since_build = (today - sources.day).days
+
+    upcoming = []
+    for entry, times_today, times_tomorrow in sources.showtimes:
+        times = times_today if days_since_build == 0 else times_tomorrow if days_since_build == 1 else []
+        remaining = [raw for parsed, raw in times if parsed is None or parsed > now]
+        if not remaining:
+            continue
+        next_start = next((parsed for parsed, _ in times if parsed and parsed > now), None)
+        if next_start and next_start < expires_at:
+            expires_at = next_start
+        upcoming.append((remaining[0], {
+            **entry.model_dump(exclude_none=True, exclude={"times_today", "times_tomorrow"}),
+            "next": remaining,
+        }))
+    upcoming.sort(key=lambda item: item[0])
+
+    season = _current_season(sources.seasons, today)
+    document = {
+        "date": today.isoformat(),
+        "opening_times": sources.opening_times.model_dump(exclude_none=True) if sources.opening_times else None,
+        "season": season.model_dump(exclude_none=True) if season else None,
+        "waittimes": [entry.model_dump() for entry in sources.waittimes],
+        "shows": [show for _, show in upcoming],
+    }
+
+    body = json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return RenderedSnapshot(
+        body=body,
+        gzip_body=gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+        etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+        expires_at=expires_at,
+    )
+
+
+class SnapshotRenderer:
+    """Keeps the rendered snapshot per park and language until its sources change or it expires."""
+
+    def __init__(self):
+        # (park, language) -> (sources, rendered document)
+        self._rendered: OrderedDict[tuple[str, str], tuple[SnapshotSources, RenderedSnapshot]] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def _current(self, partition: tuple[str, str], sources: SnapshotSources, now: datetime) -> Optional[RenderedSnapshot]:
+        entry = self._rendered.get(partition)
+        if entry is None or entry[0] is not sources or now >= entry[1].expires_at:
+            return None
+        return entry[1]
+
+    async def get(self) -> Optional[RenderedSnapshot]:
+        """Current rendered snapshot of the request park and language; None if nothing is cached yet."""
+        sources = await snapshot_sources.get()
+        if sources is None:
+            return None
+
+        partition = (get_park(), get_language())
+        now = datetime.now(PARK_TIMEZONE)
+        rendered = self._current(partition, sources, now)
+        if rendered:
+            return rendered
+
+        async with self._lock:
+            rendered = self._current(partition, sources, now)
+            if rendered is None:
+                rendered = render_snapshot(sources, now)
+                self._rendered[partition] = (sources, rendered)
+                self._rendered.move_to_end(partition)
+                while len(self._rendered) > max(1, get_cache_service().language_partition_limit * len(PARKS)):
+                    self._rendered.popitem(last=False)
+                logger.debug(
+                    f"Park snapshot rendered ({'/'.join(partition)}): {len(rendered.body)} bytes "
+                    f"({len(rendered.gzip_body)} gzip), valid until {rendered.expires_at}"
+                )
+            return rendered
+
+
+_renderer: Optional[SnapshotRenderer] = None
+
+
+def get_snapshot_renderer() -> SnapshotRenderer:
+    """Returns the singleton SnapshotRenderer."""
+    global _renderer
+    if _renderer is None:
+        _renderer = SnapshotRenderer()
+    return _renderer
@@ -1,13 +1,20 @@
 """
 Token Storage Service.
 Persistiert OAuth2 Tokens in der Datenbank.
+
+Die Token-Zeile wird von allen Prozessen (Worker, Nodes) geteilt. Jede
+Erneuerung erhöht ihre Version; erneuert wird nur unter einer Lease
+(`try_acquire_renewal`), die per bedingtem UPDATE auf die zuletzt gelesene
+Version vergeben wird. `save_renewed` schreibt nur, wenn Version und Lease
+noch passen (optimistische Nebenläufigkeit).
 """
 
 import logging
 from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
 
 from database import TokenModel, get_session
 
@@ -24,12 +31,14 @@ class TokenData:
         access_token: str,
         token_type: str,
         expires_at: datetime,
-        created_at: Optional[datetime] = None
+        created_at: Optional[datetime] = None,
+        version: int = 0
     ):
         self.access_token = access_token
         self.token_type = token_type
         self.expires_at = expires_at
         self.created_at = created_at or datetime.now()
+        self.version = version
     
     def is_expired(self, buffer_seconds: int = 300) -> bool:
         """Prüft ob der Token abgelaufen ist."""
@@ -43,29 +52,88 @@ class TokenStorage:
     def __init__(self, key: str = TOKEN_KEY):
         self.key = key
     
-    async def save(self, token_data: TokenData) -> None:
+    async def try_acquire_renewal(self, owner: str, version: int, lease_seconds: float) -> bool:
+        """
+        Vergibt die Erneuerungs-Lease an `owner`, falls die gespeicherte Version noch
+        `version` ist (0: noch kein Token) und keine andere Lease läuft.
+        """
+        now = datetime.now()
+        lease_until = now + timedelta(seconds=lease_seconds)
         async with get_session() as session:
             result = await session.execute(
-                select(TokenModel).where(TokenModel.key == self.key)
+                update(TokenModel)
+                .where(
+                    TokenModel.key == self.key,
+                    TokenModel.version == version,
+                    or_(TokenModel.renewing_until.is_(None), TokenModel.renewing_until < now),
+                )
+                .values(renewing_by=owner, renewing_until=lease_until)
             )
-            existing = result.scalar_one_or_none()
+            if result.rowcount == 1:
+                await session.commit()
+                return True
+            if version != 0:
+                return False
             
-            if existing:
-                existing.access_token = token_data.access_token
-                existing.token_type = token_data.token_type
-                existing.expires_at = token_data.expires_at
-            else:
-                new_token = TokenModel(
-                    key=self.key,
+            # Erster Token: Platzhalter-Zeile mit Lease anlegen (eindeutiger Schlüssel)
+            session.add(TokenModel(
+                key=self.key,
+                access_token="",
+                token_type="Bearer",
+                expires_at=now,
+                created_at=now,
+                version=0,
+                renewing_by=owner,
+                renewing_until=lease_until
+            ))
+            try:
+                await session.commit()
+                return True
+            except IntegrityError:
+                await session.rollback()
+                return False
+    
+    async def save_renewed(self, token_data: TokenData, owner: str, version: int) -> bool:
+        """
+        Speichert den erneuerten Token als Version `version + 1` und gibt die Lease frei.
+        False, wenn die Lease abgelaufen ist und ein anderer Prozess inzwischen geschrieben hat.
+        """
+        async with get_session() as session:
+            result = await session.execute(
+                update(TokenModel)
+                .where(
+                    TokenModel.key == self.key,
+                    TokenModel.version == version,
+                    TokenModel.renewing_by == owner,
+                )
+                .values(
                     access_token=token_data.access_token,
                     token_type=token_data.token_type,
                     expires_at=token_data.expires_at,
-                    created_at=token_data.created_at
+                    created_at=token_data.created_at,
+                    version=version + 1,
+                    renewing_by=None,
+                    renewing_until=None
                 )
-                session.add(new_token)
-            
+            )
+            await session.commit()
+        
+        if result.rowcount != 1:
+            logger.warning(f"Token nicht gespeichert: Version {version} wurde inzwischen ersetzt.")
+            return False
+        token_data.version = version + 1
+        logger.info(f"Token gespeichert (Version {token_data.version}). Gültig bis: {token_data.expires_at}")
+        return True
+    
+    async def release_renewal(self, owner: str) -> None:
+        """Gibt die Lease nach einer fehlgeschlagenen Erneuerung frei."""
+        async with get_session() as session:
+            await session.execute(
+                update(TokenModel)
+                .where(TokenModel.key == self.key, TokenModel.renewing_by == owner)
+                .values(renewing_by=None, renewing_until=None)
+            )
             await session.commit()
-            logger.info(f"Token gespeichert. Gültig bis: {token_data.expires_at}")
     
     async def load(self) -> Optional[TokenData]:
         async with get_session() as session:
@@ -81,7 +149,8 @@ class TokenStorage:
                 access_token=token.access_token,
                 token_type=token.token_type,
                 expires_at=token.expires_at,
-                created_at=token.created_at
+                created_at=token.created_at,
+                version=token.version
             )
 
 
@@ -0,0 +1,155 @@
+"""
+Upcoming Shows Service.
+Time index over today's and tomorrow's show starts for "next show" queries.
+
+Show times are parsed once per show time or POI refresh into timezone-aware
+minute offsets (minutes since the Unix epoch) and kept in one sorted array
+over all shows, plus a sorted array per show. "Shows starting within N
+minutes" is a slice between two binary searches, and the next start of a
+show is one binary search, so queries cost O(log n) plus the result size.
+
+Raw times are ISO timestamps; "HH:MM" values are placed on the park-time
+date of the refresh (today's list) or the day after (tomorrow's list).
+"""
+
+import logging
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from services.cache import CACHE_KEYS
+from services.derived import DerivedData
+from services.geo import ground_distance
+from services.showtimes import PARK_TIMEZONE, ShowTimeEntry, build_show_info_map, build_showtimes, parse_show_time
+
+logger = logging.getLogger(__name__)
+
+
+def to_minutes(moment: datetime) -> int:
+    """Minute offset (minutes since the Unix epoch) of an aware datetime, rounded down."""
+    return int(moment.timestamp() // 60)
+
+
+def from_minutes(minutes: int) -> datetime:
+    """Park-time datetime of a minute offset."""
+    return datetime.fromtimestamp(minutes * 60, PARK_TIMEZONE)
+
+
+class ShowTimeIndex:
+    """Sorted show starts over all shows and per show."""
+
+    def __init__(self, entries: list[ShowTimeEntry], today: date):
+        self.shows: dict[int, ShowTimeEntry] = {}
+        self.show_starts: dict[int, array] = {}
+        events: list[tuple[int, int]] = []
+
+        tomorrow = today + timedelta(days=1)
+        for entry in entries:
+            if entry.id in self.shows:
+                continue
+            starts = set()
+            for times, day in ((entry.times_today, today), (entry.times_tomorrow, tomorrow)):
+                for value in times:
+                    parsed = parse_show_time(value, day)
+                    if parsed is not None:
+                        starts.add(to_minutes(parsed))
+            self.shows[entry.id] = entry
+            self.show_starts[entry.id] = array("q", sorted(starts))
+            events.extend((start, entry.id) for start in starts)
+
+        events.sort()
+        self.starts = array("q", (start for start, _ in events))
+        self.start_show_ids = array("q", (show_id for _, show_id in events))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def between(self, start: int, end: int) -> list[tuple[int, int]]:
+        """(start, show ID) of all starts in [start, end], earliest first."""
+        lo = bisect_left(self.starts, start)
+        hi = bisect_right(self.starts, end, lo=lo)
+        return list(zip(self.starts[lo:hi], self.start_show_ids[lo:hi]))
+
+    def next_starts(self, show_id: int, start: int, count: int) -> list[int]:
+        """The next `count` starts of a show at or after `start`."""
+        starts = self.show_starts.get(show_id)
+        if not starts:
+            return []
+        lo = bisect_left(starts, start)
+        return list(starts[lo:lo + count])
+
+
+def _build_showtime_index(showtimes_raw: Optional[list], pois_raw: Optional[dict]) -> Optional[ShowTimeIndex]:
+    if not showtimes_raw:
+        return None
+    entries = build_showtimes(showtimes_raw, build_show_info_map(pois_raw))
+    index = ShowTimeIndex(entries, datetime.now(PARK_TIMEZONE).date())
+    logger.info(f"Show time index built: {len(index)} starts of {len(index.shows)} shows.")
+    return index
+
+
+# Show start index, rebuilt once per show time or POI refresh
+showtime_index = DerivedData(
+    "showtime_index",
+    (CACHE_KEYS["showtimes"], CACHE_KEYS["pois"]),
+    _build_showtime_index,
+)
+
+
+def _start_entry(start: int, now: int) -> dict:
+    return {"start": from_minutes(start).isoformat(), "starts_in": start - now}
+
+
+async def get_upcoming_shows(
+    within: int,
+    near: Optional[tuple[float, float]] = None,
+    radius: float = 500,
+    limit: int = 50,
+    now: Optional[datetime] = None,
+) -> Optional[list[dict]]:
+    """
+    Show starts within the next `within` minutes, earliest first,
+    optionally only shows within `radius` meters of `near` (lat, lon).
+    Returns None if the show times were never loaded.
+    """
+    index = await showtime_index.get()
+    if index is None:
+        return [] if showtime_index.loaded() else None
+
+    current = to_minutes(now or datetime.now(PARK_TIMEZONE))
+    results = []
+    for start, show_id in index.between(current, current + within):
+        entry = index.shows[show_id]
+        item = {"id": entry.id, "name": entry.name, **_start_entry(start, current)}
+        if entry.location:
+            item["location"] = entry.location.model_dump()
+        if near is not None:
+            if entry.location is None:
+                continue
+            distance = ground_distance(near[0], near[1], entry.location.latitude, entry.location.longitude)
+            if distance > radius:
+                continue
+            item["distance"] = round(distance, 1)
+        results.append(item)
+        if len(results) >= limit:
+            break
+    return results
+
+
+async def get_next_show(show_id: int, count: int = 1, now: Optional[datetime] = None) -> Optional[dict]:
+    """
+    Next `count` starts of a show (an empty list if it has no more starts today or tomorrow).
+    Returns None if the show is unknown.
+    """
+    index = await showtime_index.get()
+    if index is None or show_id not in index.shows:
+        return None
+
+    current = to_minutes(now or datetime.now(PARK_TIMEZONE))
+    entry = index.shows[show_id]
+    return {
+        "id": entry.id,
+        "name": entry.name,
+        "next": [_start_entry(start, current) for start in index.next_starts(show_id, current, count)],
+    }
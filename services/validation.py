@@ -0,0 +1,69 @@
+"""
+Dataset Validation.
+Structural checks for dataset content before it is published.
+
+Every dataset is checked the same way whether it comes from the upstream
+API (the ingest pipeline's validate stage) or from an imported cache bundle,
+so data that the derived artifacts cannot process never becomes a cache
+generation. Park partitions have the shape of the full dataset, so the same
+checks apply to both.
+
+Further checks are added with `register_validator()`.
+"""
+
+from typing import Any, Callable, Optional
+
+from services.cache import CACHE_KEYS
+
+
+class DatasetValidationError(ValueError):
+    """Raised for dataset content that does not have the expected structure."""
+
+
+_validators: dict[str, list[Callable[[Any], None]]] = {}
+
+
+def register_validator(key: str, validator: Callable[[Any], None]) -> None:
+    """Adds a check for data of `key`; it raises DatasetValidationError to reject the data."""
+    _validators.setdefault(key, []).append(validator)
+
+
+def validate_dataset(key: str, data: Any) -> int:
+    """
+    Runs the registered checks for `key`; returns the number of checks.
+
+    Raises:
+        DatasetValidationError: Empty data or a failed check
+    """
+    if data is None:
+        raise DatasetValidationError(f"{key}: empty response")
+    validators = _validators.get(key, ())
+    for validator in validators:
+        validator(data)
+    return len(validators)
+
+
+def _objects(key: str, items: list, name: str) -> None:
+    for item in items:
+        if not isinstance(item, dict):
+            raise DatasetValidationError(f"{key}: {name} contains {type(item).__name__}, expected objects")
+
+
+def _expect(key: str, container: type, list_field: Optional[str] = None) -> Callable[[Any], None]:
+    def validator(data: Any) -> None:
+        if not isinstance(data, container):
+            raise DatasetValidationError(f"{key}: expected {container.__name__}, got {type(data).__name__}")
+        if list_field is not None:
+            if not isinstance(data.get(list_field), list):
+                raise DatasetValidationError(f"{key}: '{list_field}' is not a list")
+            _objects(key, data[list_field], f"'{list_field}'")
+        elif isinstance(data, list):
+            _objects(key, data, "list")
+    return validator
+
+
+register_validator(CACHE_KEYS["waittimes"], _expect(CACHE_KEYS["waittimes"], list))
+register_validator(CACHE_KEYS["showtimes"], _expect(CACHE_KEYS["showtimes"], list))
+register_validator(CACHE_KEYS["pois"], _expect(CACHE_KEYS["pois"], dict, "pois"))
+register_validator(CACHE_KEYS["seasons"], _expect(CACHE_KEYS["seasons"], list))
+register_validator(CACHE_KEYS["openingtimes"], _expect(CACHE_KEYS["openingtimes"], dict))
@@ -0,0 +1,184 @@
+"""
+Wait Time Statistics Service.
+Park-wide and per-area aggregates over the current wait times.
+
+Statistics are computed once per refresh of wait times or POIs. The raw
+`time` codes are kept as a column array and decoded in one pass through
+lookup tables generated from `get_status_from_time`, so status and cleaned
+time of every entry come from table lookups instead of per-entry branching.
+Rows are ordered by area once, which makes every area a contiguous slice of
+the columns; counts, masks and sorts then run over whole slices.
+"""
+
+import math
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import compress
+from typing import Optional
+
+from services.cache import CACHE_KEYS
+from services.derived import DerivedData
+from services.waittimes import AttractionStatus, build_poi_name_map, get_status_from_time
+
+DEFAULT_TOP = 5
+MAX_TOP = 50
+
+# Wait time (minutes) at which the crowd index reaches 100
+CROWD_INDEX_FULL_MINUTES = 90
+
+STATUSES = tuple(AttractionStatus)
+_STATUS_INDEX = {status: index for index, status in enumerate(STATUSES)}
+
+# Decoding tables for time codes 0..999 (status index, cleaned time or -1)
+_CODE_LIMIT = 1000
+_NO_TIME = -1
+_STATUS_BY_CODE = bytes(_STATUS_INDEX[get_status_from_time(code)[0]] for code in range(_CODE_LIMIT))
+_TIME_BY_CODE = array("l", (
+    _NO_TIME if get_status_from_time(code)[1] is None else get_status_from_time(code)[1]
+    for code in range(_CODE_LIMIT)
+))
+# Status index -> 1 if the attraction is operational (bytes.translate mask)
+_OPERATIONAL_MASK = bytes(
+    1 if index < len(STATUSES) and STATUSES[index] is AttractionStatus.OPERATIONAL else 0
+    for index in range(256)
+)
+
+
+def decode_time_codes(codes: array) -> tuple[bytes, array]:
+    """
+    Decodes a column of raw time codes into status indexes (into STATUSES)
+    and cleaned times (-1 if none), equivalent to `get_status_from_time`.
+    """
+    if not codes or (min(codes) >= 0 and max(codes) < _CODE_LIMIT):
+        return bytes(map(_STATUS_BY_CODE.__getitem__, codes)), array("l", map(_TIME_BY_CODE.__getitem__, codes))
+
+    # Codes outside the table (not sent by the upstream API): decode one by one
+    decoded = [get_status_from_time(code) for code in codes]
+    statuses = bytes(_STATUS_INDEX[status] for status, _ in decoded)
+    times = array("l", (_NO_TIME if time is None else time for _, time in decoded))
+    return statuses, times
+
+
+@dataclass
+class WaitTimeSummary:
+    """Aggregates over a set of attractions."""
+    attractions: int
+    status_counts: dict[str, int]
+    operational: int
+    mean: Optional[float]
+    median: Optional[float]
+    p90: Optional[int]
+    crowd_index: Optional[float]
+    # (id, name, time) of operational attractions, shortest wait first
+    ranked: list[tuple[int, str, int]]
+
+    def to_dict(self, top: int) -> dict:
+        def entries(rows):
+            return [{"id": poi_id, "name": name, "time": time} for poi_id, name, time in rows]
+
+        return {
+            "attractions": self.attractions,
+            "operational": self.operational,
+            "status_counts": self.status_counts,
+            "mean": self.mean,
+            "median": self.median,
+            "p90": self.p90,
+            "crowd_index": self.crowd_index,
+            "longest": entries(self.ranked[:-top - 1:-1] if top else []),
+            "shortest": entries(self.ranked[:top]),
+        }
+
+
+@dataclass
+class WaitTimeStats:
+    """Park-wide summary and summaries per area (ordered by area ID)."""
+    park: WaitTimeSummary
+    areas: list[tuple[Optional[int], WaitTimeSummary]]
+
+    def to_dict(self, top: int = DEFAULT_TOP) -> dict:
+        return {
+            "park": self.park.to_dict(top),
+            "areas": [{"area_id": area_id, **summary.to_dict(top)} for area_id, summary in self.areas],
+        }
+
+
+def summarize(statuses: bytes, times: array, ids: list[int], names: list[str]) -> WaitTimeSummary:
+    """Aggregates one slice of the decoded columns."""
+    status_counts = {}
+    for index, status in enumerate(STATUSES):
+        count = statuses.count(index)
+        if count:
+            status_counts[status.value] = count
+
+    mask = statuses.translate(_OPERATIONAL_MASK)
+    order = sorted(compress(range(len(statuses)), mask), key=times.__getitem__)
+    sorted_times = [times[i] for i in order]
+
+    count = len(sorted_times)
+    mean = median = p90 = crowd_index = None
+    if count:
+        mean = round(math.fsum(sorted_times) / count, 1)
+        middle = count // 2
+        median = float(sorted_times[middle]) if count % 2 else (sorted_times[middle - 1] + sorted_times[middle]) / 2
+        p90 = sorted_times[math.ceil(0.9 * count) - 1]
+        crowd_index = round(min(100.0, mean / CROWD_INDEX_FULL_MINUTES * 100), 1)
+
+    return WaitTimeSummary(
+        attractions=len(statuses),
+        status_counts=status_counts,
+        operational=count,
+        mean=mean,
+        median=median,
+        p90=p90,
+        crowd_index=crowd_index,
+        ranked=[(ids[i], names[i], times[i]) for i in order],
+    )
+
+
+def build_waittime_stats(waittimes_raw: Optional[list], pois_raw: Optional[dict]) -> Optional[WaitTimeStats]:
+    """Statistics over the wait times of attractions with known POI (None if nothing is cached)."""
+    if not waittimes_raw:
+        return None
+
+    poi_map = build_poi_name_map(pois_raw)
+    rows = []
+    for entry in waittimes_raw:
+        info = poi_map.get(entry.get("code"))
+        if info is None or info.get("id") is None:
+            continue
+        area_id = info.get("area_id")
+        rows.append((area_id is None, area_id or 0, info["id"], info.get("name", "Unknown"), entry.get("time", 0)))
+    # Group by area (unknown area last); stable, so entries keep their upstream order within an area
+    rows.sort(key=lambda row: row[:2])
+
+    area_keys = [row[:2] for row in rows]
+    ids = [row[2] for row in rows]
+    names = [row[3] for row in rows]
+    statuses, times = decode_time_codes(array("l", (row[4] for row in rows)))
+
+    areas = []
+    start = 0
+    while start < len(rows):
+        key = area_keys[start]
+        end = bisect_right(area_keys, key, lo=start)
+        areas.append((
+            None if key[0] else key[1],
+            summarize(statuses[start:end], times[start:end], ids[start:end], names[start:end]),
+        ))
+        start = end
+
+    return WaitTimeStats(park=summarize(statuses, times, ids, names), areas=areas)
+
+
+# Wait time statistics, rebuilt once per wait time or POI refresh
+waittime_stats = DerivedData(
+    "waittime_stats",
+    (CACHE_KEYS["waittimes"], CACHE_KEYS["pois"]),
+    build_waittime_stats,
+)
+
+
+async def get_waittime_stats() -> Optional[WaitTimeStats]:
+    """Get statistics over the current wait times (None if no wait times are cached yet)."""
+    return await waittime_stats.get()
@@ -9,7 +9,10 @@ from typing import Optional
 
 from pydantic import BaseModel
 
-from services.cache import get_cache_service, CACHE_KEYS
+from services.cache import CACHE_KEYS
+from services.derived import DerivedData
+from services.listing import ColumnTable, Page, SortSpec, name_sorts
+from services.projection import Projection
 
 logger = logging.getLogger(__name__)
 
@@ -74,25 +77,20 @@ def get_status_from_time(time_value: int) -> tuple[AttractionStatus, Optional[in
         return AttractionStatus.UNKNOWN, None
 
 
-async def get_poi_name_map() -> dict[int, dict]:
-    """Create a mapping from POI code to POI data."""
-    cache = get_cache_service()
-    pois_data = await cache.load(CACHE_KEYS["pois"])
-    
-    if not pois_data or "data" not in pois_data:
+def build_poi_name_map(pois_raw: Optional[dict]) -> dict[int, dict]:
+    """Create a mapping from POI code to POI data from raw POI data."""
+    if not pois_raw:
         return {}
     
     poi_map = {}
-    for poi in pois_data["data"].get("pois", []):
+    for poi in pois_raw.get("pois", []):
         code = poi.get("code")
-        scopes = poi.get("scopes", [])
-        
-        # Europapark POIs only (no Rulantica)
-        if code and "europapark" in scopes:
+        if code:
             poi_map[code] = {
                 "id": poi.get("id"),
                 "name": poi.get("name", "Unknown"),
                 "type": poi.get("type"),
+                "area_id": poi.get("areaId"),
                 "latitude": poi.get("latitude"),
                 "longitude": poi.get("longitude"),
             }
@@ -100,18 +98,13 @@ async def get_poi_name_map() -> dict[int, dict]:
     return poi_map
 
 
-async def get_processed_waittimes() -> list[WaitTimeEntry]:
-    """Get processed wait times with names and status."""
-    cache = get_cache_service()
-    
-    waittimes_data = await cache.load(CACHE_KEYS["waittimes"])
-    if not waittimes_data or "data" not in waittimes_data:
+def build_waittimes(waittimes_raw: Optional[list], poi_map: dict[int, dict]) -> list[WaitTimeEntry]:
+    """Link raw wait times with POI data and decode their status."""
+    if not waittimes_raw:
         return []
     
-    poi_map = await get_poi_name_map()
-    
     results = []
-    for entry in waittimes_data["data"]:
+    for entry in waittimes_raw:
         code = entry.get("code")
         time_value = entry.get("time", 0)
         
@@ -137,12 +130,111 @@ async def get_processed_waittimes() -> list[WaitTimeEntry]:
     return results
 
 
-async def get_waittime_by_id(attraction_id: int) -> Optional[WaitTimeEntry]:
-    """Get wait time for a specific attraction."""
-    waittimes = await get_processed_waittimes()
+def _build_waittimes_by_id(waittimes_raw: Optional[list], pois_raw: Optional[dict]) -> dict[int, dict]:
+    by_id: dict[int, dict] = {}
+    for entry in build_waittimes(waittimes_raw, build_poi_name_map(pois_raw)):
+        if entry.id not in by_id:
+            by_id[entry.id] = entry.model_dump(mode="json")
+    return by_id
+
+
+# Rendered wait times by attraction ID, rebuilt once per wait time or POI refresh
+waittimes_by_id = DerivedData(
+    "waittimes_by_id",
+    (CACHE_KEYS["waittimes"], CACHE_KEYS["pois"]),
+    _build_waittimes_by_id,
+)
+
+
+def _build_waittimes_table(waittimes_raw: Optional[list], pois_raw: Optional[dict]) -> ColumnTable:
+    poi_map = build_poi_name_map(pois_raw)
+    entries = build_waittimes(waittimes_raw, poi_map)
+    details = {info["id"]: info for info in poi_map.values()}
+    
+    ids = [e.id for e in entries]
+    times = [e.time for e in entries]
     
-    for entry in waittimes:
-        if entry.id == attraction_id:
-            return entry
+    def time_key(i: int) -> tuple:
+        return (times[i] is None, times[i] or 0, ids[i])
     
-    return None
+    def time_desc_key(i: int) -> tuple:
+        return (times[i] is None, -(times[i] or 0), ids[i])
+    
+    return ColumnTable(
+        rows=[e.model_dump(mode="json") for e in entries],
+        columns={
+            "status": [e.status.value for e in entries],
+            "time": times,
+            "area_id": [details[e.id].get("area_id") for e in entries],
+            "type": [details[e.id].get("type") for e in entries],
+        },
+        sorts={
+            "time": SortSpec(time_key),
+            "-time": SortSpec(time_desc_key),
+            **name_sorts([e.name for e in entries], ids),
+        },
+    )
+
+
+# Pre-rendered wait times with filter columns and sort orders, rebuilt once per refresh
+waittimes_table = DerivedData(
+    "waittimes_table",
+    (CACHE_KEYS["waittimes"], CACHE_KEYS["pois"]),
+    _build_waittimes_table,
+)
+
+
+async def query_waittimes(
+    statuses: Optional[set[str]] = None,
+    min_time: Optional[int] = None,
+    max_time: Optional[int] = None,
+    area_ids: Optional[set[int]] = None,
+    types: Optional[set[str]] = None,
+    sort: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    projection: Optional[Projection] = None,
+) -> Optional[Page]:
+    """
+    Filtered, sorted page of wait times.
+    Returns None if the wait times were never loaded.
+    
+    Raises:
+        InvalidQueryError: Unknown sort order or invalid cursor
+    """
+    table = await waittimes_table.get()
+    if not table and not waittimes_table.loaded():
+        return None
+    
+    equals = {}
+    if statuses:
+        equals["status"] = statuses
+    if area_ids:
+        equals["area_id"] = area_ids
+    if types:
+        equals["type"] = types
+    
+    return table.query(
+        equals=equals,
+        ranges={"time": (min_time, max_time)},
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+        projection=projection,
+    )
+
+
+async def get_waittime_by_id(attraction_id: int) -> Optional[dict]:
+    """Get the rendered wait time of a specific attraction."""
+    return (await waittimes_by_id.get()).get(attraction_id)
+
+
+async def get_waittimes_by_ids(attraction_ids: list[int]) -> Optional[dict[int, dict]]:
+    """
+    Get rendered wait times for several attractions (unknown IDs are left out).
+    Returns None if the wait times were never loaded.
+    """
+    entries = await waittimes_by_id.get()
+    if not entries and not waittimes_by_id.loaded():
+        return None
+    return {i: entries[i] for i in attraction_ids if i in entries}
@@ -0,0 +1,402 @@
+"""
+Webhooks Service.
+Notifies subscribers when an attraction's wait time crosses a threshold or its status changes.
+
+Subscriptions (endpoint URL, optional signing secret, rules) are stored in
+the database and indexed in memory by attraction ID. After every wait time
+refresh the ingest pipeline's `notify` stage compares the new wait times
+with the previous ones and looks up only the attractions that changed, so
+evaluation cost grows with the number of changes, not with the number of
+subscriptions. Subscriptions created or deleted by another process are
+picked up before each evaluation (count, max ID and latest creation time;
+SQLite may reuse the ID of a deleted last row). The first refresh with
+linked wait times after a start only records the baseline.
+
+Events of one refresh are grouped per endpoint and posted as one batch by a
+bounded pool of workers sharing one HTTP client (keep-alive connections).
+Network errors, 429 and 5xx are retried with exponential backoff; batches
+that do not fit into the queue are dropped. Bodies are signed with
+HMAC-SHA256 (X-Webhook-Signature) if the subscription has a secret.
+
+Delivery runs only where WEBHOOKS_ENABLED is set (off by default): every
+process with the notify stage sends its own copy of each event, so exactly
+one process should deliver.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import httpx
+from pydantic import AnyHttpUrl, BaseModel, Field, model_validator
+from sqlalchemy import delete, func, select
+
+from config import get_settings
+from database import WebhookModel, get_session
+from services.cache import CACHE_KEYS
+from services.ingest import IngestBatch, IngestStage, get_ingest_pipeline
+from services.language import DEFAULT_LANGUAGE, current_language
+from services.metrics import (
+    webhook_deliveries_total,
+    webhook_delivery_duration_seconds,
+    webhook_events_total,
+    webhook_queue_size,
+)
+from services.parks import PARKS, current_park
+from services.waittimes import AttractionStatus, waittimes_by_id
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Webhook-Signature"
+MAX_RULES = 100
+
+# (wait time, status) of an attraction
+State = tuple[Optional[int], str]
+
+
+class WebhookRule(BaseModel):
+    """Condition on one attraction, fires when it becomes true. At least one condition is required."""
+    attraction_id: int
+    below: Optional[int] = Field(None, ge=1, description="Wait time drops below this many minutes")
+    above: Optional[int] = Field(None, ge=0, description="Wait time rises to at least this many minutes")
+    status_from: Optional[AttractionStatus] = Field(None, description="Status changes away from this status")
+    status_to: Optional[AttractionStatus] = Field(None, description="Status changes to this status")
+
+    @model_validator(mode="after")
+    def _require_condition(self) -> "WebhookRule":
+        if self.below is None and self.above is None and self.status_from is None and self.status_to is None:
+            raise ValueError("A rule needs at least one of below, above, status_from, status_to")
+        return self
+
+    def triggers(self, previous: State, current: State) -> list[str]:
+        """Conditions that became true with the change from `previous` to `current`."""
+        (prev_time, prev_status), (time_value, status) = previous, current
+        fired = []
+        if self.below is not None and time_value is not None and time_value < self.below:
+            if prev_time is None or prev_time >= self.below:
+                fired.append("below")
+        if self.above is not None and time_value is not None and time_value >= self.above:
+            if prev_time is None or prev_time < self.above:
+                fired.append("above")
+        if (self.status_from is not None or self.status_to is not None) and prev_status != status:
+            if (self.status_from is None or prev_status == self.status_from.value) and (
+                self.status_to is None or status == self.status_to.value
+            ):
+                fired.append("status")
+        return fired
+
+
+class WebhookSubscriptionCreate(BaseModel):
+    """New webhook subscription."""
+    url: AnyHttpUrl
+    secret: Optional[str] = Field(None, min_length=1, max_length=200, description="HMAC-SHA256 signing secret")
+    rules: list[WebhookRule] = Field(min_length=1, max_length=MAX_RULES)
+
+
+@dataclass
+class Subscription:
+    id: int
+    url: str
+    secret: Optional[str]
+    rules: list[WebhookRule]
+    created_at: datetime
+
+    @classmethod
+    def from_model(cls, model: WebhookModel) -> "Subscription":
+        return cls(
+            id=model.id,
+            url=model.url,
+            secret=model.secret,
+            rules=[WebhookRule.model_validate(rule) for rule in json.loads(model.rules)],
+            created_at=model.created_at,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "url": self.url,
+            "signed": self.secret is not None,
+            "rules": [rule.model_dump(mode="json", exclude_none=True) for rule in self.rules],
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+class WebhookDispatcher:
+    """Bounded worker pool delivering event batches, one POST per batch."""
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        batch_size: int,
+        max_retries: int,
+        retry_backoff: float,
+        timeout: float,
+    ):
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = max(0.0, retry_backoff)
+        self.timeout = timeout
+        self._queue: asyncio.Queue[tuple[str, Optional[str], list[dict]]] = asyncio.Queue(max(1, queue_size))
+        self._client: Optional[httpx.AsyncClient] = None
+        self._tasks: list[asyncio.Task] = []
+        # Endpoint URL -> delivery counters and last error
+        self._endpoints: dict[str, dict] = {}
+        webhook_queue_size.set_function(self._queue.qsize)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.workers, max_keepalive_connections=self.workers),
+        )
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def enqueue(self, url: str, secret: Optional[str], events: list[dict]) -> None:
+        """Queues the events of one endpoint in batches of at most `batch_size` (dropped if the queue is full)."""
+        for start in range(0, len(events), self.batch_size):
+            try:
+                self._queue.put_nowait((url, secret, events[start:start + self.batch_size]))
+            except asyncio.QueueFull:
+                webhook_deliveries_total.labels("dropped").inc()
+                self._record(url, "dropped", "Queue full")
+                logger.warning(f"Webhook queue full, batch for {url} dropped.")
+
+    async def _work(self) -> None:
+        while True:
+            url, secret, events = await self._queue.get()
+            try:
+                await self._deliver(url, secret, events)
+            except Exception as e:
+                logger.error(f"Webhook delivery to {url} failed unexpectedly: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, url: str, secret: Optional[str], events: list[dict]) -> None:
+        body = json.dumps({"count": len(events), "events": events}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if secret:
+            headers[SIGNATURE_HEADER] = "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                response = await self._client.post(url, content=body, headers=headers)
+                error = None if response.is_success else f"HTTP {response.status_code}"
+                retryable = response.status_code == 429 or response.status_code >= 500
+            except httpx.HTTPError as e:
+                error = str(e) or type(e).__name__
+                retryable = True
+            webhook_delivery_duration_seconds.observe(time.perf_counter() - start)
+
+            if error is None:
+                webhook_deliveries_total.labels("success").inc()
+                self._record(url, "delivered")
+                return
+            if not retryable or attempt == self.max_retries:
+                webhook_deliveries_total.labels("failure").inc()
+                self._record(url, "failed", error)
+                logger.warning(f"Webhook delivery to {url} failed after {attempt + 1} attempt(s): {error}")
+                return
+            webhook_deliveries_total.labels("retry").inc()
+            await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+
+    def _record(self, url: str, result: str, error: Optional[str] = None) -> None:
+        stats = self._endpoints.setdefault(url, {"delivered": 0, "failed": 0, "dropped": 0, "last_error": None})
+        stats[result] += 1
+        if error is not None:
+            stats["last_error"] = error
+
+    def get_status(self) -> dict:
+        return {
+            "running": self.running,
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "endpoints": self._endpoints,
+        }
+
+
+class WebhookService:
+    """Stores subscriptions, evaluates their rules per wait time refresh and queues the events."""
+
+    def __init__(self):
+        settings = get_settings()
+        self.dispatcher = WebhookDispatcher(
+            settings.webhook_workers,
+            settings.webhook_queue_size,
+            settings.webhook_batch_size,
+            settings.webhook_max_retries,
+            settings.webhook_retry_backoff,
+            settings.webhook_timeout,
+        )
+        self._subscriptions: dict[int, Subscription] = {}
+        # Attraction ID -> (subscription, rule index)
+        self._index: dict[int, list[tuple[Subscription, int]]] = {}
+        self._stamp: Optional[tuple[int, Optional[int], Optional[datetime]]] = None
+        self._previous: Optional[dict[int, State]] = None
+        self._sync_lock = asyncio.Lock()
+
+    async def sync(self) -> None:
+        """Reloads the subscriptions if they were changed (by any process) since the last load."""
+        async with self._sync_lock, get_session() as session:
+            result = await session.execute(
+                select(func.count(WebhookModel.id), func.max(WebhookModel.id), func.max(WebhookModel.created_at))
+            )
+            stamp = tuple(result.one())
+            if stamp == self._stamp:
+                return
+            rows = (await session.execute(select(WebhookModel).order_by(WebhookModel.id))).scalars().all()
+
+            subscriptions: dict[int, Subscription] = {}
+            index: dict[int, list[tuple[Subscription, int]]] = {}
+            for row in rows:
+                try:
+                    subscription = Subscription.from_model(row)
+                except ValueError as e:
+                    logger.error(f"Webhook {row.id} skipped, invalid rules: {e}")
+                    continue
+                subscriptions[subscription.id] = subscription
+                for rule_index, rule in enumerate(subscription.rules):
+                    index.setdefault(rule.attraction_id, []).append((subscription, rule_index))
+            self._subscriptions, self._index, self._stamp = subscriptions, index, stamp
+
+    async def list_subscriptions(self) -> list[dict]:
+        await self.sync()
+        return [subscription.to_dict() for subscription in self._subscriptions.values()]
+
+    async def get_subscription(self, subscription_id: int) -> Optional[dict]:
+        await self.sync()
+        subscription = self._subscriptions.get(subscription_id)
+        return subscription.to_dict() if subscription else None
+
+    async def create_subscription(self, data: WebhookSubscriptionCreate) -> dict:
+        rules = [rule.model_dump(mode="json", exclude_none=True) for rule in data.rules]
+        async with get_session() as session:
+            model = WebhookModel(url=str(data.url), secret=data.secret, rules=json.dumps(rules), created_at=datetime.now())
+            session.add(model)
+            await session.commit()
+            subscription = Subscription.from_model(model)
+        await self.sync()
+        logger.info(f"Webhook {subscription.id} created for {subscription.url} ({len(rules)} rules).")
+        return subscription.to_dict()
+
+    async def delete_subscription(self, subscription_id: int) -> bool:
+        async with get_session() as session:
+            result = await session.execute(delete(WebhookModel).where(WebhookModel.id == subscription_id))
+            await session.commit()
+        await self.sync()
+        return result.rowcount > 0
+
+    def evaluate(self, current: dict[int, State]) -> dict[tuple[str, Optional[str]], list[dict]]:
+        """
+        Compares the new wait times with the previous ones and returns the
+        events of all fired rules grouped by endpoint (URL and secret).
+        """
+        previous, self._previous = self._previous, current
+        # No baseline yet (first refresh, or wait times that could not be linked to POIs yet)
+        if not previous:
+            return {}
+
+        batches: dict[tuple[str, Optional[str]], list[dict]] = {}
+        at = datetime.now().isoformat()
+        for attraction_id, state in current.items():
+            before = previous.get(attraction_id)
+            if before is None or before == state:
+                continue
+            for subscription, rule_index in self._index.get(attraction_id, ()):
+                for trigger in subscription.rules[rule_index].triggers(before, state):
+                    webhook_events_total.labels(trigger).inc()
+                    batches.setdefault((subscription.url, subscription.secret), []).append({
+                        "subscription_id": subscription.id,
+                        "rule": rule_index,
+                        "trigger": trigger,
+                        "attraction_id": attraction_id,
+                        "previous": {"time": before[0], "status": before[1]},
+                        "current": {"time": state[0], "status": state[1]},
+                        "at": at,
+                    })
+        return batches
+
+    async def notify(self, current: dict[int, State]) -> int:
+        """Evaluates a refresh and queues the resulting batches; returns the number of events."""
+        await self.sync()
+        batches = self.evaluate(current)
+        for (url, secret), events in batches.items():
+            self.dispatcher.enqueue(url, secret, events)
+        return sum(len(events) for events in batches.values())
+
+    def get_status(self) -> dict:
+        return {
+            "subscriptions": len(self._subscriptions),
+            "attractions": len(self._index),
+            **self.dispatcher.get_status(),
+        }
+
+
+async def _current_waittimes() -> dict[int, State]:
+    """Wait time and status of every attraction of all parks (from the rendered wait times)."""
+    current: dict[int, State] = {}
+    for park in PARKS:
+        park_token = current_park.set(park)
+        language_token = current_language.set(DEFAULT_LANGUAGE)
+        try:
+            for attraction_id, entry in (await waittimes_by_id.get()).items():
+                current[attraction_id] = (entry["time"], entry["status"])
+        finally:
+            current_language.reset(language_token)
+            current_park.reset(park_token)
+    return current
+
+
+async def _notify(batch: IngestBatch) -> int:
+    # The new wait times are already published; a failed evaluation must not fail the refresh
+    try:
+        return await get_webhook_service().notify(await _current_waittimes())
+    except Exception as e:
+        logger.error(f"Webhook rules could not be evaluated: {e}")
+        return 0
+
+
+_webhook_service: Optional[WebhookService] = None
+
+
+def get_webhook_service() -> WebhookService:
+    global _webhook_service
+    if _webhook_service is None:
+        _webhook_service = WebhookService()
+    return _webhook_service
+
+
+def start_webhooks() -> None:
+    """Starts the delivery workers and evaluates the rules after every wait time refresh."""
+    pipeline = get_ingest_pipeline()
+    if "notify" not in pipeline.stage_names:
+        pipeline.add_stage(IngestStage("notify", _notify, "events", frozenset({CACHE_KEYS["waittimes"]})), after="derive")
+    get_webhook_service().dispatcher.start()
+    logger.info("Webhook delivery started.")
+
+
+async def stop_webhooks() -> None:
+    if _webhook_service is not None:
+        await _webhook_service.dispatcher.stop()
@@ -0,0 +1,111 @@
+"""
+Shared test fixtures.
+Upstream credentials are set to placeholders, so the settings load without a .env file.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import UPSTREAM_SETTINGS, refresh_settings  # noqa: E402
+
+for _name in UPSTREAM_SETTINGS:
+    os.environ.setdefault(_name.upper(), "test")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """Settings with overrides, e.g. settings(cdn_max_age=60)."""
+    def apply(**overrides):
+        for name, value in overrides.items():
+            monkeypatch.setenv(name.upper(), str(value))
+        return refresh_settings()
+    yield apply
+    monkeypatch.undo()
+    refresh_settings()
+
+
+@pytest.fixture
+async def database(tmp_path, monkeypatch):
+    """Fresh SQLite database per test."""
+    import database as db
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path}/test.db")
+    refresh_settings()
+    await db.init_database()
+    yield db
+    await db.close_database()
+    db._engine = None
+    db._session_factory = None
+    monkeypatch.undo()
+    refresh_settings()
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Fresh CacheService; memoized derived data is dropped, as generations restart at 1."""
+    import services.cache as cache_module
+    from services.derived import get_derived_registry
+
+    for derived in get_derived_registry().values():
+        derived._entries.clear()
+    service = cache_module.CacheService()
+    monkeypatch.setattr(cache_module, "_cache_service", service)
+    return service
+
+
+class Receiver:
+    """Local HTTP stand-in: records GET and POST requests and answers with the queued statuses (default 200)."""
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.statuses: list[int] = []
+        self.delay = 0.0
+        self.url = ""
+
+
+@pytest.fixture
+def receiver():
+    import json
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    state = Receiver()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            state.requests.append({
+                "path": self.path,
+                "headers": {k.lower(): v for k, v in self.headers.items()},
+                "body": body,
+                "json": json.loads(body) if body else None,
+            })
+            time.sleep(state.delay)
+            status = state.statuses.pop(0) if state.statuses else 200
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        do_GET = do_POST
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield state
+    server.shutdown()
+    server.server_close()
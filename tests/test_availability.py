@@ -0,0 +1,57 @@
+import pytest
+
+from perf.synthetic import SyntheticPark
+from services.cache import CACHE_KEYS, CacheService, split_by_park
+from services.openingtimes import get_opening_times, opening_times_loaded
+from services.parks import current_park
+from services.seasons import get_seasons
+from services.shows import query_shows
+from services.showtimes import get_showtime_rows, get_showtimes_by_ids
+
+pytestmark = pytest.mark.anyio
+
+
+async def _load(cache: CacheService) -> None:
+    synthetic = SyntheticPark(poi_count=100)
+    for key, data in (
+        (CACHE_KEYS["pois"], synthetic.poi_group()),
+        (CACHE_KEYS["showtimes"], synthetic.show_times()),
+        (CACHE_KEYS["seasons"], synthetic.seasons()),
+        (CACHE_KEYS["openingtimes"], synthetic.opening_times()),
+    ):
+        await cache.save_partitions(key, split_by_park(key, data))
+
+
+async def test_datasets_that_were_never_loaded_are_unavailable(database, cache):
+    current_park.set("rulantica")
+    assert not cache.is_loaded(CACHE_KEYS["pois"])
+    assert await get_showtime_rows() is None
+    assert await get_showtimes_by_ids([1]) is None
+    assert await query_shows() is None
+    assert await get_seasons() is None
+    assert await get_opening_times() is None
+    assert not opening_times_loaded()
+
+
+async def test_loaded_datasets_without_park_data_are_empty(database, cache):
+    await _load(cache)
+    current_park.set("rulantica")
+    assert cache.is_loaded(CACHE_KEYS["pois"])
+    assert cache.get_generation(CACHE_KEYS["openingtimes"]) == 0
+
+    assert await get_showtime_rows() == []
+    assert await get_showtimes_by_ids([1]) == {}
+    page = await query_shows()
+    assert page is not None and page.rows == []
+    assert await get_seasons()
+
+    # Opening times only exist for the Europa-Park
+    assert await get_opening_times() is None
+    assert opening_times_loaded()
+
+
+async def test_loaded_datasets_serve_the_default_park(database, cache):
+    await _load(cache)
+    assert await get_showtime_rows()
+    assert (await query_shows()).rows
+    assert await get_opening_times() is not None
@@ -0,0 +1,50 @@
+import httpx
+import pytest
+
+from routers.batch import BatchItem, _run
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client():
+    """Client recording the paths that reach the app."""
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request.url.path)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://batch") as c:
+        c.sent = sent
+        yield c
+
+
+@pytest.mark.parametrize("path", [
+    "/times/waittimes",
+    "/info/attractions/123?fields=id,name",
+    "/rulantica/times/showtimes",
+])
+async def test_allowed_paths_are_forwarded(client, path):
+    result = await _run(client, BatchItem(path=path))
+    assert result["status"] == 200
+    assert client.sent == [path.split("?")[0]]
+
+
+@pytest.mark.parametrize("path", [
+    "/raw/waittimes",
+    "/health",
+    "/times/../raw/waittimes",
+    "/times/../health",
+    "/info/./../raw/pois",
+    "/times/%2e%2e/raw/waittimes",
+    "/times/%2E%2E/health",
+    "/times%2F..%2Fraw/waittimes",
+    "/europapark/times/../../raw/waittimes",
+    "//evil/times/waittimes",
+    "http://evil/times/waittimes",
+])
+async def test_paths_outside_the_allowlist_are_rejected(client, path):
+    result = await _run(client, BatchItem(path=path))
+    assert result["status"] == 400
+    assert client.sent == []
@@ -0,0 +1,83 @@
+import gzip
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import services.response_cache as response_cache_module
+from routers.admin import router as admin_router
+from services.bundle import BUNDLE_FORMAT, BUNDLE_VERSION, InvalidBundleError, decode_bundle
+from services.response_cache import ResponseCache, ResponseCacheMiddleware
+from services.validation import DatasetValidationError, validate_dataset
+
+VALID = {
+    "waittimes": [{"code": 1, "time": 5}],
+    "showtimes": [],
+    "pois": {"pois": [{"id": 1}], "version": 3},
+    "seasons": [{"id": 10}],
+    "openingtimes": {},
+}
+
+
+def _bundle(*partitions) -> bytes:
+    return json.dumps({
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "partitions": [{"key": key, "updated_at": "2026-01-01T00:00:00", "data": data} for key, data in partitions],
+    }).encode()
+
+
+def test_valid_bundle_is_decoded():
+    data = _bundle(*VALID.items(), ("pois@rulantica:en", VALID["pois"]), ("unknown", [1]))
+    assert len(decode_bundle(gzip.compress(data))["partitions"]) == 7
+
+
+@pytest.mark.parametrize("key, data", [
+    ("pois", [1, 2]),
+    ("pois", {"pois": [1, 2]}),
+    ("pois", {"pois": None}),
+    ("pois@rulantica:en", {"pois": "x"}),
+    ("waittimes", {"code": 1}),
+    ("waittimes", [1]),
+    ("showtimes:en", [None]),
+    ("seasons", "x"),
+    ("openingtimes", []),
+    ("openingtimes", None),
+])
+def test_invalid_partition_rejects_the_bundle(key, data):
+    with pytest.raises(InvalidBundleError, match="Invalid partition"):
+        decode_bundle(_bundle(*VALID.items(), (key, data)))
+
+
+@pytest.mark.parametrize("data", [b"", b"not json", b"[]", json.dumps({"format": "other"}).encode()])
+def test_unreadable_bundle_is_rejected(data):
+    with pytest.raises(InvalidBundleError):
+        decode_bundle(data)
+
+
+@pytest.mark.parametrize("key, data", VALID.items())
+def test_validators_accept_dataset_shapes(key, data):
+    assert validate_dataset(key, data) >= 1
+
+
+def test_empty_data_is_rejected():
+    with pytest.raises(DatasetValidationError):
+        validate_dataset("waittimes", None)
+
+
+@pytest.mark.anyio
+async def test_bundle_export_is_not_served_to_anonymous_clients(database, cache, settings, monkeypatch):
+    settings(admin_token="secret")
+    monkeypatch.setattr(response_cache_module, "_response_cache", ResponseCache(1 << 20, 1 << 20))
+    await cache.save_partitions("waittimes", {"europapark": VALID["waittimes"]})
+
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+    app.include_router(admin_router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api") as client:
+        exported = await client.get("/admin/bundle", headers={"X-Admin-Token": "secret"})
+        anonymous = await client.get("/admin/bundle")
+
+    assert exported.status_code == 200
+    assert anonymous.status_code == 403
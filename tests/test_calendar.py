@@ -0,0 +1,32 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from routers.calendar import MAX_CALENDAR_YEARS, calendar, calendar_status
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("first, last", [
+    (date(9999, 12, 20), None),
+    (date(9999, 12, 31), date(9999, 12, 31)),
+    (date(1, 1, 1), None),
+    (None, date(9999, 12, 31)),
+    (date.today() + timedelta(days=MAX_CALENDAR_YEARS * 366 + 2), None),
+])
+async def test_calendar_dates_outside_the_window_are_rejected(first, last):
+    with pytest.raises(HTTPException) as error:
+        await calendar(from_=first, to=last, fields=None)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("at", [
+    datetime(9999, 12, 31, 23, 30, tzinfo=timezone(timedelta(hours=-5))),
+    datetime(1, 1, 1, tzinfo=timezone(timedelta(hours=5))),
+    datetime(9999, 12, 31, 23, 59),
+])
+async def test_status_timestamps_outside_the_window_are_rejected(at):
+    with pytest.raises(HTTPException) as error:
+        await calendar_status(at=at, fields=None)
+    assert error.value.status_code == 400
@@ -0,0 +1,148 @@
+import asyncio
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+import pytest
+
+import services.cdn as cdn
+from services.cdn import CdnPurger, add_surrogate_keys, cdn_headers, collect_surrogate_keys
+
+
+class _Scheduler:
+    def __init__(self, next_runs):
+        self.next_runs = next_runs
+
+    def next_run(self, name):
+        return self.next_runs.get(name)
+
+
+@pytest.fixture
+def next_runs(monkeypatch, settings):
+    settings(cdn_max_age=3600)
+    runs = {}
+    monkeypatch.setattr(cdn, "get_scheduler", lambda: _Scheduler(runs))
+    return runs
+
+
+def _headers(extra) -> dict:
+    return {name.decode(): value.decode() for name, value in extra}
+
+
+def _max_age(headers: dict) -> int:
+    directive = headers["cache-control"]
+    assert directive.startswith("public, max-age=")
+    return int(directive.rsplit("=", 1)[1])
+
+
+def test_max_age_counts_down_to_the_next_refresh(next_runs):
+    next_runs["waittimes"] = datetime.now() + timedelta(seconds=120)
+    headers = _headers(cdn_headers(200, [], {"waittimes": 1}, True, ()))
+    assert 118 <= _max_age(headers) <= 120
+    expires = parsedate_to_datetime(headers["expires"]).timestamp()
+    assert abs(expires - (datetime.now().timestamp() + _max_age(headers))) <= 2
+
+
+def test_max_age_is_capped(next_runs, settings):
+    next_runs["pois"] = datetime.now() + timedelta(days=1)
+    assert _max_age(_headers(cdn_headers(200, [], {"pois": 1}, True, ()))) == 3600
+    settings(cdn_max_age=60)
+    assert _max_age(_headers(cdn_headers(200, [], {"pois": 1}, True, ()))) == 60
+
+
+def test_max_age_uses_the_earliest_refresh(next_runs):
+    next_runs["pois"] = datetime.now() + timedelta(hours=2)
+    next_runs["waittimes"] = datetime.now() + timedelta(seconds=30)
+    headers = _headers(cdn_headers(200, [], {"pois@rulantica": 1, "waittimes:en": 2}, True, ()))
+    assert 28 <= _max_age(headers) <= 30
+
+
+def test_overdue_refresh_gives_zero_max_age(next_runs):
+    next_runs["waittimes"] = datetime.now() - timedelta(seconds=5)
+    assert _max_age(_headers(cdn_headers(200, [], {"waittimes": 1}, True, ()))) == 0
+
+
+def test_time_dependent_responses_get_no_cache(next_runs):
+    headers = _headers(cdn_headers(200, [], {"seasons": 1}, False, ()))
+    assert headers["cache-control"] == "no-cache"
+    assert "expires" not in headers
+    assert headers["surrogate-key"] == "seasons"
+
+
+def test_route_cache_control_is_kept(next_runs):
+    headers = _headers(cdn_headers(200, [(b"cache-control", b"no-store")], {"pois": 1}, True, ()))
+    assert headers == {"surrogate-key": "pois"}
+
+
+def test_disabled_max_age_sends_only_surrogate_keys(next_runs, settings):
+    settings(cdn_max_age=0)
+    assert _headers(cdn_headers(200, [], {"pois": 1}, True, ())) == {"surrogate-key": "pois"}
+
+
+@pytest.mark.parametrize("status, reads", [(200, {}), (404, {"pois": 1}), (503, {"pois": 1})])
+def test_no_headers_without_reads_or_on_errors(next_runs, status, reads):
+    assert cdn_headers(status, [], reads, True, ()) == []
+
+
+def test_surrogate_keys_list_datasets_and_items(next_runs):
+    with collect_surrogate_keys() as keys:
+        add_surrogate_keys("poi", [1002, 7])
+        add_surrogate_keys("show", [45])
+    reads = {"waittimes:en": 3, "pois": 1, "pois@rulantica": 2}
+    headers = _headers(cdn_headers(200, [], reads, True, keys))
+    assert headers["surrogate-key"] == "pois waittimes poi-1002 poi-7 show-45"
+
+
+def test_surrogate_keys_outside_a_request_are_ignored():
+    add_surrogate_keys("poi", [1])
+    with collect_surrogate_keys() as keys:
+        pass
+    assert keys == set()
+
+
+def test_replicas_estimate_max_age_from_data_age(monkeypatch, settings):
+    settings(cdn_max_age=3600)
+
+    class _Cache:
+        def get_data_age(self, key):
+            return 100.0
+
+    monkeypatch.setattr(cdn, "get_scheduler", lambda: _Scheduler({}))
+    monkeypatch.setattr(cdn, "get_cache_service", lambda: _Cache())
+    interval = cdn.REFRESH_SCHEDULES["waittimes"][0]
+    assert cdn.seconds_until_refresh("waittimes") == min(3600, int(interval - 100))
+
+
+@pytest.mark.anyio
+async def test_purge_posts_dataset_keys_with_bearer_token(receiver):
+    purger = CdnPurger(receiver.url + "/purge", "secret")
+    purger.notify(["waittimes:en", "waittimes@rulantica:de"])
+    await purger._task
+    assert len(receiver.requests) == 1
+    request = receiver.requests[0]
+    assert request["path"] == "/purge"
+    assert request["headers"]["authorization"] == "Bearer secret"
+    assert request["json"] == {"surrogate_keys": ["waittimes"]}
+
+
+@pytest.mark.anyio
+async def test_purges_are_coalesced_while_one_is_in_flight(receiver):
+    receiver.delay = 0.3
+    purger = CdnPurger(receiver.url, None)
+    purger.notify(["waittimes"])
+    await asyncio.sleep(0.1)
+    purger.notify(["pois"])
+    purger.notify(["showtimes:en", "pois@rulantica"])
+    await purger._task
+    assert [r["json"]["surrogate_keys"] for r in receiver.requests] == [["waittimes"], ["pois", "showtimes"]]
+    assert "authorization" not in receiver.requests[0]["headers"]
+
+
+@pytest.mark.anyio
+async def test_failed_purge_does_not_stop_later_purges(receiver):
+    receiver.statuses = [500]
+    purger = CdnPurger(receiver.url, None)
+    purger.notify(["waittimes"])
+    await purger._task
+    purger.notify(["pois"])
+    await purger._task
+    assert [r["json"]["surrogate_keys"] for r in receiver.requests] == [["waittimes"], ["pois"]]
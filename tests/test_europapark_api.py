@@ -0,0 +1,45 @@
+import pytest
+
+import services.europapark_api as europapark_api
+import services.scheduler as scheduler_module
+from services.scheduler import Scheduler
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeAuth:
+    """Auth service stand-in recording the free upstream slots while a renewal runs."""
+
+    is_authenticated = True
+    token_version = 1
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.in_use_during_renewal = []
+
+    def get_auth_header(self) -> dict:
+        return {"Authorization": f"Bearer token-{self.token_version}"}
+
+    async def handle_unauthorized(self, token_version: int) -> None:
+        self.in_use_during_renewal.append(self.limiter.in_use)
+        self.token_version = token_version + 1
+
+
+@pytest.fixture
+def auth(monkeypatch, settings, receiver):
+    settings(api_base=receiver.url)
+    scheduler = Scheduler(upstream_concurrency=1, upstream_reserved=0)
+    monkeypatch.setattr(scheduler_module, "_scheduler", scheduler)
+    fake = FakeAuth(scheduler.limiter)
+    monkeypatch.setattr(europapark_api, "get_auth_service", lambda: fake)
+    return fake
+
+
+async def test_upstream_slot_is_released_while_the_token_is_renewed(auth, receiver):
+    receiver.statuses = [401, 500]
+    with pytest.raises(RuntimeError, match="API Error: 500"):
+        await europapark_api.europapark_request("/api/v2/waiting-times")
+
+    assert auth.in_use_during_renewal == [0]
+    assert auth.limiter.in_use == 0
+    assert [r["headers"]["authorization"] for r in receiver.requests] == ["Bearer token-1", "Bearer token-2"]
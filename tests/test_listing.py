@@ -0,0 +1,170 @@
+import base64
+import json
+
+import pytest
+
+from services.listing import ColumnTable, InvalidQueryError, SortSpec, list_table
+
+
+def _cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def _rows(ids):
+    names = {1: "Blue Fire", 2: "alpenexpress", 3: "Silver Star", 4: "Arthur", 5: "Voletarium"}
+    return [{"id": i, "name": names[i], "area_id": i % 2} for i in ids]
+
+
+def _waittimes_table(rows, times):
+    def time_key(i):
+        return (times[i] is None, times[i] or 0, rows[i]["id"])
+
+    return ColumnTable(
+        rows,
+        columns={"time": times, "area_id": [row["area_id"] for row in rows]},
+        sorts={"time": SortSpec(time_key), "-time": SortSpec(time_key, reverse=True)},
+    )
+
+
+def _pages(table, **query):
+    ids, cursor = [], None
+    while True:
+        page = table.query(cursor=cursor, **query)
+        ids.extend(row["id"] for row in page.rows)
+        if page.next_cursor is None:
+            return ids
+        cursor = page.next_cursor
+
+
+@pytest.mark.parametrize("sort, expected", [
+    (None, [1, 2, 3, 4, 5]),
+    ("name", [2, 4, 1, 3, 5]),
+    ("-name", [5, 3, 1, 4, 2]),
+    ("id", [1, 2, 3, 4, 5]),
+    ("-id", [5, 4, 3, 2, 1]),
+])
+def test_cursor_round_trip(sort, expected):
+    table = list_table(_rows([1, 2, 3, 4, 5]))
+    assert _pages(table, sort=sort, limit=2) == expected
+    assert _pages(table, sort=sort, limit=1) == expected
+
+
+def test_last_page_has_no_cursor():
+    table = list_table(_rows([1, 2]))
+    assert table.query(limit=2).next_cursor is None
+    assert table.query(limit=1).next_cursor is not None
+
+
+def test_default_order_cursor_follows_row_across_refresh():
+    first = list_table(_rows([1, 2, 3, 4, 5])).query(limit=2)
+    assert [row["id"] for row in first.rows] == [1, 2]
+    # Refreshed data: a row was inserted before the cursor row
+    refreshed = list_table(_rows([3, 1, 2, 4, 5]))
+    assert [row["id"] for row in refreshed.query(cursor=first.next_cursor).rows] == [4, 5]
+
+
+def test_default_order_cursor_of_removed_row_continues_at_its_position():
+    first = list_table(_rows([1, 2, 3, 4, 5])).query(limit=2)
+    refreshed = list_table(_rows([1, 3, 4, 5]))
+    assert [row["id"] for row in refreshed.query(cursor=first.next_cursor).rows] == [3, 4, 5]
+
+
+def test_sorted_cursor_is_keyset_based():
+    rows = _rows([1, 2, 3, 4, 5])
+    table = _waittimes_table(rows, [30, 5, None, 5, 60])
+    first = table.query(sort="time", limit=2)
+    assert [row["id"] for row in first.rows] == [2, 4]
+    refreshed = _waittimes_table(rows, [30, 0, None, 5, 60])
+    assert [row["id"] for row in refreshed.query(sort="time", cursor=first.next_cursor).rows] == [1, 5, 3]
+
+
+def test_reverse_order_pages():
+    table = _waittimes_table(_rows([1, 2, 3, 4, 5]), [30, 5, None, 5, 60])
+    assert _pages(table, sort="-time", limit=2) == [3, 5, 1, 4, 2]
+
+
+@pytest.mark.parametrize("sort, key", [
+    ("time", ["a", 1]),
+    ("time", [False, "5", 1]),
+    ("time", [False, 5]),
+    ("time", [False, 5, 1, 2]),
+    ("time", [None, None, None]),
+    ("time", [False, [5], 1]),
+    ("-time", [1, 5, 1]),
+    (None, ["1", 2]),
+    (None, [[1], 2]),
+    (None, [0, {"id": 1}]),
+    (None, [1.5, 999]),
+    (None, []),
+])
+def test_cursor_with_wrong_key_shape_is_rejected(sort, key):
+    table = _waittimes_table(_rows([1, 2, 3]), [10, 20, None])
+    with pytest.raises(InvalidQueryError):
+        table.query(sort=sort, cursor=_cursor([sort or "", key]))
+
+
+def test_name_cursor_with_wrong_key_shape_is_rejected():
+    table = list_table(_rows([1, 2, 3]))
+    with pytest.raises(InvalidQueryError):
+        table.query(sort="name", cursor=_cursor(["name", [None]]))
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", _cursor(["name"]), _cursor("xy"), _cursor({"a": 1}), "e30"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidQueryError):
+        list_table(_rows([1, 2])).query(sort="name", cursor=cursor)
+
+
+def test_cursor_of_other_sort_order_is_rejected():
+    table = list_table(_rows([1, 2, 3]))
+    cursor = table.query(sort="name", limit=1).next_cursor
+    with pytest.raises(InvalidQueryError):
+        table.query(sort="id", cursor=cursor)
+
+
+def test_unknown_sort_order_is_rejected():
+    with pytest.raises(InvalidQueryError):
+        list_table(_rows([1])).query(sort="time")
+
+
+def test_cursor_on_empty_table():
+    assert list_table([]).query(sort="name", cursor=_cursor(["name", ["x", 1]])).rows == []
+
+
+def test_equality_filters_intersect():
+    table = _waittimes_table(_rows([1, 2, 3, 4]), [10, 10, None, 40])
+    assert [r["id"] for r in table.query(equals={"time": {10, 40}}).rows] == [1, 2, 4]
+    assert [r["id"] for r in table.query(equals={"time": {10, 40}, "area_id": [1]}).rows] == [1]
+    assert table.query(equals={"time": {10}, "area_id": [7]}).rows == []
+
+
+def test_list_table_area_filter():
+    table = list_table(_rows([1, 2, 3, 4, 5]))
+    assert [r["id"] for r in table.query(equals={"area_id": {1}}).rows] == [1, 3, 5]
+    assert [r["id"] for r in table.query(equals={"area_id": {0, 1}}, sort="-id").rows] == [5, 4, 3, 2, 1]
+    assert table.query(equals={"area_id": {7}}).rows == []
+
+
+def test_range_filters_skip_missing_values():
+    table = _waittimes_table(_rows([1, 2, 3, 4]), [10, 20, None, 40])
+    assert [r["id"] for r in table.query(ranges={"time": (15, None)}).rows] == [2, 4]
+    assert [r["id"] for r in table.query(ranges={"time": (None, 20)}).rows] == [1, 2]
+    assert [r["id"] for r in table.query(ranges={"time": (10, 10)}).rows] == [1]
+    assert len(table.query(ranges={"time": (None, None)}).rows) == 4
+
+
+def test_filtered_pages_with_cursor():
+    table = _waittimes_table(_rows([1, 2, 3, 4, 5]), [10, 20, 30, 40, 50])
+    assert _pages(table, ranges={"time": (20, 40)}, sort="-time", limit=1) == [4, 3, 2]
+
+
+def test_projected_rows_are_memoized():
+    table = list_table(_rows([1, 2]))
+
+    def projection(row):
+        return {"id": row["id"]}
+
+    rows = table.projected_rows(projection)
+    assert rows == [{"id": 1}, {"id": 2}]
+    assert table.projected_rows(projection) is rows
+    assert table.query(projection=projection, limit=1).rows == [{"id": 1}]
@@ -0,0 +1,35 @@
+import pytest
+from fastapi import HTTPException
+
+from routers.params import MAX_IDS, parse_id_list, parse_ids
+
+
+def test_id_list_keeps_order_and_drops_duplicates():
+    assert parse_id_list("3, 1,3,,2") == [3, 1, 2]
+
+
+def test_missing_id_list():
+    assert parse_id_list(None) is None
+
+
+def test_id_list_limit():
+    assert len(parse_id_list(",".join(str(i) for i in range(MAX_IDS)))) == MAX_IDS
+    # Duplicates do not count against the limit
+    assert parse_id_list(",".join(["1"] * (MAX_IDS + 1))) == [1]
+    with pytest.raises(HTTPException) as error:
+        parse_id_list(",".join(str(i) for i in range(MAX_IDS + 1)))
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("value", ["", ",", "1,a", "1.5", "0x10"])
+def test_invalid_id_lists_are_rejected(value):
+    with pytest.raises(HTTPException) as error:
+        parse_id_list(value)
+    assert error.value.status_code == 400
+
+
+def test_parse_ids():
+    assert parse_ids("1, 2,2") == {1, 2}
+    assert parse_ids(None) == set()
+    with pytest.raises(HTTPException):
+        parse_ids("x", "area_id")
@@ -0,0 +1,46 @@
+import pytest
+
+from services.profiling import ProfilingMiddleware
+
+
+def _scope(query: bytes = b"", **headers) -> dict:
+    return {
+        "type": "http",
+        "query_string": query,
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    }
+
+
+@pytest.fixture
+def reason(settings):
+    settings(admin_token="secret", profiling_sample_rate=0)
+    return ProfilingMiddleware(None)._reason
+
+
+@pytest.mark.parametrize("scope", [
+    _scope(x_profile="1", x_admin_token="secret"),
+    _scope(x_profile="true", x_admin_token="secret"),
+    _scope(b"fields=id&profile=1", x_admin_token="secret"),
+    _scope(b"profile=true", x_profile="0", x_admin_token="secret"),
+])
+def test_requested_profiles(reason, scope):
+    assert reason(scope) == "requested"
+
+
+@pytest.mark.parametrize("scope", [
+    _scope(),
+    _scope(b"fields=id", accept="application/json"),
+    _scope(x_profile="1"),
+    _scope(x_profile="1", x_admin_token="wrong"),
+    _scope(b"profile=1"),
+    _scope(b"profile=0", x_admin_token="secret"),
+    _scope(b"profiles=1", x_admin_token="secret"),
+    _scope(x_profile="yes", x_admin_token="secret"),
+])
+def test_requests_without_a_valid_flag_are_not_profiled(reason, scope):
+    assert reason(scope) is None
+
+
+def test_sampled_profiles(settings):
+    settings(profiling_sample_rate=1)
+    assert ProfilingMiddleware(None)._reason(_scope()) == "sampled"
@@ -0,0 +1,48 @@
+import pytest
+
+from services.listing import InvalidQueryError
+from services.projection import compile_projection
+
+ATTRACTION = {
+    "id": 1,
+    "name": "Blue Fire",
+    "wait_time": {"time": 15, "status": "opened"},
+    "location": {"lat": 48.26, "lon": 7.72},
+    "tags": [{"id": 1, "label": "Family"}, {"id": 2, "label": "Thrill"}],
+}
+
+
+def test_top_level_fields_keep_response_order():
+    assert list(compile_projection("name,id")(ATTRACTION)) == ["id", "name"]
+
+
+def test_nested_paths():
+    assert compile_projection("id,wait_time.time")(ATTRACTION) == {"id": 1, "wait_time": {"time": 15}}
+
+
+def test_prefix_path_selects_whole_value():
+    expected = {"wait_time": {"time": 15, "status": "opened"}}
+    assert compile_projection("wait_time,wait_time.time")(ATTRACTION) == expected
+    assert compile_projection("wait_time.time,wait_time")(ATTRACTION) == expected
+    assert compile_projection("wait_time.time,wait_time.time.x")(ATTRACTION) == {"wait_time": {"time": 15}}
+
+
+def test_lists_are_projected_element_wise():
+    assert compile_projection("tags.label")(ATTRACTION) == {"tags": [{"label": "Family"}, {"label": "Thrill"}]}
+    assert compile_projection("id")([ATTRACTION, {"id": 2, "name": "x"}]) == [{"id": 1}, {"id": 2}]
+
+
+def test_unknown_fields_and_null_values():
+    assert compile_projection("id,unknown,wait_time.unknown")(ATTRACTION) == {"id": 1, "wait_time": {}}
+    assert compile_projection("wait_time.time")({"wait_time": None}) == {"wait_time": None}
+    assert compile_projection("name.first")(ATTRACTION) == {"name": "Blue Fire"}
+
+
+def test_equal_field_sets_share_the_projection():
+    assert compile_projection("id,name") is compile_projection(" name , id,,id")
+
+
+@pytest.mark.parametrize("fields", ["", ",", " , ", "id,.name", "wait_time.", "a..b"])
+def test_invalid_field_lists_are_rejected(fields):
+    with pytest.raises(InvalidQueryError):
+        compile_projection(fields)
@@ -0,0 +1,54 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import services.response_cache as response_cache_module
+from services.response_cache import ResponseCache, ResponseCacheMiddleware
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client(cache, monkeypatch):
+    """Client for an app whose routes all read the wait times from the cache."""
+    monkeypatch.setattr(response_cache_module, "_response_cache", ResponseCache(1 << 20, 1 << 20))
+
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware)
+
+    @app.get("/{path:path}")
+    async def read(path: str):
+        return {"path": path, "generation": cache.get_generation("waittimes")}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api") as c:
+        yield c
+
+
+async def _statuses(client, path: str, headers: dict = None) -> list:
+    return [(await client.get(path, headers=headers)).headers.get("x-cache") for _ in range(2)]
+
+
+async def test_public_routes_are_cached(client):
+    assert await _statuses(client, "/times/waittimes") == ["MISS", "HIT"]
+    assert await _statuses(client, "/rulantica/times/waittimes") == ["MISS", "HIT"]
+    assert await _statuses(client, "/administration") == ["MISS", "HIT"]
+
+
+@pytest.mark.parametrize("path", [
+    "/admin/bundle",
+    "/internal/replication/state",
+    "/webhooks",
+    "/webhooks/1",
+    "/rulantica/admin/bundle",
+    "/europapark/webhooks",
+])
+async def test_protected_routes_are_never_cached(client, path):
+    assert await _statuses(client, path) == [None, None]
+
+
+@pytest.mark.parametrize("header", ["X-Admin-Token", "X-Replication-Token", "Authorization"])
+async def test_requests_with_credentials_are_never_cached(client, header):
+    assert await _statuses(client, "/times/waittimes", {header: "secret"}) == [None, None]
+    # A credential-free request is cached, but not served to requests with credentials
+    assert await _statuses(client, "/times/waittimes") == ["MISS", "HIT"]
+    assert await _statuses(client, "/times/waittimes", {header: "secret"}) == [None, None]
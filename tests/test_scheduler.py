@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.scheduler import CronSpec, IntervalSpec, Scheduler, parse_schedule, parse_schedule_overrides
+
+
+@pytest.mark.parametrize("expression, field, expected", [
+    ("* * * * *", "minutes", set(range(60))),
+    ("*/15 * * * *", "minutes", {0, 15, 30, 45}),
+    ("5/20 * * * *", "minutes", {5, 25, 45}),
+    ("10-12,40 * * * *", "minutes", {10, 11, 12, 40}),
+    ("0 8-18/5 * * *", "hours", {8, 13, 18}),
+    ("0 0 1,15 * *", "days", {1, 15}),
+    ("0 0 * 6-8 *", "months", {6, 7, 8}),
+    ("0 0 * * 7", "weekdays", {0}),
+    ("0 0 * * 0,6", "weekdays", {0, 6}),
+    ("0 0 * * 5-7", "weekdays", {5, 6, 0}),
+])
+def test_cron_fields(expression, field, expected):
+    assert getattr(CronSpec(expression), field) == expected
+
+
+@pytest.mark.parametrize("expression", [
+    "* * * *",
+    "* * * * * *",
+    "60 * * * *",
+    "* 24 * * *",
+    "* * 0 * *",
+    "* * * 13 *",
+    "* * * * 8",
+    "*/0 * * * *",
+    "5-1 * * * *",
+    "a * * * *",
+    "1,,2 * * * *",
+])
+def test_invalid_cron_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSpec(expression)
+
+
+@pytest.mark.parametrize("expression, previous, expected", [
+    # Next minute, never the same minute
+    ("* * * * *", datetime(2026, 5, 1, 10, 0, 30), datetime(2026, 5, 1, 10, 1)),
+    ("*/15 * * * *", datetime(2026, 5, 1, 10, 15), datetime(2026, 5, 1, 10, 30)),
+    ("*/15 * * * *", datetime(2026, 5, 1, 23, 59), datetime(2026, 5, 2, 0, 0)),
+    ("0 4 * * *", datetime(2026, 5, 1, 3, 59, 59), datetime(2026, 5, 1, 4, 0)),
+    ("0 4 * * *", datetime(2026, 5, 1, 4, 0), datetime(2026, 5, 2, 4, 0)),
+    # Month and year rollover
+    ("30 2 1 * *", datetime(2026, 12, 15), datetime(2027, 1, 1, 2, 30)),
+    ("0 0 31 * *", datetime(2026, 4, 1), datetime(2026, 5, 31)),
+    ("0 0 29 2 *", datetime(2026, 3, 1), datetime(2028, 2, 29)),
+    # 2026-05-01 is a Friday; 7 = Sunday
+    ("0 9 * * 7", datetime(2026, 5, 1, 12), datetime(2026, 5, 3, 9, 0)),
+    ("0 9 * * 1-5", datetime(2026, 5, 1, 12), datetime(2026, 5, 4, 9, 0)),
+    # Day and weekday both restricted: either matches
+    ("0 0 15 * 1", datetime(2026, 5, 1, 12), datetime(2026, 5, 4)),
+    ("0 0 2 * 1", datetime(2026, 5, 1, 12), datetime(2026, 5, 2)),
+    # Only one restricted: both must match (the 13th that is a Friday)
+    ("0 0 13 * *", datetime(2026, 5, 1), datetime(2026, 5, 13)),
+    ("0 0 13 * 5", datetime(2026, 5, 1), datetime(2026, 5, 8)),
+    ("0 0 * 11 5", datetime(2026, 5, 1), datetime(2026, 11, 6)),
+])
+def test_cron_next_run(expression, previous, expected):
+    assert CronSpec(expression).next_after(previous) == expected
+
+
+def test_cron_that_never_matches():
+    with pytest.raises(ValueError):
+        CronSpec("0 0 30 2 *").next_after(datetime(2026, 1, 1))
+
+
+def test_cron_expression_is_normalized():
+    assert str(CronSpec(" 0  4 * *  * ")) == "0 4 * * *"
+    assert CronSpec("0 4 * * *") == CronSpec("0  4 * * *")
+
+
+def test_interval_next_run():
+    assert IntervalSpec(90).next_after(datetime(2026, 5, 1, 10, 0)) == datetime(2026, 5, 1, 10, 1, 30)
+    assert str(IntervalSpec(300)) == "every 300s"
+
+
+def test_parse_schedule():
+    assert parse_schedule(" 120 ") == IntervalSpec(120)
+    assert parse_schedule("0.5") == IntervalSpec(0.5)
+    assert parse_schedule("0 4 * * *") == CronSpec("0 4 * * *")
+    for value in ("0", "-5", "every day"):
+        with pytest.raises(ValueError):
+            parse_schedule(value)
+
+
+def test_schedule_overrides_skip_invalid_entries():
+    overrides = parse_schedule_overrides("waittimes=120; pois=0 4 * * *;bad=-1;=60;seasons=;openingtimes=x")
+    assert overrides == {"waittimes": IntervalSpec(120), "pois": CronSpec("0 4 * * *")}
+
+
+async def _noop():
+    pass
+
+
+def _late_job(scheduler: Scheduler, seconds: float, **options):
+    job = scheduler.add_job("job", _noop, IntervalSpec(600), **options)
+    now = datetime.now()
+    job.scheduled = job.next_run = now - timedelta(seconds=seconds)
+    scheduler._due(job, now)
+    return job
+
+
+@pytest.mark.anyio
+async def test_late_run_is_skipped_after_the_misfire_grace():
+    job = _late_job(Scheduler(), 120, catch_up=False, misfire_grace=60)
+    assert job.task is None
+    assert job.next_run > datetime.now()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("options", [
+    {"catch_up": False, "misfire_grace": 300},
+    {"catch_up": True, "misfire_grace": 60},
+])
+async def test_late_run_is_caught_up(options):
+    job = _late_job(Scheduler(), 120, **options)
+    await job.task
+    assert job.runs == 1
+    assert job.next_run > datetime.now()
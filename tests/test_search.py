@@ -0,0 +1,27 @@
+import pytest
+
+from perf.synthetic import SyntheticPark
+from services.cache import CACHE_KEYS, CacheService, split_by_park
+from services.search import search
+
+pytestmark = pytest.mark.anyio
+
+
+async def _save_pois(cache: CacheService, data: dict) -> None:
+    await cache.save_partitions(CACHE_KEYS["pois"], split_by_park(CACHE_KEYS["pois"], data))
+
+
+async def test_search_without_loaded_pois(database, cache):
+    assert await search("coaster") is None
+
+
+async def test_search_with_no_searchable_documents(database, cache):
+    await _save_pois(cache, {"pois": []})
+    assert await search("coaster") == []
+
+
+async def test_search_finds_pois(database, cache):
+    synthetic = SyntheticPark(poi_count=100)
+    poi = next(p for p in synthetic.pois if "europapark" in p["scopes"])
+    await _save_pois(cache, synthetic.poi_group())
+    assert poi["id"] in [result["id"] for result in await search(poi["name"])]
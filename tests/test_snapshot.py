@@ -0,0 +1,39 @@
+import json
+from datetime import datetime, time, timedelta
+
+from perf.synthetic import SyntheticPark
+from services.showtimes import PARK_TIMEZONE
+from services.snapshot import _build_sources, render_snapshot
+
+
+def _sources():
+    synthetic = SyntheticPark(poi_count=100)
+    show_id = synthetic.show_times()[0]["showId"]
+    showtimes = [{"showId": show_id, "today": ["10:00"], "tomorrow": ["11:00"]}]
+    return _build_sources(None, showtimes, synthetic.poi_group(), None, None)
+
+
+def _render(sources, days: int, at: time):
+    now = datetime.combine(sources.day + timedelta(days=days), at, PARK_TIMEZONE)
+    rendered = render_snapshot(sources, now)
+    return json.loads(rendered.body), rendered.expires_at
+
+
+def test_show_times_of_the_build_day():
+    sources = _sources()
+    document, expires_at = _render(sources, 0, time(9))
+    assert [show["next"] for show in document["shows"]] == [["10:00"]]
+    assert expires_at == datetime.combine(sources.day, time(10), PARK_TIMEZONE)
+
+
+def test_after_midnight_the_show_times_for_tomorrow_apply():
+    sources = _sources()
+    document, expires_at = _render(sources, 1, time(0, 30))
+    assert document["date"] == (sources.day + timedelta(days=1)).isoformat()
+    assert [show["next"] for show in document["shows"]] == [["11:00"]]
+    assert expires_at == datetime.combine(sources.day + timedelta(days=1), time(11), PARK_TIMEZONE)
+
+
+def test_outdated_show_times_are_left_out():
+    document, _ = _render(_sources(), 2, time(9))
+    assert document["shows"] == []
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.token_storage import TokenData, TokenStorage
+
+pytestmark = pytest.mark.anyio
+
+LEASE = 60.0
+
+
+def _token(name: str) -> TokenData:
+    return TokenData(access_token=name, token_type="Bearer", expires_at=datetime.now() + timedelta(hours=1))
+
+
+async def _renew(storage: TokenStorage, owner: str, version: int, name: str) -> TokenData:
+    assert await storage.try_acquire_renewal(owner, version, LEASE)
+    token = _token(name)
+    assert await storage.save_renewed(token, owner, version)
+    return token
+
+
+async def test_first_token_is_created_under_a_lease(database):
+    storage = TokenStorage()
+    assert await storage.load() is None
+    assert await storage.try_acquire_renewal("a", 0, LEASE)
+    # The placeholder row holds the lease: a second process neither updates nor inserts
+    assert not await storage.try_acquire_renewal("b", 0, LEASE)
+
+    token = _token("first")
+    assert await storage.save_renewed(token, "a", 0)
+    assert token.version == 1
+    loaded = await storage.load()
+    assert (loaded.access_token, loaded.version) == ("first", 1)
+
+
+async def test_lease_is_granted_only_for_the_current_version(database):
+    storage = TokenStorage()
+    await _renew(storage, "a", 0, "first")
+    assert not await storage.try_acquire_renewal("b", 0, LEASE)
+    assert await storage.try_acquire_renewal("b", 1, LEASE)
+
+
+async def test_lease_blocks_other_processes_until_released(database):
+    storage = TokenStorage()
+    await _renew(storage, "a", 0, "first")
+    assert await storage.try_acquire_renewal("a", 1, LEASE)
+    assert not await storage.try_acquire_renewal("b", 1, LEASE)
+
+    # Only the owner releases its lease
+    await storage.release_renewal("b")
+    assert not await storage.try_acquire_renewal("b", 1, LEASE)
+    await storage.release_renewal("a")
+    assert await storage.try_acquire_renewal("b", 1, LEASE)
+
+
+async def test_expired_lease_can_be_taken_over(database):
+    storage = TokenStorage()
+    await _renew(storage, "a", 0, "first")
+    assert await storage.try_acquire_renewal("a", 1, -1.0)
+    assert await storage.try_acquire_renewal("b", 1, LEASE)
+
+    # The former owner's write is rejected, the new owner's write wins
+    assert not await storage.save_renewed(_token("late"), "a", 1)
+    assert await storage.save_renewed(_token("second"), "b", 1)
+    loaded = await storage.load()
+    assert (loaded.access_token, loaded.version) == ("second", 2)
+
+
+async def test_save_with_stale_version_is_rejected(database):
+    storage = TokenStorage()
+    await _renew(storage, "a", 0, "first")
+    await _renew(storage, "b", 1, "second")
+    token = _token("stale")
+    assert not await storage.save_renewed(token, "b", 1)
+    assert token.version == 0
+    assert (await storage.load()).access_token == "second"
+
+
+async def test_save_without_lease_is_rejected(database):
+    storage = TokenStorage()
+    await _renew(storage, "a", 0, "first")
+    assert not await storage.save_renewed(_token("unleased"), "a", 1)
+    assert (await storage.load()).version == 1
+
+
+async def test_renewal_after_save_releases_the_lease(database):
+    storage = TokenStorage()
+    await _renew(storage, "a", 0, "first")
+    await _renew(storage, "b", 1, "second")
+    await _renew(storage, "a", 2, "third")
+    assert (await storage.load()).version == 3
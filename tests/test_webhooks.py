@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import hmac
+import json
+
+import pytest
+
+from services.webhooks import (
+    SIGNATURE_HEADER,
+    WebhookDispatcher,
+    WebhookRule,
+    WebhookService,
+    WebhookSubscriptionCreate,
+)
+
+OPEN, CLOSED, DOWN = "operational", "closed", "down"
+
+
+def _dispatcher(**overrides) -> WebhookDispatcher:
+    options = dict(workers=2, queue_size=10, batch_size=100, max_retries=2, retry_backoff=0.01, timeout=5.0)
+    options.update(overrides)
+    return WebhookDispatcher(**options)
+
+
+@pytest.mark.parametrize("previous, current, fired", [
+    ((30, OPEN), (15, OPEN), ["below"]),
+    ((20, OPEN), (15, OPEN), ["below"]),
+    ((10, OPEN), (5, OPEN), []),
+    ((None, CLOSED), (5, OPEN), ["below"]),
+    ((30, OPEN), (None, CLOSED), []),
+])
+def test_below_fires_when_crossing_the_threshold(previous, current, fired):
+    assert WebhookRule(attraction_id=1, below=20).triggers(previous, current) == fired
+
+
+@pytest.mark.parametrize("previous, current, fired", [
+    ((30, OPEN), (45, OPEN), ["above"]),
+    ((44, OPEN), (45, OPEN), ["above"]),
+    ((45, OPEN), (60, OPEN), []),
+    ((None, CLOSED), (50, OPEN), ["above"]),
+    ((50, OPEN), (20, OPEN), []),
+])
+def test_above_fires_when_reaching_the_threshold(previous, current, fired):
+    assert WebhookRule(attraction_id=1, above=45).triggers(previous, current) == fired
+
+
+@pytest.mark.parametrize("rule, previous, current, fired", [
+    ({"status_to": OPEN}, (None, CLOSED), (5, OPEN), ["status"]),
+    ({"status_to": OPEN}, (5, OPEN), (10, OPEN), []),
+    ({"status_to": OPEN}, (None, CLOSED), (None, DOWN), []),
+    ({"status_from": OPEN}, (5, OPEN), (None, DOWN), ["status"]),
+    ({"status_from": OPEN}, (None, DOWN), (None, CLOSED), []),
+    ({"status_from": DOWN, "status_to": OPEN}, (None, DOWN), (5, OPEN), ["status"]),
+    ({"status_from": DOWN, "status_to": OPEN}, (None, CLOSED), (5, OPEN), []),
+    ({"status_from": DOWN, "status_to": OPEN}, (None, DOWN), (None, CLOSED), []),
+])
+def test_status_transitions(rule, previous, current, fired):
+    assert WebhookRule(attraction_id=1, **rule).triggers(previous, current) == fired
+
+
+def test_combined_conditions_fire_together():
+    rule = WebhookRule(attraction_id=1, below=20, status_to=OPEN)
+    assert rule.triggers((None, DOWN), (10, OPEN)) == ["below", "status"]
+
+
+def test_rule_needs_a_condition():
+    with pytest.raises(ValueError):
+        WebhookRule(attraction_id=1)
+
+
+@pytest.mark.anyio
+async def test_evaluate_uses_the_attraction_index(database):
+    service = WebhookService()
+    first = await service.create_subscription(WebhookSubscriptionCreate(
+        url="http://hooks.invalid/a",
+        rules=[WebhookRule(attraction_id=1, below=20), WebhookRule(attraction_id=2, status_to=OPEN)],
+    ))
+    second = await service.create_subscription(WebhookSubscriptionCreate(
+        url="http://hooks.invalid/b", secret="s", rules=[WebhookRule(attraction_id=1, above=60)],
+    ))
+    assert set(service._index) == {1, 2}
+
+    # First refresh only records the baseline
+    assert service.evaluate({1: (30, OPEN), 2: (None, CLOSED), 3: (5, OPEN)}) == {}
+    batches = service.evaluate({1: (10, OPEN), 2: (5, OPEN), 3: (50, OPEN)})
+    assert set(batches) == {("http://hooks.invalid/a", None)}
+    events = batches[("http://hooks.invalid/a", None)]
+    assert [(e["subscription_id"], e["rule"], e["trigger"], e["attraction_id"]) for e in events] == [
+        (first["id"], 0, "below", 1),
+        (first["id"], 1, "status", 2),
+    ]
+    assert events[0]["previous"] == {"time": 30, "status": OPEN}
+    assert events[0]["current"] == {"time": 10, "status": OPEN}
+
+    batches = service.evaluate({1: (70, OPEN), 2: (5, OPEN), 3: (50, OPEN)})
+    assert [e["subscription_id"] for e in batches[("http://hooks.invalid/b", "s")]] == [second["id"]]
+    # Unchanged wait times fire nothing
+    assert service.evaluate({1: (70, OPEN), 2: (5, OPEN), 3: (50, OPEN)}) == {}
+
+
+@pytest.mark.anyio
+async def test_sync_sees_delete_then_create_from_another_process(database):
+    rules = [WebhookRule(attraction_id=1, below=20)]
+    writer, reader = WebhookService(), WebhookService()
+    await writer.create_subscription(WebhookSubscriptionCreate(url="http://hooks.invalid/a", rules=rules))
+    last = await writer.create_subscription(WebhookSubscriptionCreate(url="http://hooks.invalid/b", rules=rules))
+    await reader.sync()
+
+    await writer.delete_subscription(last["id"])
+    await asyncio.sleep(0.01)
+    created = await writer.create_subscription(WebhookSubscriptionCreate(url="http://hooks.invalid/c", rules=rules))
+    # SQLite reuses the ID of the deleted last row: count and max ID are unchanged
+    assert created["id"] == last["id"]
+    await reader.sync()
+    assert [s["url"] for s in await reader.list_subscriptions()] == ["http://hooks.invalid/a", "http://hooks.invalid/c"]
+
+
+@pytest.mark.anyio
+async def test_delivery_posts_signed_batches(receiver):
+    dispatcher = _dispatcher(batch_size=2)
+    dispatcher.start()
+    try:
+        dispatcher.enqueue(receiver.url, "secret", [{"n": 1}, {"n": 2}, {"n": 3}])
+        await dispatcher._queue.join()
+    finally:
+        await dispatcher.stop()
+    assert sorted(r["json"]["count"] for r in receiver.requests) == [1, 2]
+    for request in receiver.requests:
+        expected = hmac.new(b"secret", request["body"], hashlib.sha256).hexdigest()
+        assert request["headers"][SIGNATURE_HEADER.lower()] == f"sha256={expected}"
+    assert dispatcher.get_status()["endpoints"][receiver.url]["delivered"] == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("statuses, attempts, result", [
+    ([500, 503], 3, "delivered"),
+    ([429], 2, "delivered"),
+    ([500, 502, 504], 3, "failed"),
+    ([400], 1, "failed"),
+    ([404, 500], 1, "failed"),
+])
+async def test_retry_with_backoff_on_5xx_and_429(receiver, statuses, attempts, result):
+    receiver.statuses = list(statuses)
+    dispatcher = _dispatcher(max_retries=2)
+    dispatcher.start()
+    try:
+        dispatcher.enqueue(receiver.url, None, [{"n": 1}])
+        await dispatcher._queue.join()
+    finally:
+        await dispatcher.stop()
+    assert len(receiver.requests) == attempts
+    assert len({r["body"] for r in receiver.requests}) == 1
+    stats = dispatcher.get_status()["endpoints"][receiver.url]
+    assert stats[result] == 1
+    if result == "failed":
+        assert stats["last_error"] == f"HTTP {statuses[attempts - 1]}"
+
+
+@pytest.mark.anyio
+async def test_network_errors_are_retried():
+    dispatcher = _dispatcher(max_retries=1, timeout=1.0)
+    dispatcher.start()
+    try:
+        dispatcher.enqueue("http://127.0.0.1:9/hook", None, [{"n": 1}])
+        await dispatcher._queue.join()
+    finally:
+        await dispatcher.stop()
+    assert dispatcher.get_status()["endpoints"]["http://127.0.0.1:9/hook"]["failed"] == 1
+
+
+@pytest.mark.anyio
+async def test_batches_are_dropped_when_the_queue_is_full():
+    dispatcher = _dispatcher(queue_size=2, batch_size=1)
+    dispatcher.enqueue("http://hooks.invalid/a", None, [{"n": i} for i in range(5)])
+    status = dispatcher.get_status()
+    assert status["queued"] == 2
+    assert status["endpoints"]["http://hooks.invalid/a"]["dropped"] == 3
+    assert status["endpoints"]["http://hooks.invalid/a"]["last_error"] == "Queue full"
+    assert [json.dumps(item[2]) for item in (dispatcher._queue.get_nowait(), dispatcher._queue.get_nowait())] == [
+        '[{"n": 0}]', '[{"n": 1}]'
+    ]